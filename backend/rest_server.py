@@ -4,6 +4,7 @@ script_path = os.path.abspath(os.path.dirname(__file__))[0:-8]
 if script_path not in sys.path:
     sys.path.insert(0, script_path)
 from fastapi import FastAPI, APIRouter
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn, requests
 from settings import SERVER_IP, SERVER_PORT
@@ -11,7 +12,7 @@ from database.api_keys_db_client import APIEncryptedDatabase
 from backend.src.accountant.router import router as accountant_router
 from backend.src.analyst.router import router as analyst_router
 from backend.src.chronos.router import router as chronos_router
-from backend.src.broker.router import router as broker_router
+from backend.src.broker.router import router as broker_router, strategy_runtime_handler
 from backend.src.reporter.router import router as reporter_router
 from backend.src.technician.router import router as technician_router
 from backend.src.explorer.router import router as explorer_router
@@ -33,7 +34,15 @@ router.include_router(technician_router)
 router.include_router(stock_analyst_router)
 router.include_router(wiki_router)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Stop the running strategies and write their queued logs
+    strategy_runtime_handler.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # SECURITY OPTIONS
 origins = ["http://localhost:8501"]
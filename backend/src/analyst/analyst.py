@@ -1,9 +1,7 @@
 from typing import List, Dict, Any, Optional
 import pandas as pd
-from ta.momentum import RSIIndicator
-from ta.trend import MACD, ADXIndicator
-from ta.volatility import BollingerBands
 import numpy as np
+from backend.src.broker.sibyl_trading_engine.indicators import kernels
 
 
 class Analyst:
@@ -20,24 +18,21 @@ class Analyst:
 
 
     def calc_rsi(self, window=14):
-        delta = self.data["close_price"].astype(float).diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        RS = gain / loss
-        return 100 - (100 / (1 + RS))
+        return kernels.rsi(self.data["close_price"], window)
 
 
     def calc_ema(self, method: str, window=5):
         if method == "exponential":
-            return self.data["close_price"].ewm(span=window, adjust=False).mean()
+            return kernels.ema(self.data["close_price"], window)
         else:
-            return self.data["close_price"].rolling(window=window).mean()
+            return kernels.rolling_mean(self.data["close_price"], window)
 
 
     def calc_bollinger_bands(self, window=3):
         std = 2
-        lower_band = self.data["Moving Average"] - std * self.data["close_price"].ewm(span=window).std()
-        upper_band = self.data["Moving Average"] + std * self.data["close_price"].ewm(span=window).std()
+        deviation = kernels.ewm_std(self.data["close_price"], window)
+        lower_band = self.data["Moving Average"] - std * deviation
+        upper_band = self.data["Moving Average"] + std * deviation
         return lower_band, upper_band
 
 
@@ -58,19 +53,19 @@ class Analyst:
         """
 
         # Compute indicators
-        adx = ADXIndicator(high=self.data["high"], low=self.data["low"], close=self.data["close_price"]).adx()
-        bb_width = BollingerBands(close=self.data["close_price"]).bollinger_wband()
-        rsi = RSIIndicator(close=self.data["close_price"]).rsi()
-        macd_hist = MACD(close=self.data["close_price"]).macd_diff()
+        adx = kernels.adx(self.data["high"], self.data["low"], self.data["close_price"], 14)
+        bb_width = kernels.bollinger_wband(self.data["close_price"], 20, 2)
+        rsi = kernels.wilder_rsi(self.data["close_price"], 14)
+        _, _, macd_hist = kernels.macd(self.data["close_price"], 12, 26, 9, warm_up=True)
 
         # Normalize indicators
-        trend_strength = np.clip(adx.iloc[-1], 0, 50)
-        volatility = np.clip(bb_width.iloc[-1] * 100, 0, 50)
-        momentum = np.clip(macd_hist.iloc[-1] * 100, -50, 50)  # Normalize MACD histogram
-        rsi_score = np.clip(50 - abs(rsi.iloc[-1] - 50), 0, 50)  # 50 means neutral, lower score if extreme
+        trend_strength = np.clip(adx[-1], 0, 50)
+        volatility = np.clip(bb_width[-1] * 100, 0, 50)
+        momentum = np.clip(macd_hist[-1] * 100, -50, 50)  # Normalize MACD histogram
+        rsi_score = np.clip(50 - abs(rsi[-1] - 50), 0, 50)  # 50 means neutral, lower score if extreme
 
         # Dynamic weighting
-        if adx.iloc[-1] > 25:  # Strong trend
+        if adx[-1] > 25:  # Strong trend
             weights = [0.4, 0.3, 0.2, 0.1]  # More weight on trend & volatility
         else:
             weights = [0.2, 0.3, 0.3, 0.2]  # More weight on RSI & momentum
@@ -3,6 +3,7 @@ from typing import List, Dict
 from backend.src.analyst.utils import update_coin_symbol_name_map
 from backend.src.exchange_client.exchange_client_factory import ExchangeClientFactory
 from backend.src.analyst.analyst import Analyst
+from database.klines.kline_db_client import KlineDBClient
 from backend.src.analyst.schemas import AnalyticsResponse, Kline, AssetPairsResponse
 
 # APIRouter creates path operations for user module
@@ -16,7 +17,7 @@ router = APIRouter(
 @router.get("/symbol/klines/analysis", response_model=AnalyticsResponse)
 def get_symbol_analysis(exchange: str = Query(), symbol: str = Query(), interval: str = Query(), limit: int = Query()) -> AnalyticsResponse:
     client = ExchangeClientFactory.get_client(exchange)
-    klines = client.get_klines(symbol, interval, limit)
+    klines = KlineDBClient().get_latest_klines(client, symbol, interval, limit)
     analyst = Analyst(klines)
     analytics = analyst.get_analytics()
 
@@ -29,7 +30,7 @@ def get_symbol_analysis(exchange: str = Query(), symbol: str = Query(), interval
 @router.get("/asset/klines", response_model=List[Kline])
 def get_price_history(exchange: str = Query(), symbol: str = Query(), interval: str = Query(default="1d"), limit: int = Query(default=200)) -> List[Kline]:
     client = ExchangeClientFactory.get_client(exchange)
-    res = client.get_klines(symbol, interval, limit)
+    res = KlineDBClient().get_latest_klines(client, symbol, interval, limit)
     if res:
         return res
     else:
@@ -1,16 +1,22 @@
-from typing import Dict, Any
-from fastapi import APIRouter, HTTPException
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import StreamingResponse
 from database.trade_history_db_client import TradeHistoryDBClient
 from backend.src.exchange_client.exchange_client_factory import ExchangeClientFactory
 from backend.src.broker.sibyl_trading_engine.strategies.strategy_factory import StrategyFactory
 from backend.src.broker.sibyl_trading_engine.tactician.tactician_base import Tactician
 from backend.src.broker.sibyl_trading_engine.tactician.exchange_interface import TacticianExchangeInterface
-from database.strategy.strategy_db_client import StrategyDBClient
+from database.strategy.strategy_db_client import StrategyDBClient, LOGS_PAGE_SIZE
+from database.strategy.strategy_log_writer import StrategyLogWriter
 from backend.src.broker.sibyl_trading_engine.evaluator.evaluator import Evaluator
 from backend.src.broker.sibyl_trading_engine.tactician.strategy_runtime_manager import StrategyRuntimeHandler
 from backend.src.broker.sibyl_trading_engine.backtester.backtester import Backtester
+from backend.src.broker.sibyl_trading_engine.backtester.walk_forward import WalkForwardOptimizer
+from backend.src.broker.sibyl_trading_engine.backtester.monte_carlo import MonteCarloAnalyzer
 import time
-from backend.src.broker.schemas import SpotTradeRequest, SpotTradeResponse, StrategyRequest
+import json
+import asyncio
+from backend.src.broker.schemas import SpotTradeRequest, SpotTradeResponse, StrategyRequest, StrategySweepRequest, StrategyWalkForwardRequest, StrategyMonteCarloRequest
 
 router = APIRouter(
     prefix="/broker",
@@ -136,7 +142,7 @@ def run_strategy_backtest(strategy_params: StrategyRequest) -> Dict[str, Any]:
         client = ExchangeClientFactory.get_client(strategy_params.exchange)
         strategy = StrategyFactory.get_strategy(strategy_params.strategy, strategy_params.params)
         symbol = f"{strategy_params.base_asset}{strategy_params.quote_asset}"
-        backtester = Backtester(strategy, client, symbol, strategy_params.time_interval)
+        backtester = Backtester(strategy, client, symbol, strategy_params.time_interval, start_time=strategy_params.start_time, end_time=strategy_params.end_time)
         logs, score = backtester.run_backtest()
 
         if logs and len(logs) > 0:
@@ -150,6 +156,78 @@ def run_strategy_backtest(strategy_params: StrategyRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/strategy/backtest/sweep")
+def run_strategy_backtest_sweep(sweep_params: StrategySweepRequest) -> Dict[str, Any]:
+
+    if sweep_params.params_grid:
+        params_list = Backtester.expand_parameter_grid(sweep_params.params_grid)
+    else:
+        params_list = sweep_params.params_list
+    if not params_list:
+        raise HTTPException(status_code=400, detail="Either params_grid or params_list must be provided.")
+
+    try:
+        client = ExchangeClientFactory.get_client(sweep_params.exchange)
+        symbol = f"{sweep_params.base_asset}{sweep_params.quote_asset}"
+        backtester = Backtester(None, client, symbol, sweep_params.time_interval, start_time=sweep_params.start_time, end_time=sweep_params.end_time)
+        results, score = backtester.run_sweep(sweep_params.strategy, params_list, sweep_params.rank_by, sweep_params.max_workers)
+        return {"results": jsonable_encoder(results), "score": score}
+    except ValueError as e:
+        print(e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/strategy/backtest/walk_forward")
+def run_strategy_walk_forward(walk_forward_params: StrategyWalkForwardRequest) -> Dict[str, Any]:
+
+    if walk_forward_params.params_grid:
+        params_list = Backtester.expand_parameter_grid(walk_forward_params.params_grid)
+    else:
+        params_list = walk_forward_params.params_list
+    if not params_list:
+        raise HTTPException(status_code=400, detail="Either params_grid or params_list must be provided.")
+
+    try:
+        client = ExchangeClientFactory.get_client(walk_forward_params.exchange)
+        symbol = f"{walk_forward_params.base_asset}{walk_forward_params.quote_asset}"
+        backtester = Backtester(None, client, symbol, walk_forward_params.time_interval, dataset_size=walk_forward_params.dataset_size,
+                                start_time=walk_forward_params.start_time, end_time=walk_forward_params.end_time)
+        optimizer = WalkForwardOptimizer(backtester, walk_forward_params.strategy, params_list, walk_forward_params.in_sample_size,
+                                         walk_forward_params.out_of_sample_size, walk_forward_params.step, walk_forward_params.anchored,
+                                         walk_forward_params.rank_by)
+        results, score = optimizer.run()
+        return {"results": jsonable_encoder(results), "score": score}
+    except ValueError as e:
+        print(e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/strategy/backtest/monte_carlo")
+def run_strategy_monte_carlo(monte_carlo_params: StrategyMonteCarloRequest) -> Dict[str, Any]:
+
+    try:
+        client = ExchangeClientFactory.get_client(monte_carlo_params.exchange)
+        strategy = StrategyFactory.get_strategy(monte_carlo_params.strategy, monte_carlo_params.params)
+        symbol = f"{monte_carlo_params.base_asset}{monte_carlo_params.quote_asset}"
+        backtester = Backtester(strategy, client, symbol, monte_carlo_params.time_interval, dataset_size=monte_carlo_params.dataset_size,
+                                start_time=monte_carlo_params.start_time, end_time=monte_carlo_params.end_time)
+        logs, score = backtester.run_backtest()
+        analyzer = MonteCarloAnalyzer(logs, monte_carlo_params.n_runs, monte_carlo_params.method, monte_carlo_params.block_size, monte_carlo_params.seed)
+        return {"results": analyzer.run(), "score": score}
+    except ValueError as e:
+        print(e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/strategy/metadata")
 def get_strategy_metadata(strategy_id: str):
     try:
@@ -186,6 +264,66 @@ def get_strategy_logs(strategy_id: str, from_timestamp: int = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/strategy/logs/page")
+def get_strategy_logs_page(strategy_id: str, cursor: int = 0, limit: int = LOGS_PAGE_SIZE):
+    try:
+        db_client = StrategyDBClient()
+        return db_client.get_logs_page(strategy_id, cursor, limit)
+    except ValueError as e:
+        print(e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/strategy/logs/stream")
+async def stream_strategy_logs(strategy_id: str, cursor: int = 0, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events stream of the strategy logs after the cursor, pushed as they are written. Each "logs" event
+    carries a page of logs with the cursor as its id, so that a reconnecting client resumes after the last page
+    received (Last-Event-ID). An "end" event closes the stream once the strategy is no longer running.
+    The stream waits for the logs in the event loop (see StrategyLogWriter.follow_async), so that the open streams do
+    not hold the threadpool of the sync endpoints.
+    """
+    try:
+        if last_event_id:
+            cursor = int(last_event_id)
+        if cursor < 0:
+            raise ValueError("The cursor must be a non-negative integer.")
+        log_writer = await asyncio.to_thread(lambda: StrategyLogWriter.get_writer(StrategyDBClient()))
+    except ValueError as e:
+        print(e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def events():
+        async for page in log_writer.follow_async(strategy_id, cursor):
+            if page["logs"]:
+                yield f"id: {page['cursor']}\nevent: logs\ndata: {json.dumps(page['logs'])}\n\n"
+            if not page["has_more"] and strategy_id not in strategy_runtime_handler.get_active_strategies():
+                yield f"id: {page['cursor']}\nevent: end\ndata: {{}}\n\n"
+                return
+            if not page["logs"]:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/strategy/metrics")
+def get_strategy_metrics(strategy_id: str = "all"):
+    try:
+        return strategy_runtime_handler.get_metrics(strategy_id)
+    except KeyError as e:
+        print(e)
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/strategy/status/info")
 def get_strategy_status(strategy_id: str):
     return {}
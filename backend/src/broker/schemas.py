@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 class SpotTradeRequest(BaseModel):
@@ -31,3 +31,53 @@ class StrategyRequest(BaseModel):
     num_trades: int
     dataset_size: int
     params: Dict[str, Any]  # Holds strategy-specific parameters
+    start_time: Optional[int] = None  # Backtest period start (Unix timestamp in ms), the latest klines are used if not set
+    end_time: Optional[int] = None  # Backtest period end (Unix timestamp in ms), defaults to now
+
+
+class StrategySweepRequest(BaseModel):
+    exchange: str
+    quote_asset: str
+    base_asset: str
+    time_interval: str
+    strategy: str
+    params_grid: Optional[Dict[str, List[Any]]] = None  # Candidate values per parameter, all combinations are evaluated
+    params_list: Optional[List[Dict[str, Any]]] = None  # Explicit parameter sets, used if params_grid is not set
+    rank_by: str = "sharpe_ratio"  # Evaluator metric used to rank the parameter sets
+    max_workers: Optional[int] = None
+    start_time: Optional[int] = None
+    end_time: Optional[int] = None
+
+
+class StrategyWalkForwardRequest(BaseModel):
+    exchange: str
+    quote_asset: str
+    base_asset: str
+    time_interval: str
+    strategy: str
+    params_grid: Optional[Dict[str, List[Any]]] = None  # Candidate values per parameter, all combinations are evaluated
+    params_list: Optional[List[Dict[str, Any]]] = None  # Explicit parameter sets, used if params_grid is not set
+    in_sample_size: int  # Bars of each in-sample window
+    out_of_sample_size: int  # Bars of each out-of-sample window
+    step: Optional[int] = None  # Bars the windows move forward on each fold, defaults to out_of_sample_size
+    anchored: bool = False  # In-sample windows all start at the beginning of the history
+    rank_by: str = "sharpe_ratio"  # Evaluator metric used to select the in-sample parameter set
+    dataset_size: int = 3000
+    start_time: Optional[int] = None
+    end_time: Optional[int] = None
+
+
+class StrategyMonteCarloRequest(BaseModel):
+    exchange: str
+    quote_asset: str
+    base_asset: str
+    time_interval: str
+    strategy: str
+    params: Dict[str, Any]  # Holds strategy-specific parameters
+    method: str = "trades"  # Returns resampled: "trades" (round trips) or "bars" (per-bar equity curve returns)
+    n_runs: int = 1000  # Number of resampled histories
+    block_size: int = 1  # Consecutive returns resampled together, 1 for the plain bootstrap
+    seed: Optional[int] = None
+    dataset_size: int = 3000
+    start_time: Optional[int] = None
+    end_time: Optional[int] = None
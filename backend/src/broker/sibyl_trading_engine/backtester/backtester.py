@@ -1,9 +1,18 @@
 from backend.src.analyst.analyst import Analyst
 from backend.src.broker.sibyl_trading_engine.strategies.strategy_base import BaseStrategy
+from backend.src.broker.sibyl_trading_engine.strategies.strategy_factory import StrategyFactory
+from backend.src.broker.sibyl_trading_engine.evaluator.evaluator import Evaluator
 from backend.src.exchange_client.exchange_client import ExchangeAPIClient
+from database.klines.kline_db_client import KlineDBClient
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import pandas as pd
+import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
-import time
+import itertools
+
+
+LOWER_IS_BETTER_METRICS = {"max_drawdown", "max_drawdown_duration"}  # Evaluator metrics ranked in ascending order in parameter sweeps
 
 
 class Backtester:
@@ -14,16 +23,22 @@ class Backtester:
     and logs buy/sell signals over a defined period to evaluate strategy performance.
     """
 
-    def __init__(self, strategy: BaseStrategy, exchange_client: ExchangeAPIClient, symbol: str, interval: str, dataset_size: int = 3000):
+    def __init__(self, strategy: Optional[BaseStrategy], exchange_client: ExchangeAPIClient, symbol: str, interval: str, dataset_size: int = 3000, vectorized: bool = True,
+                 start_time: Optional[int] = None, end_time: Optional[int] = None):
         """
         Initializes the Backtester with a trading strategy, exchange client, and market parameters.
 
         Args:
-            strategy (BaseStrategy): The trading strategy to be backtested.
+            strategy (BaseStrategy): The trading strategy to be backtested. Can be None if the Backtester is only used for parameter sweeps.
             exchange_client (ExchangeAPIClient): Client to fetch market data from an exchange.
             symbol (str): The trading pair (e.g., "BTC/USDT").
             interval (str): The time interval of the candlesticks (e.g., "1m", "5m").
             dataset_size (int, optional): The number of historical data points to use. Defaults to 3000.
+            vectorized (bool, optional): Evaluate causal strategies in a single pass over the whole dataset instead of
+                once per sliding window. Non-causal strategies always use the sliding window. Defaults to True.
+            start_time (int, optional): Start of the backtest period, Unix timestamp in milliseconds. If set, all the
+                Klines from start_time to end_time are used instead of the latest `dataset_size` Klines.
+            end_time (int, optional): End of the backtest period, Unix timestamp in milliseconds. Defaults to now.
         """
         self.strategy = strategy
         self.exchange_client = exchange_client
@@ -31,27 +46,29 @@ class Backtester:
         self.symbol = symbol
         self.interval = interval
         self.dataset_size = dataset_size
+        self.start_time = start_time
+        self.end_time = end_time
         self.strategy_chunk = 400  # Number of Klines given to the strategy at each step
+        self.vectorized = vectorized
         self.backtesting_logs = []  # Stores backtesting results
+        self.kline_store = KlineDBClient()  # Local klines store, the exchange is only called for the klines not stored yet
 
 
     def get_klines_data(self) -> pd.DataFrame:
         """
-        Fetches historical Kline (candlestick) data from the exchange.
+        Fetches historical Kline (candlestick) data.
 
-        The function retrieves market data in three sequential chunks of 1000
-        Klines each to ensure sufficient backtesting data.
+        The Klines between `start_time` and `end_time`, or the latest `dataset_size` Klines if no start time is set,
+        are read from the local klines store. The store only downloads the Klines that are not stored yet, in
+        exchange-sized pages fetched concurrently, and returns them de-duplicated by open time.
 
         Returns:
             pd.DataFrame: A DataFrame containing historical Kline data.
         """
-        data0 = self.exchange_client.get_klines(self.symbol, interval=self.interval, limit=1000, start_time=int((time.time() - 5000) * 1000))
-        data1 = self.exchange_client.get_klines(self.symbol, interval=self.interval, limit=1000, start_time=int((time.time() - 4000) * 1000))
-        data2 = self.exchange_client.get_klines(self.symbol, interval=self.interval, limit=1000, start_time=int((time.time() - 3000) * 1000))
-        data3 = self.exchange_client.get_klines(self.symbol, interval=self.interval, limit=1000, start_time=int((time.time() - 2000) * 1000))
-        data4 = self.exchange_client.get_klines(self.symbol, self.interval, limit=1000)
-
-        data = data0 + data1 + data2 + data3 + data4
+        if self.start_time is not None:
+            data = self.kline_store.get_klines(self.exchange_client, self.symbol, self.interval, self.start_time, self.end_time)
+        else:
+            data = self.kline_store.get_latest_klines(self.exchange_client, self.symbol, self.interval, self.dataset_size)
 
         self.analyst = Analyst(data)
         df = pd.DataFrame(data)
@@ -82,6 +99,77 @@ class Backtester:
             self.backtesting_logs.append({"timestamp": int(signals.iloc[-1]["timestamp"]), "price": float(signals.iloc[-1]["close_price"]), "order": action})
 
 
+    @staticmethod
+    def deduplicate_orders(signals: np.ndarray, last_action: str = "SELL") -> np.ndarray:
+        """
+        Marks consecutive repeated BUY/SELL signals as "INVALID_<action>".
+
+        Vectorized equivalent of the de-duplication done in `strategy_loop`: every BUY/SELL signal is compared
+        to the previous BUY/SELL signal (HOLD signals are skipped), the first one to `last_action`.
+
+        Args:
+            signals (np.ndarray): The raw strategy signals (e.g. "BUY", "SELL", "HOLD"), one per bar.
+            last_action (str, optional): The action assumed before the first bar. Defaults to "SELL".
+
+        Returns:
+            np.ndarray: The orders, one per bar.
+        """
+        orders = signals.astype(object)
+        is_order = (signals == "BUY") | (signals == "SELL")
+        actions = signals[is_order]
+        previous_actions = np.concatenate(([last_action], actions[:-1]))
+        orders[is_order] = np.where(actions == previous_actions, np.char.add("INVALID_", actions.astype(str)), actions)
+        return orders
+
+
+    def vectorized_strategy_loop(self, dataset: pd.DataFrame) -> None:
+        """
+        Applies a causal trading strategy to the historical market data in a single pass.
+
+        `generate_signals` is called once over the whole dataset, instead of once per sliding window as in
+        `strategy_loop`. Since the signal of a causal strategy at each bar only depends on the bars before it, the
+        result is the same as the windowed loop for the same bars (first bar evaluated: `strategy_chunk` - 1).
+
+        Args:
+            dataset (pd.DataFrame): The historical market data to be used for backtesting.
+        """
+        signals = self.strategy.generate_signals(dataset.copy())
+        signals = signals.iloc[self.strategy_chunk - 1:dataset.shape[0] - 1]
+
+        orders = self.deduplicate_orders(signals["signal"].to_numpy().astype(str))
+        timestamps = signals["timestamp"].to_numpy().astype(np.int64).tolist()
+        prices = signals["close_price"].to_numpy().astype(np.float64).tolist()
+
+        self.backtesting_logs.extend({"timestamp": timestamp, "price": price, "order": order} for timestamp, price, order in zip(timestamps, prices, orders.tolist()))
+
+
+    def verify_vectorized(self, dataset: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Checks that the vectorized single-pass loop produces the same logs as the windowed loop, bar for bar.
+
+        Args:
+            dataset (pd.DataFrame): The historical market data to be used for backtesting.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing:
+                - "match" (bool): Whether both loops produced identical orders and prices for every bar.
+                - "bars" (int): The number of bars compared.
+                - "mismatches" (List[Dict[str, Any]]): The differing bars, with the windowed and vectorized logs.
+        """
+        self.backtesting_logs = []
+        self.strategy_loop(dataset)
+        windowed_logs = self.backtesting_logs
+
+        self.backtesting_logs = []
+        self.vectorized_strategy_loop(dataset)
+        vectorized_logs = self.backtesting_logs
+
+        mismatches = [{"windowed": windowed, "vectorized": vectorized} for windowed, vectorized in zip(windowed_logs, vectorized_logs)
+                      if windowed["timestamp"] != vectorized["timestamp"] or windowed["order"] != vectorized["order"] or not np.isclose(windowed["price"], vectorized["price"])]
+
+        return {"match": len(windowed_logs) == len(vectorized_logs) and not mismatches, "bars": len(windowed_logs), "mismatches": mismatches}
+
+
     def run_backtest(self) -> Optional[Tuple[List[Dict[str, Any]], float]]:
         """
         Executes the full backtesting process.
@@ -96,6 +184,156 @@ class Backtester:
             Returns None if backtesting fails.
         """
         dataset = self.get_klines_data()
-        self.strategy_loop(dataset)
+        self.apply_strategy(dataset)
         score = self.analyst.get_market_condition_score()
         return self.backtesting_logs, score
+
+
+    def apply_strategy(self, dataset: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Applies the trading strategy to the dataset, in a single pass if the strategy is causal
+        and vectorized mode is enabled, otherwise with the sliding window loop.
+
+        Args:
+            dataset (pd.DataFrame): The historical market data to be used for backtesting.
+
+        Returns:
+            List[Dict[str, Any]]: The backtesting logs.
+        """
+        if self.vectorized and self.strategy.is_causal:
+            self.vectorized_strategy_loop(dataset)
+        else:
+            self.strategy_loop(dataset)
+        return self.backtesting_logs
+
+
+    @staticmethod
+    def expand_parameter_grid(params_grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """
+        Expands a parameter grid into the list of all its parameter combinations.
+
+        Example:
+            {"rsi_period": [7, 14], "buy_threshold": [25, 30]} ->
+            [{"rsi_period": 7, "buy_threshold": 25}, {"rsi_period": 7, "buy_threshold": 30}, ...]
+
+        Args:
+            params_grid (Dict[str, List[Any]]): The candidate values of each strategy parameter.
+
+        Returns:
+            List[Dict[str, Any]]: The parameter sets.
+        """
+        names = list(params_grid.keys())
+        return [dict(zip(names, values)) for values in itertools.product(*(params_grid[name] for name in names))]
+
+
+    @staticmethod
+    def validate_parameters(strategy_name: str, params_list: List[Dict[str, Any]]) -> None:
+        """
+        Checks that the strategy can be created with every parameter set.
+
+        Args:
+            strategy_name (str): The strategy name, as registered in StrategyFactory.
+            params_list (List[Dict[str, Any]]): The strategy parameter sets.
+
+        Raises:
+            ValueError: If the strategy name or one of the parameter sets is invalid.
+        """
+        for params in params_list:
+            try:
+                StrategyFactory.get_strategy(strategy_name, params)
+            except TypeError as e:
+                raise ValueError(f"Invalid parameters {params} for strategy {strategy_name}: {e}")
+
+
+    def run_sweep(self, strategy_name: str, params_list: List[Dict[str, Any]], rank_by: str = "sharpe_ratio", max_workers: Optional[int] = None) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        Backtests a strategy with multiple parameter sets in parallel and ranks them by an Evaluator metric.
+
+        The klines are fetched once and copied to a shared memory block, which the worker processes
+        read without copying or re-fetching them.
+
+        Args:
+            strategy_name (str): The strategy name, as registered in StrategyFactory.
+            params_list (List[Dict[str, Any]]): The strategy parameter sets to evaluate.
+            rank_by (str, optional): The Evaluator metric to rank by. Defaults to "sharpe_ratio".
+            max_workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], float]: A tuple containing:
+                - The ranked results, each with "rank", "params", "metrics" and "number_of_logs".
+                - A float representing the market condition score.
+
+        Raises:
+            ValueError: If the strategy name or one of the parameter sets is invalid.
+        """
+        self.validate_parameters(strategy_name, params_list)  # fail fast, before fetching any data
+
+        dataset = self.get_klines_data()
+        columns = [column for column in dataset.columns if pd.api.types.is_numeric_dtype(dataset[column])]
+        values = dataset[columns].to_numpy(dtype=np.float64)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        try:
+            shared_values = np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)
+            shared_values[:] = values
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_run_sweep_parameter_set, shm.name, values.shape, columns, strategy_name, params,
+                                           self.symbol, self.interval, self.strategy_chunk, self.vectorized) for params in params_list]
+                results = [future.result() for future in futures]
+            del shared_values
+        finally:
+            shm.close()
+            shm.unlink()
+
+        results = self.rank_sweep_results(results, rank_by)
+        score = self.analyst.get_market_condition_score()
+        return results, score
+
+
+    @staticmethod
+    def rank_sweep_results(results: List[Dict[str, Any]], rank_by: str) -> List[Dict[str, Any]]:
+        """
+        Sorts the sweep results by an Evaluator metric. Results without a numeric value for the metric
+        (e.g. no trades) are ranked last.
+
+        Args:
+            results (List[Dict[str, Any]]): The sweep results, each with a "metrics" dictionary.
+            rank_by (str): The Evaluator metric to rank by.
+
+        Returns:
+            List[Dict[str, Any]]: The sorted results, with their "rank" added.
+        """
+        sign = 1 if rank_by in LOWER_IS_BETTER_METRICS else -1
+
+        def sort_key(result: Dict[str, Any]) -> Tuple[int, float]:
+            value = result["metrics"].get(rank_by)
+            if isinstance(value, (int, float)) and not np.isnan(value):
+                return 0, sign * value
+            return 1, 0.0
+
+        results = sorted(results, key=sort_key)
+        for rank, result in enumerate(results, start=1):
+            result["rank"] = rank
+        return results
+
+
+def _run_sweep_parameter_set(shm_name: str, shape: Tuple[int, int], columns: List[str], strategy_name: str, params: Dict[str, Any],
+                             symbol: str, interval: str, strategy_chunk: int, vectorized: bool) -> Dict[str, Any]:
+    """
+    Worker of Backtester.run_sweep. Backtests one parameter set over the klines stored in shared memory.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        dataset = pd.DataFrame(values, columns=columns, copy=True)  # the strategies modify their input
+        del values
+    finally:
+        shm.close()
+    if "timestamp" in dataset.columns:
+        dataset["timestamp"] = dataset["timestamp"].astype(np.int64)
+
+    backtester = Backtester(StrategyFactory.get_strategy(strategy_name, params), None, symbol, interval, vectorized=vectorized)
+    backtester.strategy_chunk = strategy_chunk
+    logs = backtester.apply_strategy(dataset)
+    metrics = Evaluator(logs).evaluate() if logs else {}
+    return {"params": params, "metrics": metrics, "number_of_logs": len(logs)}
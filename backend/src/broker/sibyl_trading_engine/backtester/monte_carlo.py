@@ -0,0 +1,175 @@
+from backend.src.broker.sibyl_trading_engine.evaluator.evaluator import Evaluator, MS_PER_YEAR
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple
+
+
+METHODS = ["trades", "bars"]
+MAX_CHUNK_ELEMENTS = 1 << 18  # resampled returns evaluated at once (2 MB of float64), small enough to stay in cache
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+class MonteCarloAnalyzer:
+    """
+    Monte Carlo robustness analysis of a backtest.
+
+    The returns of the backtest are resampled with a moving block bootstrap into thousands of alternative histories,
+    and the distribution of their final profit, maximum drawdown and Sharpe ratio shows how much of the backtest
+    result is due to the particular order and selection of its trades. Two kinds of returns can be resampled:
+        - "trades": the returns of the round trips (BUY to SELL), Sharpe annualized by the number of trades per year.
+        - "bars": the per-bar returns of the equity curve, as in the Evaluator, including the bars out of the market.
+    A block size of 1 is the plain (i.i.d.) bootstrap; larger blocks keep the serial correlation of the returns,
+    e.g. of winning or losing streaks.
+
+    All the runs are resampled and evaluated as 2-D NumPy arrays (one row per run), in chunks bounding the memory,
+    without a Python loop over the runs or the returns.
+
+    Example usage:
+        $ logs, score = Backtester(strategy, client, "BTCUSDT", "1h").run_backtest()
+        $ results = MonteCarloAnalyzer(logs, n_runs=10000, method="trades", block_size=3, seed=42).run()
+        $ print(results["distribution"]["max_drawdown"]["p95"])
+    """
+
+    def __init__(self, logs: List[Dict[str, Any]], n_runs: int = 1000, method: str = "trades", block_size: int = 1,
+                 seed: Optional[int] = None, risk_free_rate: float = 0.0) -> None:
+        """
+        Args:
+            logs (List[Dict[str, Any]]): The backtest logs, one per bar, with 'timestamp', 'price' and 'order'.
+            n_runs (int, optional): The number of resampled histories. Defaults to 1000.
+            method (str, optional): The returns resampled, "trades" or "bars". Defaults to "trades".
+            block_size (int, optional): The number of consecutive returns resampled together. Defaults to 1.
+            seed (int, optional): The random generator seed, for reproducible results.
+            risk_free_rate (float, optional): The annual risk-free rate used in the Sharpe ratio calculation.
+
+        Raises:
+            ValueError: If the method, the number of runs or the block size is invalid, or if the logs do not have
+                enough returns to resample.
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown Monte Carlo method '{method}', expected one of {METHODS}.")
+        if n_runs < 1:
+            raise ValueError("The number of Monte Carlo runs must be at least 1.")
+        if block_size < 1:
+            raise ValueError("The Monte Carlo block size must be at least 1.")
+
+        self.n_runs = n_runs
+        self.method = method
+        self.block_size = block_size
+        self.seed = seed
+        self.risk_free_rate = risk_free_rate
+        self.evaluator = Evaluator(logs, risk_free_rate)
+        self.returns, self.periods_per_year = self.get_returns()
+        if self.returns.size < 2:
+            raise ValueError(f"The backtest has {self.returns.size} {method} returns, at least 2 are needed for a Monte Carlo analysis.")
+
+
+    def get_returns(self) -> Tuple[np.ndarray, float]:
+        """
+        Returns:
+            Tuple[np.ndarray, float]: The returns to resample, and the number of such returns per year.
+        """
+        if self.method == "trades":
+            buy_prices, sell_prices = self.evaluator.calculate_round_trips()
+            timestamps = self.evaluator.timestamps
+            years = (timestamps[-1] - timestamps[0]) / MS_PER_YEAR if timestamps.size > 1 else 0.0
+            return sell_prices / buy_prices - 1, buy_prices.size / years if years > 0 else 0.0
+
+        if self.evaluator.prices.size < 2:
+            return np.zeros(0), 0.0
+        returns, _ = self.evaluator.calculate_equity_curve(self.evaluator.calculate_positions())
+        return returns[1:], self.evaluator.calculate_periods_per_year()  # the first bar has no return
+
+
+    @staticmethod
+    def resample_indices(rng: np.random.Generator, size: int, n_runs: int, block_size: int) -> np.ndarray:
+        """
+        Draws moving block bootstrap indices: each run is built from blocks of `block_size` consecutive indices,
+        starting at random positions, and cut to `size` indices.
+
+        Args:
+            rng (np.random.Generator): The random generator.
+            size (int): The number of returns.
+            n_runs (int): The number of runs.
+            block_size (int): The block size, capped to the number of returns.
+
+        Returns:
+            np.ndarray: The (n_runs, size) resampled indices.
+        """
+        block_size = min(block_size, size)
+        n_blocks = -(-size // block_size)
+        starts = rng.integers(0, size - block_size + 1, size=(n_runs, n_blocks))
+        return (starts[:, :, None] + np.arange(block_size)).reshape(n_runs, -1)[:, :size]
+
+
+    def calculate_metrics(self, returns: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Evaluates many return series at once, like the Evaluator does for one.
+
+        Args:
+            returns (np.ndarray): The (runs, returns) resampled returns.
+
+        Returns:
+            Dict[str, np.ndarray]: The "total_profit" and "max_drawdown" (percentages) and "sharpe_ratio" of each run.
+        """
+        equity = np.multiply.accumulate(1 + returns, axis=1)
+        total_profit = (equity[:, -1] - 1) * 100
+        peaks = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)  # the equity starts at 1
+        max_drawdown = (1 - np.min(np.divide(equity, peaks, out=equity), axis=1)) * 100
+
+        if self.periods_per_year:
+            excess_returns = returns - self.risk_free_rate / self.periods_per_year
+            std_dev_return = excess_returns.std(axis=1)
+            sharpe_ratio = np.divide(excess_returns.mean(axis=1), std_dev_return, out=np.zeros(returns.shape[0]),
+                                     where=std_dev_return != 0) * np.sqrt(self.periods_per_year)
+        else:
+            sharpe_ratio = np.zeros(returns.shape[0])
+
+        return {"total_profit": total_profit, "max_drawdown": max_drawdown, "sharpe_ratio": sharpe_ratio}
+
+
+    @staticmethod
+    def summarize(values: np.ndarray) -> Dict[str, Any]:
+        """
+        Args:
+            values (np.ndarray): The metric of each run.
+
+        Returns:
+            Dict[str, Any]: The mean, standard deviation, minimum, 5th, 25th, 50th, 75th and 95th percentiles and maximum.
+        """
+        percentiles = np.percentile(values, PERCENTILES)
+        summary = {"mean": values.mean(), "std": values.std(), "min": values.min()}
+        summary.update({f"p{q}": value for q, value in zip(PERCENTILES, percentiles)})
+        summary["max"] = values.max()
+        return Evaluator.clean_json(summary)
+
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Runs the Monte Carlo analysis.
+
+        Returns:
+            Dict[str, Any]: The results:
+                - "method", "n_runs", "block_size" and "samples": The analysis settings and the number of returns resampled.
+                - "actual": The metrics of the backtest returns in their original order.
+                - "distribution": The summary of each metric over the runs (see `summarize`).
+                - "probability_of_loss": The percentage of runs ending with a loss.
+                - "actual_percentile": The percentage of runs with a lower metric than the backtest, per metric.
+        """
+        rng = np.random.default_rng(self.seed)
+        chunk_size = max(1, MAX_CHUNK_ELEMENTS // self.returns.size)
+        chunks = []
+        for start in range(0, self.n_runs, chunk_size):
+            indices = self.resample_indices(rng, self.returns.size, min(chunk_size, self.n_runs - start), self.block_size)
+            chunks.append(self.calculate_metrics(self.returns[indices]))
+        metrics = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+        actual = {name: value[0] for name, value in self.calculate_metrics(self.returns[None, :]).items()}
+
+        return {
+            "method": self.method,
+            "n_runs": self.n_runs,
+            "block_size": self.block_size,
+            "samples": int(self.returns.size),
+            "actual": Evaluator.clean_json(actual),
+            "distribution": {name: self.summarize(values) for name, values in metrics.items()},
+            "probability_of_loss": float(np.mean(metrics["total_profit"] < 0) * 100),
+            "actual_percentile": Evaluator.clean_json({name: np.mean(values < actual[name]) * 100 for name, values in metrics.items()}),
+        }
@@ -0,0 +1,173 @@
+from backend.src.broker.sibyl_trading_engine.backtester.backtester import Backtester
+from backend.src.broker.sibyl_trading_engine.strategies.strategy_factory import StrategyFactory
+from backend.src.broker.sibyl_trading_engine.evaluator.evaluator import Evaluator
+from backend.src.broker.sibyl_trading_engine.indicators.indicator_cache import IndicatorCache
+from collections import Counter
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Any, Optional, Tuple
+
+
+class WalkForwardOptimizer:
+    """
+    Walk-forward optimization of a strategy's parameters.
+
+    The history is split into rolling (or anchored) in-sample / out-of-sample windows. In each fold the parameter
+    set with the best in-sample metric is selected and scored on the following out-of-sample window, and the
+    out-of-sample windows are stitched together into the walk-forward result.
+
+    Since the strategies are causal, the signals of each parameter set are generated once over the whole history,
+    with the indicators warmed up, and only sliced per fold. The indicator arrays are shared between the parameter
+    sets through an IndicatorCache, so a full walk-forward study costs about one parameter sweep plus the
+    (vectorized) evaluations of the folds.
+    """
+
+    def __init__(self, backtester: Backtester, strategy_name: str, params_list: List[Dict[str, Any]], in_sample_size: int,
+                 out_of_sample_size: int, step: Optional[int] = None, anchored: bool = False, rank_by: str = "sharpe_ratio") -> None:
+        """
+        Args:
+            backtester (Backtester): The Backtester providing the market, the klines and the strategy warm-up size.
+            strategy_name (str): The strategy name, as registered in StrategyFactory.
+            params_list (List[Dict[str, Any]]): The strategy parameter sets to choose from.
+            in_sample_size (int): The number of bars of each in-sample window.
+            out_of_sample_size (int): The number of bars of each out-of-sample window.
+            step (int, optional): The number of bars the windows move forward on each fold. At least out_of_sample_size,
+                so that the out-of-sample windows do not overlap. Defaults to out_of_sample_size.
+            anchored (bool, optional): Whether the in-sample windows all start at the beginning of the history
+                (expanding) instead of rolling. Defaults to False.
+            rank_by (str, optional): The Evaluator metric the in-sample parameter sets are ranked by. Defaults to "sharpe_ratio".
+
+        Raises:
+            ValueError: If the window sizes, the strategy or one of the parameter sets is invalid.
+        """
+        if in_sample_size < 2 or out_of_sample_size < 2:
+            raise ValueError("The in-sample and out-of-sample windows must have at least 2 bars.")
+        if step is not None and step < out_of_sample_size:
+            raise ValueError("The walk-forward step must be at least the out-of-sample window size.")
+        Backtester.validate_parameters(strategy_name, params_list)
+        if not StrategyFactory.get_strategy(strategy_name, params_list[0]).is_causal:
+            raise ValueError(f"Walk-forward optimization requires a causal strategy, {strategy_name} is not.")
+
+        self.backtester = backtester
+        self.strategy_name = strategy_name
+        self.params_list = params_list
+        self.in_sample_size = in_sample_size
+        self.out_of_sample_size = out_of_sample_size
+        self.step = step or out_of_sample_size
+        self.anchored = anchored
+        self.rank_by = rank_by
+        self.indicator_cache = IndicatorCache()
+
+
+    def split_folds(self, start: int, end: int) -> List[Tuple[slice, slice]]:
+        """
+        Splits the bars [start, end) into in-sample / out-of-sample windows.
+
+        Args:
+            start (int): The first bar.
+            end (int): The bar after the last one.
+
+        Returns:
+            List[Tuple[slice, slice]]: The in-sample and out-of-sample bar slices of each fold.
+        """
+        folds = []
+        in_sample_start = start
+        while in_sample_start + self.in_sample_size + self.out_of_sample_size <= end:
+            in_sample_end = in_sample_start + self.in_sample_size
+            folds.append((slice(start if self.anchored else in_sample_start, in_sample_end),
+                          slice(in_sample_end, in_sample_end + self.out_of_sample_size)))
+            in_sample_start += self.step
+        return folds
+
+
+    def generate_signals(self, dataset: pd.DataFrame) -> List[np.ndarray]:
+        """
+        Generates the raw signals of every parameter set over the whole dataset, sharing the indicator arrays.
+
+        Args:
+            dataset (pd.DataFrame): The klines.
+
+        Returns:
+            List[np.ndarray]: The signals of each parameter set, one per bar.
+        """
+        signals = []
+        for params in self.params_list:
+            strategy = StrategyFactory.get_strategy(self.strategy_name, params)
+            strategy.indicator_cache = self.indicator_cache
+            signals.append(strategy.generate_signals(dataset.copy())["signal"].to_numpy().astype(str))
+        return signals
+
+
+    @staticmethod
+    def get_orders(signals: np.ndarray) -> np.ndarray:
+        """
+        Turns the signals of a window into orders, starting flat and closing any open position on the last bar,
+        so that each window is evaluated independently of the previous one.
+
+        Args:
+            signals (np.ndarray): The raw signals of the window.
+
+        Returns:
+            np.ndarray: The orders of the window.
+        """
+        orders = Backtester.deduplicate_orders(signals)
+        trade_index = np.flatnonzero((orders == "BUY") | (orders == "SELL"))
+        if trade_index.size and orders[trade_index[-1]] == "BUY":
+            orders[-1] = "SELL" if trade_index[-1] < orders.size - 1 else "INVALID_BUY"
+        return orders
+
+
+    def run(self) -> Tuple[Dict[str, Any], float]:
+        """
+        Runs the walk-forward optimization.
+
+        Returns:
+            Tuple[Dict[str, Any], float]: A tuple containing:
+                - The walk-forward results: the "folds" with their windows, selected parameters and in-sample /
+                  out-of-sample metrics, the "out_of_sample_metrics" of the stitched out-of-sample windows,
+                  the "parameter_stability" (how many folds selected each parameter set) and the
+                  "indicator_cache" hits and misses.
+                - A float representing the market condition score.
+
+        Raises:
+            ValueError: If the history is too short for a single fold.
+        """
+        dataset = self.backtester.get_klines_data()
+        # Same bars as the vectorized backtest: after the strategy warm-up, without the open kline
+        folds = self.split_folds(self.backtester.strategy_chunk - 1, dataset.shape[0] - 1)
+        if not folds:
+            raise ValueError(f"{dataset.shape[0]} klines are not enough for a walk-forward fold of "
+                             f"{self.in_sample_size} + {self.out_of_sample_size} bars after a warm-up of {self.backtester.strategy_chunk} bars.")
+
+        timestamps = dataset["timestamp"].to_numpy(dtype=np.int64)
+        prices = dataset["close_price"].to_numpy(dtype=float)
+        signals = self.generate_signals(dataset)
+
+        fold_results, oos_orders, oos_index, selections = [], [], [], Counter()
+        for in_sample, out_of_sample in folds:
+            in_sample_results = [{"index": index, "params": params, "metrics": Evaluator.from_arrays(timestamps[in_sample], prices[in_sample], self.get_orders(signals[index][in_sample])).evaluate()}
+                                 for index, params in enumerate(self.params_list)]
+            best = Backtester.rank_sweep_results(in_sample_results, self.rank_by)[0]
+            best_index = best["index"]
+            selections[best_index] += 1
+
+            orders = self.get_orders(signals[best_index][out_of_sample])
+            oos_orders.append(orders)
+            oos_index.append(np.arange(out_of_sample.start, out_of_sample.stop))
+            fold_results.append({
+                "in_sample": {"start_time": int(timestamps[in_sample.start]), "end_time": int(timestamps[in_sample.stop - 1])},
+                "out_of_sample": {"start_time": int(timestamps[out_of_sample.start]), "end_time": int(timestamps[out_of_sample.stop - 1])},
+                "params": best["params"],
+                "in_sample_metrics": best["metrics"],
+                "out_of_sample_metrics": Evaluator.from_arrays(timestamps[out_of_sample], prices[out_of_sample], orders).evaluate(),
+            })
+
+        oos_index = np.concatenate(oos_index)
+        results = {
+            "folds": fold_results,
+            "out_of_sample_metrics": Evaluator.from_arrays(timestamps[oos_index], prices[oos_index], np.concatenate(oos_orders)).evaluate(),
+            "parameter_stability": [{"params": self.params_list[index], "folds": count} for index, count in selections.most_common()],
+            "indicator_cache": {"hits": self.indicator_cache.hits, "misses": self.indicator_cache.misses},
+        }
+        score = self.backtester.analyst.get_market_condition_score()
+        return results, score
@@ -1,5 +1,9 @@
 import numpy as np
-from typing import List, Dict, Any
+import math
+from typing import List, Dict, Any, Tuple
+
+
+MS_PER_YEAR = 365 * 24 * 60 * 60 * 1000
 
 
 class Evaluator:
@@ -7,6 +11,10 @@ class Evaluator:
     A class to evaluate the performance of a trading strategy based on its trade history.
     It computes various financial metrics such as profit, Sharpe ratio, maximum drawdown, win rate, and more.
 
+    The logs are converted once to NumPy arrays. The BUY/SELL orders are paired into round trips and a per-bar
+    equity curve is built by holding the asset from each BUY to the next SELL, so that all the metrics are
+    computed in a single vectorized pass, without Python loops over the logs.
+
     Example usage:
         $ tactician = Tactician(exchange, symbol)
         $ tactician.run_strategy(strategy)
@@ -20,13 +28,47 @@ class Evaluator:
         Initializes the Evaluator with trade history data.
 
         Args:
-            trade_history (List[Dict[str, Any]]): A list of executed trades with 'order', 'price', 'amount'.
-            risk_free_rate (float): The risk-free rate used in the Sharpe ratio calculation.
+            trade_history (List[Dict[str, Any]]): The strategy logs, one per bar, with 'timestamp', 'price' and 'order'.
+                HOLD and INVALID orders are used for the equity curve, only BUY and SELL orders are trades.
+            risk_free_rate (float): The annual risk-free rate used in the Sharpe and Sortino ratio calculation.
         """
+        self._set_logs(np.array([trade.get("timestamp", 0) for trade in trade_history], dtype=np.int64),
+                       np.array([trade["price"] for trade in trade_history], dtype=float),
+                       np.array([trade.get("order") for trade in trade_history], dtype=object), risk_free_rate)
         self.trade_history = self.clean_trade_dataset(trade_history)
+
+
+    def _set_logs(self, timestamps: np.ndarray, prices: np.ndarray, orders: np.ndarray, risk_free_rate: float) -> None:
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=float)
+        orders = np.asarray(orders, dtype=object)
+        self.is_buy = orders == "BUY"
+        self.is_sell = orders == "SELL"
         self.risk_free_rate = risk_free_rate
 
 
+    @classmethod
+    def from_arrays(cls, timestamps: np.ndarray, prices: np.ndarray, orders: np.ndarray, risk_free_rate: float = 0.0) -> "Evaluator":
+        """
+        Creates an Evaluator from log arrays, without building the log dictionaries. Used to evaluate many
+        slices of the same backtest (see WalkForwardOptimizer).
+
+        Args:
+            timestamps (np.ndarray): The log timestamps in milliseconds.
+            prices (np.ndarray): The log prices.
+            orders (np.ndarray): The log orders (e.g. "BUY", "SELL", "HOLD", "INVALID_BUY").
+            risk_free_rate (float): The annual risk-free rate used in the Sharpe and Sortino ratio calculation.
+
+        Returns:
+            Evaluator: The Evaluator of the logs.
+        """
+        evaluator = cls.__new__(cls)
+        evaluator._set_logs(timestamps, prices, orders, risk_free_rate)
+        trade_index = np.flatnonzero(evaluator.is_buy | evaluator.is_sell)
+        evaluator.trade_history = [{"timestamp": int(evaluator.timestamps[i]), "price": float(evaluator.prices[i]), "order": orders[i]} for i in trade_index]
+        return evaluator
+
+
     @staticmethod
     def clean_trade_dataset(trade_history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -42,110 +84,114 @@ class Evaluator:
         return filtered_trades
 
 
-    def calculate_profit(self) -> float:
+    def calculate_positions(self) -> np.ndarray:
         """
-        Calculates the total profit or loss based on executed trades.
+        Calculates the position held during each bar: 1 from a BUY until the next SELL, 0 otherwise.
 
         Returns:
-            float: The total profit or loss from all completed trades.
+            np.ndarray: The position entered at the end of each bar.
         """
-        total_profit = 0.0
-        buy_price = None
-        buy_amount = 0.0
-
-        for trade in self.trade_history:
-            if trade["order"] == "BUY":
-                buy_price = trade["price"]
-                buy_amount = trade["amount"]
-            elif trade["order"] == "SELL" and buy_price is not None:
-                sell_price = trade["price"]
-                total_profit += (sell_price - buy_price) * buy_amount
-                buy_price = None  # Reset buy price after the sale
+        # Forward fill the last BUY (1) / SELL (0) order over the bars
+        order_index = np.where(self.is_buy | self.is_sell, np.arange(self.prices.size), -1)
+        last_order = np.maximum.accumulate(order_index)
+        return np.where(last_order >= 0, self.is_buy[np.maximum(last_order, 0)], False).astype(float)
 
-        return total_profit
 
-    @staticmethod
-    def calculate_max_drawdown(prices: List[float]) -> float:
+    def calculate_equity_curve(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Calculates the maximum drawdown, i.e., the largest peak-to-trough loss.
+        Calculates the per-bar strategy returns and the equity curve, starting from an equity of 1.
 
         Args:
-            prices (List[float]): The list of asset prices during the strategy's run.
+            positions (np.ndarray): The position entered at the end of each bar.
 
         Returns:
-            float: The maximum drawdown as a percentage.
+            Tuple[np.ndarray, np.ndarray]: The strategy returns per bar and the equity after each bar.
         """
-        peak = prices[0]
-        drawdowns = [0]  # No drawdown on the first day
+        price_returns = np.zeros(self.prices.size)
+        price_returns[1:] = np.diff(self.prices) / self.prices[:-1]
+        held = np.zeros(self.prices.size)
+        held[1:] = positions[:-1]  # the return of a bar is earned by the position held during it
+        returns = held * price_returns
+        return returns, np.cumprod(1 + returns)
 
-        for price in prices[1:]:
-            peak = max(peak, price)
-            drawdowns.append((peak - price) / peak)
 
-        return max(drawdowns) * 100
+    def calculate_round_trips(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pairs every SELL with its preceding BUY.
 
-    def calculate_sharpe_ratio(self, returns: List[float]) -> float:
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The buy and sell prices of the round trips.
         """
-        Calculates the Sharpe ratio for the strategy based on returns.
+        trade_index = np.flatnonzero(self.is_buy | self.is_sell)
+        trade_is_sell = self.is_sell[trade_index]
+        # a SELL closes a round trip only if the previous trade is a BUY
+        closes = np.flatnonzero(trade_is_sell[1:] & ~trade_is_sell[:-1]) + 1
+        return self.prices[trade_index[closes - 1]], self.prices[trade_index[closes]]
 
-        Args:
-            returns (List[float]): A list of strategy returns per time period.
 
+    def calculate_periods_per_year(self) -> float:
+        """
         Returns:
-            float: The Sharpe ratio.
+            float: The number of bars per year, from the median time between the logs.
         """
-        mean_return = np.mean(returns)
-        std_dev_return = np.std(returns)
-        return (mean_return - self.risk_free_rate) / std_dev_return if std_dev_return != 0 else 0
+        if self.timestamps.size < 2:
+            return 0.0
+        bar_duration = np.median(np.diff(self.timestamps))
+        return MS_PER_YEAR / bar_duration if bar_duration > 0 else 0.0
+
 
-    def calculate_win_rate(self) -> float:
+    @staticmethod
+    def calculate_max_drawdown(equity: np.ndarray) -> Tuple[float, int]:
         """
-        Calculates the win rate of the strategy, i.e., the percentage of profitable trades.
+        Calculates the maximum drawdown, i.e., the largest peak-to-trough loss, and the longest drawdown.
+
+        Args:
+            equity (np.ndarray): The equity curve.
 
         Returns:
-            float: The win rate as a percentage.
+            Tuple[float, int]: The maximum drawdown as a percentage and the maximum drawdown duration in bars.
         """
-        profitable_trades = [trade for trade in self.trade_history if trade["order"] == "SELL" and (
-                trade["price"] > self.trade_history[self.trade_history.index(trade) - 1]["price"])]
-        return len(profitable_trades) / len(
-            [trade for trade in self.trade_history if trade["order"] == "SELL"]) * 100 if len(
-            self.trade_history) > 0 else 0
+        peaks = np.maximum.accumulate(equity)
+        max_drawdown = np.max((peaks - equity) / peaks) * 100
+
+        # Duration: bars since the last time the equity was at its peak
+        bars = np.arange(equity.size)
+        last_peak = np.maximum.accumulate(np.where(equity >= peaks, bars, 0))
+        max_drawdown_duration = int(np.max(bars - last_peak))
+        return max_drawdown, max_drawdown_duration
 
-    def calculate_average_win_loss(self) -> Dict[str, float]:
+
+    def calculate_sharpe_ratio(self, returns: np.ndarray, periods_per_year: float) -> float:
         """
-        Calculates the average profit and average loss for the winning and losing trades.
+        Calculates the annualized Sharpe ratio of the per-bar strategy returns.
+
+        Args:
+            returns (np.ndarray): The strategy returns per bar.
+            periods_per_year (float): The number of bars per year.
 
         Returns:
-            Dict[str, float]: A dictionary containing the average win and average loss.
+            float: The Sharpe ratio.
         """
-        wins = [trade for trade in self.trade_history if trade["order"] == "SELL" and (
-                trade["price"] > self.trade_history[self.trade_history.index(trade) - 1]["price"])]
-        losses = [trade for trade in self.trade_history if trade["order"] == "SELL" and (
-                trade["price"] < self.trade_history[self.trade_history.index(trade) - 1]["price"])]
-
-        avg_win = np.mean(
-            [trade["price"] - self.trade_history[self.trade_history.index(trade) - 1]["price"] for trade in
-             wins]) if wins else 0
-        avg_loss = np.mean(
-            [trade["price"] - self.trade_history[self.trade_history.index(trade) - 1]["price"] for trade in
-             losses]) if losses else 0
+        excess_returns = returns - self.risk_free_rate / periods_per_year
+        std_dev_return = np.std(excess_returns)
+        return np.mean(excess_returns) / std_dev_return * np.sqrt(periods_per_year) if std_dev_return != 0 else 0
 
-        return {"average_win": avg_win, "average_loss": avg_loss}
 
-    def calculate_sortino_ratio(self, returns: List[float]) -> float:
+    def calculate_sortino_ratio(self, returns: np.ndarray, periods_per_year: float) -> float:
         """
-        Calculates the Sortino ratio, which penalizes negative returns more heavily than positive ones.
+        Calculates the annualized Sortino ratio, which penalizes negative returns more heavily than positive ones.
 
         Args:
-            returns (List[float]): A list of strategy returns per time period.
+            returns (np.ndarray): The strategy returns per bar.
+            periods_per_year (float): The number of bars per year.
 
         Returns:
             float: The Sortino ratio.
         """
-        downside_returns = [r for r in returns if r < 0]
-        mean_return = np.mean(returns)
-        downside_deviation = np.std(downside_returns) if downside_returns else 0
-        return (mean_return - self.risk_free_rate) / downside_deviation if downside_deviation != 0 else 0
+        excess_returns = returns - self.risk_free_rate / periods_per_year
+        downside_deviation = np.sqrt(np.mean(np.minimum(excess_returns, 0) ** 2))
+        return np.mean(excess_returns) / downside_deviation * np.sqrt(periods_per_year) if downside_deviation != 0 else 0
+
 
     @staticmethod
     def calculate_calmar_ratio(annual_return: float, max_drawdown: float) -> float:
@@ -154,8 +200,8 @@ class Evaluator:
         and the maximum drawdown.
 
         Args:
-            annual_return (float): The annualized return of the strategy.
-            max_drawdown (float): The maximum drawdown of the strategy.
+            annual_return (float): The annualized return of the strategy, as a percentage.
+            max_drawdown (float): The maximum drawdown of the strategy, as a percentage.
 
         Returns:
             float: The Calmar ratio.
@@ -163,26 +209,19 @@ class Evaluator:
         return annual_return / max_drawdown if max_drawdown != 0 else 0
 
 
-    def calculate_profit_factor(self) -> float:
+    @staticmethod
+    def calculate_profit_factor(pnl: np.ndarray) -> float:
         """
         Calculates the profit factor, which is the ratio of gross profit to gross loss.
 
+        Args:
+            pnl (np.ndarray): The profit or loss of each round trip.
+
         Returns:
-            float: The profit factor. Returns None if there are no losses and no profits.
-        """
-        gross_profit = sum(
-            trade["price"] - self.trade_history[i - 1]["price"]
-            for i, trade in enumerate(self.trade_history[1:], start=1)
-            if trade["order"] == "SELL" and trade["price"] > self.trade_history[i - 1]["price"]
-        )
-
-        gross_loss = abs(
-            sum(
-                trade["price"] - self.trade_history[i - 1]["price"]
-                for i, trade in enumerate(self.trade_history[1:], start=1)
-                if trade["order"] == "SELL" and trade["price"] < self.trade_history[i - 1]["price"]
-            )
-        )
+            float: The profit factor. Returns the gross profit if there are no losses.
+        """
+        gross_profit = pnl[pnl > 0].sum()
+        gross_loss = abs(pnl[pnl < 0].sum())
 
         if gross_loss == 0:
             return gross_profit if gross_profit > 0 else 0.0  # Return gross profit or 0.0 instead of NaN/Inf
@@ -193,22 +232,26 @@ class Evaluator:
     @staticmethod
     def clean_json(data: Dict[str, Any]) -> Dict[str, Any]:
         for key, value in data.items():
-            if isinstance(value, np.float64) and (np.isnan(value) or np.isinf(value)):
-                data[key] = "N/A"
+            if isinstance(value, (float, np.floating)):
+                data[key] = float(value) if math.isfinite(value) else "N/A"
+            elif isinstance(value, np.integer):
+                data[key] = int(value)
         return data
 
 
     def evaluate(self) -> Dict[str, Any]:
         """
         Evaluates the strategy's performance by calculating key financial metrics:
-        - Total profit/loss
+        - Total profit/loss, as a percentage of the initial capital
         - Sharpe ratio
-        - Maximum drawdown
+        - Maximum drawdown and its duration in bars
         - Win rate
         - Average win and loss
         - Sortino ratio
         - Calmar ratio
         - Profit factor
+        - Exposure, the percentage of bars in a position
+        - Turnover, the traded value relative to the average equity
 
         Returns:
             dict: A dictionary with evaluation metrics.
@@ -216,33 +259,33 @@ class Evaluator:
 
         if self.trade_history:
             try:
-                # profit = self.calculate_profit() # TODO
-
-                # Extract closing prices for metrics
-                closing_prices = [trade["price"] for trade in self.trade_history if trade["order"] == "SELL"]
+                positions = self.calculate_positions()
+                returns, equity = self.calculate_equity_curve(positions)
+                periods_per_year = self.calculate_periods_per_year()
+                max_drawdown, max_drawdown_duration = self.calculate_max_drawdown(equity)
 
-                # Calculate returns from the closing prices
-                returns = [100 * (closing_prices[i] - closing_prices[i - 1]) / closing_prices[i - 1]
-                           for i in range(1, len(closing_prices))]
+                buy_prices, sell_prices = self.calculate_round_trips()
+                pnl = sell_prices - buy_prices
+                wins, losses = pnl[pnl > 0], pnl[pnl < 0]
 
-                max_drawdown = self.calculate_max_drawdown(closing_prices)
-                win_rate = self.calculate_win_rate()
-                avg_win_loss = self.calculate_average_win_loss()
-                sortino_ratio = self.calculate_sortino_ratio(returns)
-                calmar_ratio = self.calculate_calmar_ratio(np.mean(returns) * 252, max_drawdown)  # Annualized return assumption
-                profit_factor = self.calculate_profit_factor()
+                total_return = equity[-1] - 1
+                annual_return = ((1 + total_return) ** (periods_per_year / returns.size) - 1) * 100 if periods_per_year else 0.0
+                traded_equity = equity[self.is_buy | self.is_sell].sum()
 
                 evaluation_results = {
-                    "total_profit": 'N/A',  # profit,
-                    "sharpe_ratio": self.calculate_sharpe_ratio(returns),
+                    "total_profit": total_return * 100,
+                    "sharpe_ratio": self.calculate_sharpe_ratio(returns, periods_per_year) if periods_per_year else 0,
                     "max_drawdown": max_drawdown,
-                    "win_rate": win_rate,
-                    "average_win": avg_win_loss["average_win"],
-                    "average_loss": avg_win_loss["average_loss"],
-                    "sortino_ratio": sortino_ratio,
-                    "calmar_ratio": calmar_ratio,
-                    "profit_factor": profit_factor,
-                    "number_of_trades": len(closing_prices),
+                    "max_drawdown_duration": max_drawdown_duration,
+                    "win_rate": wins.size / pnl.size * 100 if pnl.size > 0 else 0,
+                    "average_win": wins.mean() if wins.size else 0,
+                    "average_loss": losses.mean() if losses.size else 0,
+                    "sortino_ratio": self.calculate_sortino_ratio(returns, periods_per_year) if periods_per_year else 0,
+                    "calmar_ratio": self.calculate_calmar_ratio(annual_return, max_drawdown),
+                    "profit_factor": self.calculate_profit_factor(pnl),
+                    "exposure": positions[:-1].mean() * 100 if positions.size > 1 else 0,
+                    "turnover": traded_equity / equity.mean(),
+                    "number_of_trades": int(self.is_sell.sum()),
                 }
                 evaluation_results = self.clean_json(evaluation_results)
                 return evaluation_results
@@ -250,4 +293,4 @@ class Evaluator:
                 print("Strategy Evaluator :: evaluate :: ", e)
                 return {}
         else:
-            return {}
\ No newline at end of file
+            return {}
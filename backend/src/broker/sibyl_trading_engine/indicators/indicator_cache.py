@@ -0,0 +1,86 @@
+from typing import Any, Callable, Dict, Hashable, Tuple
+import hashlib
+import weakref
+import numpy as np
+import pandas as pd
+
+
+DATASET_COLUMNS = ("timestamp", "open_price", "high", "low", "close_price", "volume")  # the klines the indicators are computed from
+
+
+class IndicatorCache:
+    """
+    Cache of indicator arrays computed over one dataset, shared by all the strategy instances evaluated on it.
+
+    Parameter sweeps and walk-forward studies evaluate many parameter sets over the same klines, and most parameter
+    sets share their indicators (e.g. every RSI threshold pair uses the same 14-period RSI). Strategies look their
+    indicators up by a key such as ("rsi", "close_price", 14), so each (indicator, column, window) is only computed
+    once. The cache is bound to a dataset: a lookup with different klines clears it.
+    """
+
+    def __init__(self) -> None:
+        self.arrays: Dict[Hashable, np.ndarray] = {}
+        self.dataset_id: Tuple[int, bytes] | None = None
+        self.hits = 0
+        self.misses = 0
+        self._last_data: weakref.ref | None = None  # the DataFrame of the last lookup, whose id is not hashed again
+        self._last_dataset_id: Tuple[int, bytes] | None = None
+
+
+    @staticmethod
+    def hash_dataset(data: pd.DataFrame) -> Tuple[int, bytes]:
+        """
+        Identifies a dataset by its length and a hash of its kline columns, so that two datasets only share their
+        indicators if they hold the same klines.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for column in DATASET_COLUMNS:
+            if column in data.columns:
+                digest.update(column.encode())
+                digest.update(np.ascontiguousarray(data[column].to_numpy(dtype=np.int64 if column == "timestamp" else float)).view(np.uint8))
+        return data.shape[0], digest.digest()
+
+
+    def get_dataset_id(self, data: pd.DataFrame) -> Tuple[int, bytes]:
+        """
+        Returns the id of a dataset (see `hash_dataset`). The strategies look up all their indicators over the same
+        DataFrame, so its id is only hashed on the first lookup. The klines must not be modified in place between
+        the lookups.
+        """
+        if self._last_data is None or self._last_data() is not data:
+            self._last_dataset_id = self.hash_dataset(data)
+            self._last_data = weakref.ref(data)
+        return self._last_dataset_id
+
+
+    def get(self, data: pd.DataFrame, key: Hashable, compute: Callable[[], Any]) -> np.ndarray:
+        """
+        Returns the cached indicator array, computing it on a cache miss.
+
+        Args:
+            data (pd.DataFrame): The dataset the indicator is computed over.
+            key (Hashable): The indicator key, e.g. ("rsi", "close_price", 14).
+            compute (Callable[[], Any]): Computes the indicator values over the dataset.
+
+        Returns:
+            np.ndarray: The read-only indicator values, one per dataset row.
+        """
+        dataset_id = self.get_dataset_id(data)
+        if dataset_id != self.dataset_id:
+            self.clear()
+            self.dataset_id = dataset_id
+
+        if key in self.arrays:
+            self.hits += 1
+            return self.arrays[key]
+
+        self.misses += 1
+        values = np.asarray(compute(), dtype=float)
+        values.flags.writeable = False
+        self.arrays[key] = values
+        return values
+
+
+    def clear(self) -> None:
+        self.arrays.clear()
+        self.dataset_id = None
@@ -0,0 +1,416 @@
+"""
+NumPy indicator kernels, shared by the strategies and the Analyst.
+
+The kernels take raw float64 arrays (or anything `np.asarray` accepts, e.g. a DataFrame column) and return float64
+arrays of the same length, NaN where the indicator is not defined yet, so they can be assigned back to a DataFrame or
+cached as-is (see IndicatorCache). They reproduce the pandas expressions they replace, e.g. `rolling_mean` is
+`pd.Series.rolling(window).mean()` and `ema` is `pd.Series.ewm(span, adjust=False).mean()`, and the `ta` indicators
+used by the Analyst (`wilder_rsi`, `adx`, `bollinger_wband`, `macd`). tests/test_indicator_kernels.py checks the
+equivalence, and the benchmarks/indicator_kernels.py script times the kernels against the pandas and `ta` implementations.
+
+The rolling windows and the exponential averages are computed block-wise, with prefix sums within the blocks and
+closed forms across them, so there is no Python loop over the values and each kernel is O(n) whatever the window.
+"""
+
+from typing import Tuple
+import numpy as np
+
+
+MAX_DECAY_SCALE = 1e100  # largest weight rescaling of a block in `decay_filter`
+EWM_TRUNCATION = 1e-20  # relative weight below which `ewm_std` drops the old values
+
+
+def as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def shift(values, periods: int = 1) -> np.ndarray:
+    """
+    Equivalent to `pd.Series.shift(periods)`, for periods >= 0.
+    """
+    values = as_float_array(values)
+    shifted = np.full(values.size, np.nan)
+    if periods < values.size:
+        shifted[periods:] = values[:values.size - periods]
+    return shifted
+
+
+def diff(values, periods: int = 1) -> np.ndarray:
+    """
+    Equivalent to `pd.Series.diff(periods)`, for periods >= 1.
+    """
+    values = as_float_array(values)
+    return values - shift(values, periods)
+
+
+def decay_filter(values: np.ndarray, decay: float) -> np.ndarray:
+    """
+    Computes the linear recurrence y[t] = decay * y[t - 1] + values[t], with y[-1] = 0, which underlies all the
+    exponential averages.
+
+    The values are split into blocks short enough that decay ** -block_size does not overflow. Within a block the
+    recurrence has the closed form y[s + j] = decay ** j * (decay * y[s - 1] + sum(values[s + k] * decay ** -k, k <= j)),
+    computed for all the blocks at once with a cumulative sum, and only the block carries are propagated in a loop.
+
+    Args:
+        values (np.ndarray): The recurrence inputs, without NaN.
+        decay (float): The decay factor, in [0, 1].
+
+    Returns:
+        np.ndarray: The recurrence outputs.
+    """
+    values = as_float_array(values)
+    if decay == 0 or values.size == 0:
+        return values.copy()
+    if decay == 1:
+        return np.cumsum(values)
+
+    block_size = int(min(values.size, max(1, np.log(MAX_DECAY_SCALE) // -np.log(decay))))
+    blocks_num = -(-values.size // block_size)
+    blocks = np.zeros(blocks_num * block_size)
+    blocks[:values.size] = values
+    blocks = blocks.reshape(blocks_num, block_size)
+
+    powers = decay ** np.arange(block_size)
+    local = np.cumsum(blocks / powers, axis=1) * powers  # outputs of each block with a zero carry in
+
+    carry, block_decay = 0.0, decay * powers  # the carry in of a block decays by decay ** (j + 1)
+    for block in local:
+        block += carry * block_decay
+        carry = block[-1]
+    return local.ravel()[:values.size]
+
+
+def ema(values, span: float | None = None, alpha: float | None = None, min_periods: int = 0) -> np.ndarray:
+    """
+    Exponential Moving Average, equivalent to `pd.Series.ewm(span=span, alpha=alpha, min_periods=min_periods, adjust=False).mean()`.
+
+    Leading NaN values are skipped (the first valid value initializes the average) and are not counted in
+    min_periods. The values after the first valid one must not be NaN.
+
+    Args:
+        values: The input values.
+        span (float, optional): The EMA span, alpha = 2 / (span + 1).
+        alpha (float, optional): The smoothing factor, used instead of the span (e.g. 1 / window for Wilder's smoothing).
+        min_periods (int): The number of values needed to output an average.
+
+    Returns:
+        np.ndarray: The EMA values.
+    """
+    values = as_float_array(values)
+    if alpha is None:
+        alpha = 2.0 / (span + 1.0)
+    result = np.full(values.size, np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if valid.size == 0:
+        return result
+
+    first = valid[0]
+    inputs = alpha * values[first:]
+    inputs[0] = values[first]
+    result[first:] = decay_filter(inputs, 1.0 - alpha)
+    result[first:first + max(min_periods, 1) - 1] = np.nan
+    return result
+
+
+def ewm_std(values, span: float) -> np.ndarray:
+    """
+    Exponentially weighted standard deviation, equivalent to `pd.Series.ewm(span=span).std()` (adjusted weights,
+    bias corrected). The values must not be NaN.
+
+    The values are split into blocks over which the weights decay by EWM_TRUNCATION, so that each weighted sum only
+    needs its own block and the previous one. The sums are taken relative to the first value of the block, like in
+    `_rolling_moments`, which avoids the cancellation of the sum of squares formula.
+
+    Args:
+        values: The input values.
+        span (float): The span of the weights.
+
+    Returns:
+        np.ndarray: The standard deviation values, NaN for the first value.
+    """
+    values = as_float_array(values)
+    decay = 1.0 - 2.0 / (span + 1.0)
+    if values.size == 0 or decay == 0:
+        return np.full(values.size, np.nan)
+
+    block_size = int(min(values.size, np.ceil(np.log(EWM_TRUNCATION) / np.log(decay))))
+    blocks_num = -(-values.size // block_size)
+    blocks = np.zeros(blocks_num * block_size)
+    blocks[:values.size] = values
+    blocks = blocks.reshape(blocks_num, block_size)
+    reference = blocks[:, 0]
+    deviations = blocks - reference[:, None]
+
+    powers = decay ** np.arange(block_size)
+    sum_0 = np.cumsum(1.0 / powers) * powers  # weighted sums within each block
+    sum_1 = np.cumsum(deviations / powers, axis=1) * powers
+    sum_2 = np.cumsum(deviations ** 2 / powers, axis=1) * powers
+    sum_0 = np.tile(sum_0, (blocks_num, 1))
+
+    # add the previous block, decayed and moved to the reference of the block
+    shift = (reference[:-1] - reference[1:])[:, None]
+    tail_0, tail_1, tail_2 = sum_0[:-1, -1:], sum_1[:-1, -1:], sum_2[:-1, -1:]
+    tail_decay = decay * powers
+    sum_2[1:] += (tail_2 + 2 * shift * tail_1 + tail_0 * shift ** 2) * tail_decay
+    sum_1[1:] += (tail_1 + tail_0 * shift) * tail_decay
+    sum_0[1:] += tail_0 * tail_decay
+
+    sum_0, sum_1, sum_2 = (total.ravel()[:values.size] for total in (sum_0, sum_1, sum_2))
+    biased_variance = np.maximum(sum_2 / sum_0 - (sum_1 / sum_0) ** 2, 0.0)
+    squared_weights = np.full(values.size, 1.0 / (1.0 - decay ** 2))  # sum of the squared adjusted weights
+    squared_weights[:block_size] = (1.0 - (decay * powers) ** 2) / (1.0 - decay ** 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = np.sqrt(biased_variance * sum_0 ** 2 / (sum_0 ** 2 - squared_weights))
+    std[0] = np.nan  # a single value has no unbiased variance
+    return std
+
+
+def _rolling_moments(values: np.ndarray, window: int, squares: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray | None]:
+    """
+    Computes the number of valid values of each rolling window and their sum and sum of squares, relative to a
+    reference value.
+
+    The values are split into blocks of window values, so that each window covers the end of a block and the start
+    of the next one, and the window sums are the difference of prefix sums within the blocks. The sums are relative
+    to the first valid value of the block the window ends in, which keeps them small, so the variance does not suffer
+    from the cancellation of the sum of squares formula and is as accurate as a two-pass computation.
+
+    Args:
+        values (np.ndarray): The values, NaN values are skipped.
+        window (int): The rolling window size.
+        squares (bool): Whether to compute the sums of squares.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray | None]: The reference value, the number of valid values,
+            the sum and the sum of squares (None if not computed) of the deviations from the reference of each window.
+    """
+    if window < 1:
+        raise ValueError("The rolling window must be at least 1.")
+    size = values.size
+    blocks_num = -(-size // window)
+    blocks = np.zeros(blocks_num * window)
+    blocks[:size] = values
+    blocks = blocks.reshape(blocks_num, window)
+
+    is_valid = ~np.isnan(blocks)
+    has_nan = not is_valid.all()
+    if has_nan:
+        first_valid = blocks[np.arange(blocks_num), np.argmax(is_valid, axis=1)]
+        reference = np.where(is_valid.any(axis=1), first_valid, 0.0)
+        deviations = np.where(is_valid, blocks - reference[:, None], 0.0)
+        counts = np.cumsum(is_valid, axis=1, dtype=float)
+    else:
+        reference = blocks[:, 0].copy()
+        deviations = blocks - reference[:, None]
+    sum_1 = np.cumsum(deviations, axis=1)
+    sum_2 = np.cumsum(deviations ** 2, axis=1) if squares else None
+
+    # add the end of the previous block, moved to the reference of the block
+    shift = (reference[:-1] - reference[1:])[:, None]
+    tail_1 = sum_1[:-1, -1:] - sum_1[:-1]
+    tail_counts = counts[:-1, -1:] - counts[:-1] if has_nan else np.arange(window - 1, -1, -1, dtype=float)
+    if squares:
+        sum_2[1:] += (sum_2[:-1, -1:] - sum_2[:-1]) + 2 * shift * tail_1 + tail_counts * shift ** 2
+        sum_2 = sum_2.ravel()[:size]
+    sum_1[1:] += tail_1 + tail_counts * shift
+    if has_nan:
+        counts[1:] += tail_counts
+        counts = counts.ravel()[:size]
+    else:
+        counts = np.minimum(np.arange(1, size + 1), window).astype(float)
+
+    return np.repeat(reference, window)[:size], counts, sum_1.ravel()[:size], sum_2
+
+
+def rolling_sum(values, window: int, min_periods: int | None = None) -> np.ndarray:
+    """
+    Equivalent to `pd.Series.rolling(window, min_periods).sum()`.
+    """
+    values = as_float_array(values)
+    reference, counts, sum_1, _ = _rolling_moments(values, window, squares=False)
+    min_periods = window if min_periods is None else min_periods
+    return np.where(counts >= max(min_periods, 1), reference * counts + sum_1, np.nan)
+
+
+def rolling_mean(values, window: int, min_periods: int | None = None) -> np.ndarray:
+    """
+    Simple Moving Average, equivalent to `pd.Series.rolling(window, min_periods).mean()`.
+    """
+    values = as_float_array(values)
+    reference, counts, sum_1, _ = _rolling_moments(values, window, squares=False)
+    min_periods = window if min_periods is None else min_periods
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts >= max(min_periods, 1), reference + sum_1 / counts, np.nan)
+
+
+def rolling_std(values, window: int, min_periods: int | None = None, ddof: int = 1) -> np.ndarray:
+    """
+    Equivalent to `pd.Series.rolling(window, min_periods).std(ddof=ddof)`.
+    """
+    values = as_float_array(values)
+    _, counts, sum_1, sum_2 = _rolling_moments(values, window)
+    min_periods = window if min_periods is None else min_periods
+    with np.errstate(divide="ignore", invalid="ignore"):
+        squared_deviations = np.where(counts > 1, np.maximum(sum_2 - sum_1 ** 2 / counts, 0.0), 0.0)
+        variance = squared_deviations / (counts - ddof)
+    return np.where((counts >= max(min_periods, 1)) & (counts > ddof), np.sqrt(variance), np.nan)
+
+
+def rsi(close_price, window: int = 14, min_periods: int | None = None, epsilon: float = 0.0) -> np.ndarray:
+    """
+    Relative Strength Index over simple moving averages of the gains and losses, as computed by the strategies
+    and `Analyst.calc_rsi`.
+
+    Args:
+        close_price: The close prices.
+        window (int): The averaging window.
+        min_periods (int, optional): The number of price changes needed to output a value. Defaults to window.
+        epsilon (float): Added to the average loss to avoid divisions by zero.
+
+    Returns:
+        np.ndarray: The RSI values, between 0 and 100.
+    """
+    delta = diff(close_price)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative_strength = rolling_mean(gain, window, min_periods) / (rolling_mean(loss, window, min_periods) + epsilon)
+        return 100 - (100 / (1 + relative_strength))
+
+
+def wilder_rsi(close_price, window: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index over Wilder's smoothing of the gains and losses, equivalent to `ta.momentum.RSIIndicator`.
+    """
+    delta = diff(close_price)
+    average_gain = ema(np.where(delta > 0, delta, 0.0), alpha=1.0 / window, min_periods=window)
+    average_loss = ema(np.where(delta < 0, -delta, 0.0), alpha=1.0 / window, min_periods=window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(average_loss == 0, 100.0, 100 - (100 / (1 + average_gain / average_loss)))
+
+
+def macd(close_price, fast: int = 12, slow: int = 26, signal: int = 9, warm_up: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moving Average Convergence Divergence.
+
+    Args:
+        close_price: The close prices.
+        fast (int): The span of the fast EMA.
+        slow (int): The span of the slow EMA.
+        signal (int): The span of the signal EMA of the MACD.
+        warm_up (bool): Whether each EMA outputs NaN until its span is filled, as `ta.trend.MACD` does. The signal EMA
+            then starts at the first MACD value instead of the first price.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The MACD, signal and histogram (MACD - signal) values.
+    """
+    macd_values = ema(close_price, fast, min_periods=fast if warm_up else 0) - ema(close_price, slow, min_periods=slow if warm_up else 0)
+    signal_values = ema(macd_values, signal, min_periods=signal if warm_up else 0)
+    return macd_values, signal_values, macd_values - signal_values
+
+
+def true_range(high, low, close_price) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: The true range of each kline, NaN for the first one.
+    """
+    high, low = as_float_array(high), as_float_array(low)
+    previous_close = shift(close_price)
+    return np.maximum.reduce([high - low, np.abs(high - previous_close), np.abs(low - previous_close)])
+
+
+def atr(high, low, close_price, window: int = 14) -> np.ndarray:
+    """
+    Average True Range, over a simple moving average.
+    """
+    return rolling_mean(true_range(high, low, close_price), window)
+
+
+def cmf(high, low, close_price, volume, window: int = 20, epsilon: float = 1e-9) -> np.ndarray:
+    """
+    Chaikin Money Flow.
+
+    Args:
+        high, low, close_price, volume: The klines.
+        window (int): The summing window.
+        epsilon (float): Added to the kline ranges to avoid divisions by zero.
+
+    Returns:
+        np.ndarray: The CMF values, between -1 and 1.
+    """
+    high, low, close_price, volume = (as_float_array(values) for values in (high, low, close_price, volume))
+    money_flow_multiplier = ((close_price - low) - (high - close_price)) / (high - low + epsilon)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return rolling_sum(money_flow_multiplier * volume, window) / rolling_sum(volume, window)
+
+
+def tsi(close_price, long: int = 25, short: int = 13, epsilon: float = 1e-9) -> np.ndarray:
+    """
+    True Strength Index: the double smoothed price changes over the double smoothed absolute price changes.
+    """
+    delta = diff(close_price)
+    smoothed_delta = ema(ema(delta, short), long)
+    smoothed_abs_delta = ema(ema(np.abs(delta), short), long)
+    return 100 * (smoothed_delta / (smoothed_abs_delta + epsilon))
+
+
+def adx(high, low, close_price, window: int = 14) -> np.ndarray:
+    """
+    Average Directional Index, equivalent to `ta.trend.ADXIndicator(...).adx()`, including its conventions: the
+    directional movements are summed from the second kline, the values before the first complete average are 0, and
+    each ADX value averages the directional indexes up to the previous kline.
+
+    Args:
+        high, low, close_price: The klines.
+        window (int): The smoothing window.
+
+    Returns:
+        np.ndarray: The ADX values.
+
+    Raises:
+        ValueError: If there are not enough klines for a first ADX value.
+    """
+    high, low = as_float_array(high), as_float_array(low)
+    size = high.size
+    smoothed_size = size - window + 1
+    if smoothed_size <= window:
+        raise ValueError(f"The ADX of window {window} needs more than {2 * window - 1} klines, got {size}.")
+
+    def wilder_sum(movement: np.ndarray) -> np.ndarray:
+        # sum of the first window movements, then smoothed[i] = smoothed[i - 1] * (1 - 1 / window) + movement[window + i]
+        inputs = np.empty(smoothed_size)
+        inputs[0] = movement[1:window + 1].sum()
+        inputs[1:-1] = movement[window + 1:window + smoothed_size - 1]
+        inputs[-1] = 0.0
+        smoothed = decay_filter(inputs, 1.0 - 1.0 / window)
+        smoothed[-1] = 0.0  # ta leaves the last smoothed value unset
+        return smoothed
+
+    up_move = diff(high)
+    down_move = -diff(low)
+    true_ranges = wilder_sum(true_range(high, low, close_price))
+    positive_movement = wilder_sum(np.where((up_move > down_move) & (up_move > 0), up_move, 0.0))
+    negative_movement = wilder_sum(np.where((down_move > up_move) & (down_move > 0), down_move, 0.0))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        positive_index = np.where(true_ranges != 0, 100 * positive_movement / true_ranges, 0.0)
+        negative_index = np.where(true_ranges != 0, 100 * negative_movement / true_ranges, 0.0)
+        index_sum = positive_index + negative_index
+        directional_index = np.where(index_sum != 0, 100 * np.abs((positive_index - negative_index) / index_sum), 0.0)
+
+    # adx[window] = mean of the first window indexes, then adx[i] = (adx[i - 1] * (window - 1) + dx[i - 1]) / window
+    inputs = directional_index[window - 1:smoothed_size - 1] / window
+    inputs[0] = directional_index[:window].mean()
+    adx_values = np.zeros(size)
+    adx_values[2 * window - 1:] = decay_filter(inputs, 1.0 - 1.0 / window)
+    return adx_values
+
+
+def bollinger_wband(close_price, window: int = 20, window_dev: float = 2) -> np.ndarray:
+    """
+    Bollinger Band width as a percentage of the moving average, equivalent to `ta.volatility.BollingerBands(...).bollinger_wband()`.
+    """
+    moving_average = rolling_mean(close_price, window)
+    deviation = rolling_std(close_price, window, ddof=0)
+    return ((moving_average + window_dev * deviation) - (moving_average - window_dev * deviation)) / moving_average * 100
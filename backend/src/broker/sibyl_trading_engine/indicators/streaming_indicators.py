@@ -0,0 +1,329 @@
+from collections import deque
+from typing import Tuple
+import math
+
+
+NAN = float("nan")
+
+
+class EMA:
+    """
+    Streaming Exponential Moving Average.
+
+    Equivalent to `pd.Series.ewm(span=span, adjust=False).mean()`, updated in O(1) per value.
+    Leading NaN values are skipped (the first valid value initializes the average).
+    """
+
+    def __init__(self, span: int) -> None:
+        """
+        Args:
+            span (int): The EMA span.
+        """
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = NAN
+
+
+    def update(self, x: float) -> float:
+        """
+        Adds a new value and returns the updated EMA.
+
+        Args:
+            x (float): The new value.
+
+        Returns:
+            float: The current EMA.
+        """
+        if math.isnan(x):
+            return self.value
+        if math.isnan(self.value):
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class SMA:
+    """
+    Streaming Simple Moving Average with rolling standard deviation and sum.
+
+    Equivalent to `pd.Series.rolling(window, min_periods).mean()` / `.std()` / `.sum()`, updated in O(1) per value.
+    The mean and variance are kept with Welford's add/remove updates, so they do not drift over long runs.
+    NaN values occupy a slot in the window but are not counted as observations, as in pandas.
+    """
+
+    def __init__(self, window: int, min_periods: int = None) -> None:
+        """
+        Args:
+            window (int): The rolling window size.
+            min_periods (int, optional): Minimum number of valid observations to output a value. Defaults to window.
+        """
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.values = deque(maxlen=window)
+        self.count = 0  # Number of valid (non NaN) values in the window
+        self._mean = 0.0
+        self._m2 = 0.0
+
+
+    def _add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+
+
+    def _remove(self, x: float) -> None:
+        self.count -= 1
+        if self.count == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = x - self._mean
+        self._mean -= delta / self.count
+        self._m2 -= delta * (x - self._mean)
+
+
+    def update(self, x: float) -> float:
+        """
+        Adds a new value, drops the oldest one if the window is full and returns the updated mean.
+
+        Args:
+            x (float): The new value.
+
+        Returns:
+            float: The current rolling mean, NaN if there are fewer than `min_periods` valid values.
+        """
+        if len(self.values) == self.window:
+            oldest = self.values[0]
+            if not math.isnan(oldest):
+                self._remove(oldest)
+        self.values.append(x)
+        if not math.isnan(x):
+            self._add(x)
+        return self.mean
+
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self.count >= max(self.min_periods, 1) else NAN
+
+
+    @property
+    def std(self) -> float:
+        if self.count < max(self.min_periods, 2):
+            return NAN
+        return math.sqrt(max(self._m2, 0.0) / (self.count - 1))
+
+
+    @property
+    def sum(self) -> float:
+        return self._mean * self.count if self.count >= max(self.min_periods, 1) else NAN
+
+
+class Momentum:
+    """
+    Streaming n-period difference, equivalent to `pd.Series.diff(period)`.
+    """
+
+    def __init__(self, period: int = 1) -> None:
+        """
+        Args:
+            period (int): The number of periods to look back.
+        """
+        self.values = deque(maxlen=period + 1)
+        self.value = NAN
+
+
+    def update(self, x: float) -> float:
+        """
+        Adds a new value and returns the difference to the value `period` steps back.
+
+        Args:
+            x (float): The new value.
+
+        Returns:
+            float: The current difference, NaN until `period` + 1 values have been seen.
+        """
+        self.values.append(x)
+        self.value = x - self.values[0] if len(self.values) == self.values.maxlen else NAN
+        return self.value
+
+
+class RSI:
+    """
+    Streaming Relative Strength Index, using simple moving averages of gains and losses
+    (the variant used by the Sibyl strategies).
+    """
+
+    def __init__(self, window: int = 14, min_periods: int = None, epsilon: float = 1e-9) -> None:
+        """
+        Args:
+            window (int): The RSI lookback period.
+            min_periods (int, optional): Minimum number of observations for the averages. Defaults to window.
+            epsilon (float): Added to the average loss to avoid division by zero.
+        """
+        self.avg_gain = SMA(window, min_periods)
+        self.avg_loss = SMA(window, min_periods)
+        self.epsilon = epsilon
+        self.delta = Momentum(1)
+        self.value = NAN
+
+
+    def update(self, close_price: float) -> float:
+        """
+        Adds a new close price and returns the updated RSI.
+
+        Args:
+            close_price (float): The new close price.
+
+        Returns:
+            float: The current RSI.
+        """
+        delta = self.delta.update(close_price)
+        # The first delta is NaN, which counts as no gain and no loss
+        avg_gain = self.avg_gain.update(delta if delta > 0 else 0.0)
+        avg_loss = self.avg_loss.update(-delta if delta < 0 else 0.0)
+        rs = avg_gain / (avg_loss + self.epsilon)
+        self.value = 100 - (100 / (1 + rs))
+        return self.value
+
+
+class ATR:
+    """
+    Streaming Average True Range, using a simple moving average of the true range.
+    """
+
+    def __init__(self, window: int = 14) -> None:
+        """
+        Args:
+            window (int): The ATR window.
+        """
+        self.true_range = SMA(window)
+        self.previous_close = NAN
+        self.value = NAN
+
+
+    def update(self, high: float, low: float, close_price: float) -> float:
+        """
+        Adds a new kline and returns the updated ATR.
+
+        Args:
+            high (float): The kline high.
+            low (float): The kline low.
+            close_price (float): The kline close price.
+
+        Returns:
+            float: The current ATR.
+        """
+        # The first true range is NaN since there is no previous close
+        true_range = max(high - low, abs(high - self.previous_close), abs(low - self.previous_close)) if not math.isnan(self.previous_close) else NAN
+        self.previous_close = close_price
+        self.value = self.true_range.update(true_range)
+        return self.value
+
+
+class CMF:
+    """
+    Streaming Chaikin Money Flow.
+    """
+
+    def __init__(self, window: int = 20, epsilon: float = 1e-9) -> None:
+        """
+        Args:
+            window (int): The CMF window.
+            epsilon (float): Added to the kline range to avoid division by zero.
+        """
+        self.money_flow_volume = SMA(window)
+        self.volume = SMA(window)
+        self.epsilon = epsilon
+        self.value = NAN
+
+
+    def update(self, high: float, low: float, close_price: float, volume: float) -> float:
+        """
+        Adds a new kline and returns the updated CMF.
+
+        Args:
+            high (float): The kline high.
+            low (float): The kline low.
+            close_price (float): The kline close price.
+            volume (float): The kline volume.
+
+        Returns:
+            float: The current CMF.
+        """
+        money_flow_multiplier = ((close_price - low) - (high - close_price)) / (high - low + self.epsilon)
+        self.money_flow_volume.update(money_flow_multiplier * volume)
+        self.volume.update(volume)
+        self.value = self.money_flow_volume.sum / self.volume.sum if self.volume.sum != 0 else NAN
+        return self.value
+
+
+class TSI:
+    """
+    Streaming True Strength Index, double smoothing the price change and its absolute value with EMAs.
+    """
+
+    def __init__(self, long: int = 25, short: int = 13, epsilon: float = 1e-9) -> None:
+        """
+        Args:
+            long (int): The span of the second (long) smoothing EMA.
+            short (int): The span of the first (short) smoothing EMA.
+            epsilon (float): Added to the smoothed absolute change to avoid division by zero.
+        """
+        self.delta = Momentum(1)
+        self.smoothed_diff = (EMA(short), EMA(long))
+        self.smoothed_abs_diff = (EMA(short), EMA(long))
+        self.epsilon = epsilon
+        self.value = NAN
+
+
+    def update(self, close_price: float) -> float:
+        """
+        Adds a new close price and returns the updated TSI.
+
+        Args:
+            close_price (float): The new close price.
+
+        Returns:
+            float: The current TSI.
+        """
+        delta = self.delta.update(close_price)
+        smoothed_diff = self.smoothed_diff[1].update(self.smoothed_diff[0].update(delta))
+        smoothed_abs_diff = self.smoothed_abs_diff[1].update(self.smoothed_abs_diff[0].update(abs(delta)))
+        self.value = 100 * (smoothed_diff / (smoothed_abs_diff + self.epsilon))
+        return self.value
+
+
+class MACD:
+    """
+    Streaming Moving Average Convergence Divergence with its signal line.
+    """
+
+    def __init__(self, short: int = 12, long: int = 26, signal: int = 9) -> None:
+        """
+        Args:
+            short (int): The short EMA span.
+            long (int): The long EMA span.
+            signal (int): The signal line EMA span.
+        """
+        self.short_ema = EMA(short)
+        self.long_ema = EMA(long)
+        self.signal_ema = EMA(signal)
+        self.value = NAN
+        self.signal = NAN
+
+
+    def update(self, close_price: float) -> Tuple[float, float]:
+        """
+        Adds a new close price and returns the updated MACD and signal line.
+
+        Args:
+            close_price (float): The new close price.
+
+        Returns:
+            Tuple[float, float]: The current MACD and MACD signal line.
+        """
+        self.value = self.short_ema.update(close_price) - self.long_ema.update(close_price)
+        self.signal = self.signal_ema.update(self.value)
+        return self.value, self.signal
@@ -1,6 +1,9 @@
 from backend.src.broker.sibyl_trading_engine.strategies.strategy_base import BaseStrategy
 import pandas as pd
 import numpy as np
+from typing import Dict, Any
+from backend.src.broker.sibyl_trading_engine.indicators import kernels
+from backend.src.broker.sibyl_trading_engine.indicators.streaming_indicators import SMA
 
 
 class BollingerBandsStrategy(BaseStrategy):
@@ -24,14 +27,19 @@ class BollingerBandsStrategy(BaseStrategy):
 
         self.name = "Bollinger Bands"
         self.is_price_only = True
+        self.is_causal = True
+        self.is_incremental = True
+        self.reset_state()
 
 
     def calculate_bollinger_bands(self) -> None:
         """
         Computes the Bollinger Bands and stores them in the data DataFrame.
         """
-        self.data["SMA"] = self.data["close_price"].rolling(window=self.window).mean()
-        self.data["std_dev"] = self.data["close_price"].rolling(window=self.window).std()
+        self.data["SMA"] = self.cached_indicator(self.data, ("sma", "close_price", self.window),
+                                                 lambda: kernels.rolling_mean(self.data["close_price"], self.window))
+        self.data["std_dev"] = self.cached_indicator(self.data, ("std", "close_price", self.window),
+                                                     lambda: kernels.rolling_std(self.data["close_price"], self.window))
 
         self.data["upper_band"] = self.data["SMA"] + (self.data["std_dev"] * self.std_dev)
         self.data["lower_band"] = self.data["SMA"] - (self.data["std_dev"] * self.std_dev)
@@ -49,3 +57,25 @@ class BollingerBandsStrategy(BaseStrategy):
         self.data["signal"] = np.where(self.data["close_price"] < self.data["lower_band"], "BUY",
                                        np.where(self.data["close_price"] > self.data["upper_band"], "SELL", "HOLD"))
         return self.data[["timestamp", "close_price", "upper_band", "lower_band", "signal"]]
+
+
+    def reset_state(self) -> None:
+        """
+        Resets the streaming moving average used by `on_kline`.
+        """
+        self.sma_indicator = SMA(self.window)
+
+
+    def on_kline(self, kline: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Updates the Bollinger Bands with a new kline and generates its buy, sell, or hold signal.
+
+        Returns:
+            Dict[str, Any]: The kline Bollinger Bands and trading signal.
+        """
+        close_price = kline["close_price"]
+        sma = self.sma_indicator.update(close_price)
+        upper_band = sma + self.sma_indicator.std * self.std_dev
+        lower_band = sma - self.sma_indicator.std * self.std_dev
+        signal = "BUY" if close_price < lower_band else "SELL" if close_price > upper_band else "HOLD"
+        return {"timestamp": kline["timestamp"], "close_price": close_price, "upper_band": upper_band, "lower_band": lower_band, "signal": signal}
@@ -1,6 +1,9 @@
 from backend.src.broker.sibyl_trading_engine.strategies.strategy_base import BaseStrategy
 import pandas as pd
 import numpy as np
+from typing import Dict, Any
+from backend.src.broker.sibyl_trading_engine.indicators import kernels
+from backend.src.broker.sibyl_trading_engine.indicators.streaming_indicators import EMA, RSI, SMA
 
 
 class BollingerSurgeStrategy(BaseStrategy):
@@ -36,6 +39,9 @@ class BollingerSurgeStrategy(BaseStrategy):
 
         self.name = "Bollinger Surge Strategy"
         self.is_price_only = False
+        self.is_causal = True
+        self.is_incremental = True
+        self.reset_state()
 
 
     def calculate_indicators(self, data: pd.DataFrame) -> None:
@@ -43,27 +49,21 @@ class BollingerSurgeStrategy(BaseStrategy):
         Computes Bollinger Bands, RSI, EMA, and volume trends.
         """
         # Bollinger Bands
-        data["SMA"] = data["close_price"].rolling(window=self.bb_window).mean()
-        data["std_dev"] = data["close_price"].rolling(window=self.bb_window).std()
+        data["SMA"] = self.cached_indicator(data, ("sma", "close_price", self.bb_window), lambda: kernels.rolling_mean(data["close_price"], self.bb_window))
+        data["std_dev"] = self.cached_indicator(data, ("std", "close_price", self.bb_window), lambda: kernels.rolling_std(data["close_price"], self.bb_window))
         data["upper_band"] = data["SMA"] + (data["std_dev"] * self.bb_std_dev)
         data["lower_band"] = data["SMA"] - (data["std_dev"] * self.bb_std_dev)
 
         # RSI Calculation
-        delta = data["close_price"].diff()
-        gain = np.where(delta > 0, delta, 0)
-        loss = np.where(delta < 0, -delta, 0)
-
-        avg_gain = pd.Series(gain).rolling(window=self.rsi_window).mean()
-        avg_loss = pd.Series(loss).rolling(window=self.rsi_window).mean()
-        rs = avg_gain / (avg_loss + 1e-9)  # Avoid division by zero
-        data["RSI"] = 100 - (100 / (1 + rs))
+        data["RSI"] = self.cached_indicator(data, ("rsi", "close_price", self.rsi_window, self.rsi_window, 1e-9),
+                                            lambda: kernels.rsi(data["close_price"], self.rsi_window, epsilon=1e-9))  # epsilon avoids division by zero
 
         # EMA Calculation
-        data["EMA_Short"] = data["close_price"].ewm(span=self.ema_short, adjust=False).mean()
-        data["EMA_Long"] = data["close_price"].ewm(span=self.ema_long, adjust=False).mean()
+        data["EMA_Short"] = self.cached_indicator(data, ("ema", "close_price", self.ema_short), lambda: kernels.ema(data["close_price"], self.ema_short))
+        data["EMA_Long"] = self.cached_indicator(data, ("ema", "close_price", self.ema_long), lambda: kernels.ema(data["close_price"], self.ema_long))
 
         # Volume Spike Detection
-        data["Avg_Volume"] = data["volume"].rolling(window=self.bb_window).mean()
+        data["Avg_Volume"] = self.cached_indicator(data, ("sma", "volume", self.bb_window), lambda: kernels.rolling_mean(data["volume"], self.bb_window))
         data["Volume_Spike"] = data["volume"] > (self.volume_factor * data["Avg_Volume"])
 
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -94,3 +94,38 @@ class BollingerSurgeStrategy(BaseStrategy):
 
         return self.data[["timestamp", "close_price", "upper_band", "lower_band", "RSI",
                           "EMA_Short", "EMA_Long", "Volume_Spike", "signal"]]
+
+
+    def reset_state(self) -> None:
+        """
+        Resets the streaming indicators used by `on_kline`.
+        """
+        self.sma_indicator = SMA(self.bb_window)
+        self.rsi_indicator = RSI(self.rsi_window, epsilon=1e-9)
+        self.ema_short_indicator = EMA(self.ema_short)
+        self.ema_long_indicator = EMA(self.ema_long)
+        self.volume_indicator = SMA(self.bb_window)
+
+
+    def on_kline(self, kline: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Updates the indicators with a new kline and generates its buy, sell, or hold signal.
+        """
+        close_price = kline["close_price"]
+        sma = self.sma_indicator.update(close_price)
+        upper_band = sma + self.sma_indicator.std * self.bb_std_dev
+        lower_band = sma - self.sma_indicator.std * self.bb_std_dev
+        rsi = self.rsi_indicator.update(close_price)
+        ema_short = self.ema_short_indicator.update(close_price)
+        ema_long = self.ema_long_indicator.update(close_price)
+        volume_spike = kline["volume"] > self.volume_factor * self.volume_indicator.update(kline["volume"])
+
+        if close_price < lower_band and rsi < 30 and ema_short > ema_long and volume_spike:
+            signal = "BUY"
+        elif close_price > upper_band and rsi > 70 and ema_short < ema_long and volume_spike:
+            signal = "SELL"
+        else:
+            signal = "HOLD"
+
+        return {"timestamp": kline["timestamp"], "close_price": close_price, "upper_band": upper_band, "lower_band": lower_band,
+                "RSI": rsi, "EMA_Short": ema_short, "EMA_Long": ema_long, "Volume_Spike": volume_spike, "signal": signal}
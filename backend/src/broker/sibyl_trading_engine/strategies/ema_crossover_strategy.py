@@ -1,6 +1,9 @@
 from backend.src.broker.sibyl_trading_engine.strategies.strategy_base import BaseStrategy
 import pandas as pd
 import numpy as np
+from typing import Dict, Any
+from backend.src.broker.sibyl_trading_engine.indicators import kernels
+from backend.src.broker.sibyl_trading_engine.indicators.streaming_indicators import EMA
 
 
 class EMACrossoverStrategy(BaseStrategy):
@@ -24,9 +27,12 @@ class EMACrossoverStrategy(BaseStrategy):
 
         self.name = "EMA Crossover"
         self.is_price_only = True
+        self.is_causal = True
+        self.is_incremental = True
+        self.reset_state()
 
 
-    def calculate_ema(self, period: int) -> pd.Series:
+    def calculate_ema(self, period: int) -> np.ndarray:
         """
         Calculates the Exponential Moving Average (EMA).
 
@@ -34,9 +40,9 @@ class EMACrossoverStrategy(BaseStrategy):
             period (int): The EMA period.
 
         Returns:
-            pd.Series: The EMA values.
+            np.ndarray: The EMA values.
         """
-        return self.data["close_price"].ewm(span=period, adjust=False).mean()
+        return kernels.ema(self.data["close_price"], period)
 
 
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -47,9 +53,30 @@ class EMACrossoverStrategy(BaseStrategy):
             pd.DataFrame: Data with EMA values and trading signals.
         """
         self.data = data
-        self.data["ema_short"] = self.calculate_ema(self.short_window)
-        self.data["ema_long"] = self.calculate_ema(self.long_window)
+        self.data["ema_short"] = self.cached_indicator(self.data, ("ema", "close_price", self.short_window), lambda: self.calculate_ema(self.short_window))
+        self.data["ema_long"] = self.cached_indicator(self.data, ("ema", "close_price", self.long_window), lambda: self.calculate_ema(self.long_window))
 
         self.data["signal"] = np.where(self.data["ema_short"] > self.data["ema_long"], "BUY",
                                        np.where(self.data["ema_short"] < self.data["ema_long"], "SELL", "HOLD"))
         return self.data[["timestamp", "close_price", "ema_short", "ema_long", "signal"]]
+
+
+    def reset_state(self) -> None:
+        """
+        Resets the streaming EMAs used by `on_kline`.
+        """
+        self.ema_short_indicator = EMA(self.short_window)
+        self.ema_long_indicator = EMA(self.long_window)
+
+
+    def on_kline(self, kline: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Updates the EMAs with a new kline and generates its buy, sell, or hold signal.
+
+        Returns:
+            Dict[str, Any]: The kline EMA values and trading signal.
+        """
+        ema_short = self.ema_short_indicator.update(kline["close_price"])
+        ema_long = self.ema_long_indicator.update(kline["close_price"])
+        signal = "BUY" if ema_short > ema_long else "SELL" if ema_short < ema_long else "HOLD"
+        return {"timestamp": kline["timestamp"], "close_price": kline["close_price"], "ema_short": ema_short, "ema_long": ema_long, "signal": signal}
@@ -1,6 +1,9 @@
 from backend.src.broker.sibyl_trading_engine.strategies.strategy_base import BaseStrategy
 import pandas as pd
 import numpy as np
+from typing import Dict, Any
+from backend.src.broker.sibyl_trading_engine.indicators import kernels
+from backend.src.broker.sibyl_trading_engine.indicators.streaming_indicators import EMA, MACD, Momentum, RSI, SMA
 
 
 class ImpulseBreakoutStrategy(BaseStrategy):
@@ -48,6 +51,9 @@ class ImpulseBreakoutStrategy(BaseStrategy):
 
         self.name = "Impulse Breakout Strategy"
         self.is_price_only = False
+        self.is_causal = True
+        self.is_incremental = True
+        self.reset_state()
 
 
     def calculate_indicators(self, data: pd.DataFrame) -> None:
@@ -56,35 +62,31 @@ class ImpulseBreakoutStrategy(BaseStrategy):
         """
 
         # Bollinger Bands
-        data["SMA"] = data["close_price"].rolling(window=self.bb_window).mean()
-        data["std_dev"] = data["close_price"].rolling(window=self.bb_window).std()
+        data["SMA"] = self.cached_indicator(data, ("sma", "close_price", self.bb_window), lambda: kernels.rolling_mean(data["close_price"], self.bb_window))
+        data["std_dev"] = self.cached_indicator(data, ("std", "close_price", self.bb_window), lambda: kernels.rolling_std(data["close_price"], self.bb_window))
         data["upper_band"] = data["SMA"] + (data["std_dev"] * self.bb_std_dev)
         data["lower_band"] = data["SMA"] - (data["std_dev"] * self.bb_std_dev)
 
         # RSI Calculation
-        delta = data["close_price"].diff()
-        gain = np.where(delta > 0, delta, 0)
-        loss = np.where(delta < 0, -delta, 0)
-
-        avg_gain = pd.Series(gain).rolling(window=self.rsi_window).mean()
-        avg_loss = pd.Series(loss).rolling(window=self.rsi_window).mean()
-        rs = avg_gain / (avg_loss + 1e-9)  # Avoid division by zero
-        data["RSI"] = 100 - (100 / (1 + rs))
+        data["RSI"] = self.cached_indicator(data, ("rsi", "close_price", self.rsi_window, self.rsi_window, 1e-9),
+                                            lambda: kernels.rsi(data["close_price"], self.rsi_window, epsilon=1e-9))  # epsilon avoids division by zero
 
         # EMA Calculation
-        data["EMA_Short"] = data["close_price"].ewm(span=self.ema_short, adjust=False).mean()
-        data["EMA_Long"] = data["close_price"].ewm(span=self.ema_long, adjust=False).mean()
+        data["EMA_Short"] = self.cached_indicator(data, ("ema", "close_price", self.ema_short), lambda: kernels.ema(data["close_price"], self.ema_short))
+        data["EMA_Long"] = self.cached_indicator(data, ("ema", "close_price", self.ema_long), lambda: kernels.ema(data["close_price"], self.ema_long))
 
         # MACD Calculation
-        data["MACD"] = data["close_price"].ewm(span=self.macd_short, adjust=False).mean() - \
-                       data["close_price"].ewm(span=self.macd_long, adjust=False).mean()
-        data["MACD_Signal"] = data["MACD"].ewm(span=self.macd_signal, adjust=False).mean()
+        data["MACD"] = self.cached_indicator(data, ("macd", "close_price", self.macd_short, self.macd_long),
+                                             lambda: kernels.ema(data["close_price"], self.macd_short) - kernels.ema(data["close_price"], self.macd_long))
+        data["MACD_Signal"] = self.cached_indicator(data, ("macd_signal", "close_price", self.macd_short, self.macd_long, self.macd_signal),
+                                                    lambda: kernels.ema(data["MACD"], self.macd_signal))
 
         # ADX Calculation
-        data["ADX"] = data["close_price"].diff(self.adx_window).abs().rolling(window=self.adx_window).mean()
+        data["ADX"] = self.cached_indicator(data, ("adx", "close_price", self.adx_window),
+                                            lambda: kernels.rolling_mean(np.abs(kernels.diff(data["close_price"], self.adx_window)), self.adx_window))
 
         # Volume Spike Detection
-        data["Avg_Volume"] = data["volume"].rolling(window=self.bb_window).mean()
+        data["Avg_Volume"] = self.cached_indicator(data, ("sma", "volume", self.bb_window), lambda: kernels.rolling_mean(data["volume"], self.bb_window))
         data["Volume_Spike"] = data["volume"] > (self.volume_factor * data["Avg_Volume"])
 
 
@@ -123,4 +125,45 @@ class ImpulseBreakoutStrategy(BaseStrategy):
                           "Volume_Spike", "signal"]]
 
 
+    def reset_state(self) -> None:
+        """
+        Resets the streaming indicators used by `on_kline`.
+        """
+        self.sma_indicator = SMA(self.bb_window)
+        self.rsi_indicator = RSI(self.rsi_window, epsilon=1e-9)
+        self.ema_short_indicator = EMA(self.ema_short)
+        self.ema_long_indicator = EMA(self.ema_long)
+        self.macd_indicator = MACD(self.macd_short, self.macd_long, self.macd_signal)
+        self.adx_momentum = Momentum(self.adx_window)
+        self.adx_indicator = SMA(self.adx_window)
+        self.volume_indicator = SMA(self.bb_window)
+
+
+    def on_kline(self, kline: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Updates the indicators with a new kline and generates its buy, sell, or hold signal.
+        """
+        close_price = kline["close_price"]
+        sma = self.sma_indicator.update(close_price)
+        upper_band = sma + self.sma_indicator.std * self.bb_std_dev
+        lower_band = sma - self.sma_indicator.std * self.bb_std_dev
+        rsi = self.rsi_indicator.update(close_price)
+        ema_short = self.ema_short_indicator.update(close_price)
+        ema_long = self.ema_long_indicator.update(close_price)
+        macd, macd_signal = self.macd_indicator.update(close_price)
+        adx = self.adx_indicator.update(abs(self.adx_momentum.update(close_price)))
+        volume_spike = kline["volume"] > self.volume_factor * self.volume_indicator.update(kline["volume"])
+
+        if rsi < 35 and ema_short > ema_long and macd > macd_signal and adx > 25 and close_price < lower_band and volume_spike:
+            signal = "BUY"
+        elif rsi > 65 and ema_short < ema_long and macd < macd_signal and adx > 25 and close_price > upper_band and volume_spike:
+            signal = "SELL"
+        else:
+            signal = "HOLD"
+
+        return {"timestamp": kline["timestamp"], "close_price": close_price, "upper_band": upper_band, "lower_band": lower_band,
+                "RSI": rsi, "EMA_Short": ema_short, "EMA_Long": ema_long, "MACD": macd, "MACD_Signal": macd_signal, "ADX": adx,
+                "Volume_Spike": volume_spike, "signal": signal}
+
+
 # 96049.3711205 USDT
\ No newline at end of file
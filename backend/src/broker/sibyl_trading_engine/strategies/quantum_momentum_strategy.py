@@ -1,6 +1,9 @@
 from backend.src.broker.sibyl_trading_engine.strategies.strategy_base import BaseStrategy
 import pandas as pd
 import numpy as np
+from typing import Dict, Any
+from backend.src.broker.sibyl_trading_engine.indicators import kernels
+from backend.src.broker.sibyl_trading_engine.indicators.streaming_indicators import ATR, CMF, MACD, SMA, TSI
 
 
 class QuantumMomentumStrategy(BaseStrategy):
@@ -26,6 +29,9 @@ class QuantumMomentumStrategy(BaseStrategy):
 
         self.name = "Quantum Momentum Strategy"
         self.is_price_only = False
+        self.is_causal = True
+        self.is_incremental = True
+        self.reset_state()
 
 
     def calculate_indicators(self, data: pd.DataFrame) -> None:
@@ -34,33 +40,22 @@ class QuantumMomentumStrategy(BaseStrategy):
         """
 
         # MACD Calculation
-        short_ema = data["close_price"].ewm(span=self.macd_short, adjust=False).mean()
-        long_ema = data["close_price"].ewm(span=self.macd_long, adjust=False).mean()
-        data["MACD"] = short_ema - long_ema
-        data["MACD_Signal"] = data["MACD"].ewm(span=self.macd_signal, adjust=False).mean()
+        data["MACD"] = self.cached_indicator(data, ("macd", "close_price", self.macd_short, self.macd_long),
+                                             lambda: kernels.ema(data["close_price"], self.macd_short) - kernels.ema(data["close_price"], self.macd_long))
+        data["MACD_Signal"] = self.cached_indicator(data, ("macd_signal", "close_price", self.macd_short, self.macd_long, self.macd_signal),
+                                                    lambda: kernels.ema(data["MACD"], self.macd_signal))
 
         # ATR Calculation for Stop-Loss
-        high_low = data["high"] - data["low"]
-        high_close = np.abs(data["high"] - data["close_price"].shift())
-        low_close = np.abs(data["low"] - data["close_price"].shift())
-        tr = np.maximum.reduce([high_low, high_close, low_close])
-        data["ATR"] = pd.Series(tr).rolling(window=self.atr_window).mean()
+        data["ATR"] = self.cached_indicator(data, ("atr", self.atr_window),
+                                            lambda: kernels.atr(data["high"], data["low"], data["close_price"], self.atr_window))
 
         # CMF (Chaikin Money Flow) Calculation
-        money_flow_mult = ((data["close_price"] - data["low"]) - (data["high"] - data["close_price"])) / (
-                    data["high"] - data["low"] + 1e-9)
-        money_flow_vol = money_flow_mult * data["volume"]
-        data["CMF"] = money_flow_vol.rolling(window=self.cmf_window).sum() / data["volume"].rolling(
-            window=self.cmf_window).sum()
+        data["CMF"] = self.cached_indicator(data, ("cmf", self.cmf_window),
+                                            lambda: kernels.cmf(data["high"], data["low"], data["close_price"], data["volume"], self.cmf_window, epsilon=1e-9))
 
         # TSI (Trend Strength Index) Calculation
-        price_diff = data["close_price"].diff()
-        abs_price_diff = abs(price_diff)
-        smoothed_diff = price_diff.ewm(span=self.tsi_short, adjust=False).mean().ewm(span=self.tsi_long,
-                                                                                     adjust=False).mean()
-        smoothed_abs_diff = abs_price_diff.ewm(span=self.tsi_short, adjust=False).mean().ewm(span=self.tsi_long,
-                                                                                             adjust=False).mean()
-        data["TSI"] = 100 * (smoothed_diff / (smoothed_abs_diff + 1e-9))
+        data["TSI"] = self.cached_indicator(data, ("tsi", "close_price", self.tsi_long, self.tsi_short),
+                                            lambda: kernels.tsi(data["close_price"], self.tsi_long, self.tsi_short, epsilon=1e-9))
 
 
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -75,7 +70,7 @@ class QuantumMomentumStrategy(BaseStrategy):
                 (self.data["MACD"] > self.data["MACD_Signal"]) &  # MACD bullish crossover
                 (self.data["TSI"] > 20) &  # TSI indicates strong momentum
                 (self.data["CMF"] > 0) &  # Smart money flowing in
-                (self.data["ATR"] > self.data["ATR"].rolling(window=10).mean())  # Volatility is high
+                (self.data["ATR"] > kernels.rolling_mean(self.data["ATR"], 10))  # Volatility is high
         )
 
         # Sell Signal: MACD bearish crossover, TSI below -20, CMF negative
@@ -89,3 +84,35 @@ class QuantumMomentumStrategy(BaseStrategy):
                                        np.where(sell_condition, "SELL", "HOLD"))
 
         return self.data[["timestamp", "close_price", "MACD", "CMF", "TSI", "ATR", "signal"]]
+
+
+    def reset_state(self) -> None:
+        """
+        Resets the streaming indicators used by `on_kline`.
+        """
+        self.macd_indicator = MACD(self.macd_short, self.macd_long, self.macd_signal)
+        self.atr_indicator = ATR(self.atr_window)
+        self.atr_mean_indicator = SMA(10)
+        self.cmf_indicator = CMF(self.cmf_window, epsilon=1e-9)
+        self.tsi_indicator = TSI(self.tsi_long, self.tsi_short, epsilon=1e-9)
+
+
+    def on_kline(self, kline: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Updates the indicators with a new kline and generates its buy, sell, or hold signal.
+        """
+        close_price = kline["close_price"]
+        macd, macd_signal = self.macd_indicator.update(close_price)
+        atr = self.atr_indicator.update(kline["high"], kline["low"], close_price)
+        atr_mean = self.atr_mean_indicator.update(atr)
+        cmf = self.cmf_indicator.update(kline["high"], kline["low"], close_price, kline["volume"])
+        tsi = self.tsi_indicator.update(close_price)
+
+        if macd > macd_signal and tsi > 20 and cmf > 0 and atr > atr_mean:
+            signal = "BUY"
+        elif macd < macd_signal and tsi < -20 and cmf < 0:
+            signal = "SELL"
+        else:
+            signal = "HOLD"
+
+        return {"timestamp": kline["timestamp"], "close_price": close_price, "MACD": macd, "CMF": cmf, "TSI": tsi, "ATR": atr, "signal": signal}
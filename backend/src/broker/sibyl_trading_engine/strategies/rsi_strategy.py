@@ -1,6 +1,9 @@
 from backend.src.broker.sibyl_trading_engine.strategies.strategy_base import BaseStrategy
 import pandas as pd
 import numpy as np
+from typing import Dict, Any
+from backend.src.broker.sibyl_trading_engine.indicators import kernels
+from backend.src.broker.sibyl_trading_engine.indicators.streaming_indicators import RSI
 
 
 class RSIStrategy(BaseStrategy):
@@ -25,24 +28,19 @@ class RSIStrategy(BaseStrategy):
         self.sell_threshold = sell_threshold
         self.name = "RSI"
         self.is_price_only = True
+        self.is_causal = True
+        self.is_incremental = True
+        self.reset_state()
 
 
-    def calculate_rsi(self) -> pd.Series:
+    def calculate_rsi(self) -> np.ndarray:
         """
         Calculates the Relative Strength Index (RSI).
 
         Returns:
-            pd.Series: The RSI values.
+            np.ndarray: The RSI values.
         """
-        delta = self.data["close_price"].diff()
-        gain = np.where(delta > 0, delta, 0)
-        loss = np.where(delta < 0, -delta, 0)
-
-        avg_gain = pd.Series(gain).rolling(window=self.rsi_period, min_periods=1).mean()
-        avg_loss = pd.Series(loss).rolling(window=self.rsi_period, min_periods=1).mean()
-
-        rs = avg_gain / (avg_loss + 1e-10)  # Avoid division by zero
-        return 100 - (100 / (1 + rs))
+        return kernels.rsi(self.data["close_price"], self.rsi_period, min_periods=1, epsilon=1e-10)  # epsilon avoids division by zero
 
 
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -53,7 +51,26 @@ class RSIStrategy(BaseStrategy):
             pd.DataFrame: Data with RSI values and trading signals.
         """
         self.data = data
-        self.data["rsi"] = self.calculate_rsi()
+        self.data["rsi"] = self.cached_indicator(self.data, ("rsi", "close_price", self.rsi_period, 1, 1e-10), self.calculate_rsi)
         self.data["signal"] = np.where(self.data["rsi"] < self.buy_threshold, "BUY",
                                        np.where(self.data["rsi"] > self.sell_threshold, "SELL", "HOLD"))
         return self.data[["timestamp", "close_price", "rsi", "signal"]]
+
+
+    def reset_state(self) -> None:
+        """
+        Resets the streaming RSI used by `on_kline`.
+        """
+        self.rsi_indicator = RSI(self.rsi_period, min_periods=1, epsilon=1e-10)
+
+
+    def on_kline(self, kline: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Updates the RSI with a new kline and generates its buy, sell, or hold signal.
+
+        Returns:
+            Dict[str, Any]: The kline RSI value and trading signal.
+        """
+        rsi = self.rsi_indicator.update(kline["close_price"])
+        signal = "BUY" if rsi < self.buy_threshold else "SELL" if rsi > self.sell_threshold else "HOLD"
+        return {"timestamp": kline["timestamp"], "close_price": kline["close_price"], "rsi": rsi, "signal": signal}
@@ -1,5 +1,7 @@
 import pandas as pd
 from abc import ABC, abstractmethod
+from typing import Dict, Any, Callable, Hashable
+from backend.src.broker.sibyl_trading_engine.indicators.indicator_cache import IndicatorCache
 
 
 class BaseStrategy(ABC):
@@ -18,10 +20,19 @@ class BaseStrategy(ABC):
             data (pd.DataFrame): A DataFrame containing price data with a 'close' column.
             name (str): The name of the strategy.
             is_price_only (bool): if the strategy requires price only or OHLCV data.
+            is_causal (bool): if the signal of each row depends only on that row and the rows before it. Causal strategies
+                can be evaluated once over the whole dataset instead of once per sliding window (see Backtester).
+            is_incremental (bool): if the strategy implements `on_kline`, which updates its indicators with a single
+                new kline in constant time, instead of recomputing them over the whole dataset.
+            indicator_cache (IndicatorCache): if set, the indicators are looked up in this cache, shared with the other
+                strategy instances evaluated on the same dataset (see WalkForwardOptimizer).
         """
         self.data = None
         self.name = "base"
         self.is_price_only = False
+        self.is_causal = False
+        self.is_incremental = False
+        self.indicator_cache: IndicatorCache | None = None
 
 
     @abstractmethod
@@ -32,4 +43,55 @@ class BaseStrategy(ABC):
         Returns:
             pd.DataFrame: The modified DataFrame including trading signals.
         """
-        pass
\ No newline at end of file
+        pass
+
+
+    def cached_indicator(self, data: pd.DataFrame, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Returns an indicator from the shared indicator cache if set, otherwise computes it.
+
+        Args:
+            data (pd.DataFrame): The dataset the indicator is computed over.
+            key (Hashable): The indicator key, e.g. ("rsi", "close_price", 14).
+            compute (Callable[[], Any]): Computes the indicator values over the dataset.
+
+        Returns:
+            Any: The indicator values, one per dataset row.
+        """
+        if self.indicator_cache is None:
+            return compute()
+        return self.indicator_cache.get(data, key, compute)
+
+
+    def reset_state(self) -> None:
+        """
+        Resets the streaming indicator state used by `on_kline`.
+        """
+        pass
+
+
+    def on_kline(self, kline: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Incremental counterpart of `generate_signals`. Updates the strategy indicators with a new kline
+        and returns the signal of that kline only.
+
+        Args:
+            kline (Dict[str, Any]): The new kline, with the same columns as the `generate_signals` dataset.
+
+        Returns:
+            Dict[str, Any]: The latest row, as `generate_signals(data).iloc[-1]` would return it.
+        """
+        raise NotImplementedError(f"Strategy {self.name} does not support incremental signals.")
+
+
+    def warm_up(self, data: pd.DataFrame) -> None:
+        """
+        Resets the streaming indicator state and feeds it with the historical klines, before calling `on_kline`
+        with live data.
+
+        Args:
+            data (pd.DataFrame): The historical klines, oldest first.
+        """
+        self.reset_state()
+        for kline in data.to_dict(orient="records"):
+            self.on_kline(kline)
@@ -4,7 +4,7 @@ from backend.src.broker.sibyl_trading_engine.strategies.rsi_strategy import RSIS
 from backend.src.broker.sibyl_trading_engine.strategies.bollinger_surge_strategy import BollingerSurgeStrategy
 from backend.src.broker.sibyl_trading_engine.strategies.impulse_breakout_strategy import ImpulseBreakoutStrategy
 from backend.src.broker.sibyl_trading_engine.strategies.quantum_momentum_strategy import QuantumMomentumStrategy
-from typing import Type, Dict, Any
+from typing import Type, Dict, Any, List
 
 
 class StrategyFactory:
@@ -23,3 +23,7 @@ class StrategyFactory:
         if not strategy_class:
             raise ValueError(f"Unknown Strategy name: {strategy_name}")
         return strategy_class(**params)
+
+    @classmethod
+    def get_strategy_names(cls) -> List[str]:
+        return list(cls._strategies)
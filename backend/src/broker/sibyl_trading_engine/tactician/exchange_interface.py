@@ -1,5 +1,8 @@
 from typing import Dict, Any
 from backend.src.exchange_client.exchange_client import ExchangeAPIClient
+from backend.src.exchange_client.binance_stream import BinanceMarketStream
+from backend.src.broker.sibyl_trading_engine.tactician.kline_resampler import KlineResampler, SUB_MINUTE_INTERVALS, BASE_INTERVAL
+from database.klines.kline_db_client import KlineDBClient, INTERVAL_MS
 import pandas as pd
 import time
 import math
@@ -9,6 +12,7 @@ class TacticianExchangeInterface:
 
     def __init__(self, exchange_client: ExchangeAPIClient):
         self.exchange_client = exchange_client
+        self.kline_store = KlineDBClient()
 
 
     def get_market_symbol(self, quote_asset: str, base_asset: str) -> str:
@@ -20,45 +24,53 @@ class TacticianExchangeInterface:
 
     def get_kline_data(self, symbol: str, interval: str, limit: int) -> pd.DataFrame:
         """
-        Calls the Exchange API to get the latest price data. It fetches :limit: prices on call and initiates the dataset.
-        Typically called before starting the strategy loop.
+        Gets the latest closed klines through the local klines store, which only calls the Exchange API for the klines
+        not stored yet. It fetches :limit: prices on call and initiates the dataset.
+        Typically called before starting the strategy loop. The kline still open is left out, since the strategy
+        ticks only append closed klines to the dataset (see `get_last_kline`).
 
-        In case of 15s interval: Most exchanges do not support a 15s interval. Therefore in order to initiate the dataset, the 1s API is used and the data are sampled.
+        In case of sub-minute intervals (5s, 10s, 15s, 30s): Most exchanges do not support them. Therefore in order to initiate the dataset,
+        the 1s klines are fetched and resampled to the interval.
         Args:
             symbol (str): The crypto pair symbol.
             limit (int): The number of prices to fetch.
             interval (str): The klines interval.
         """
-        # There is no 15s interval in exchange APIs, there
-        if interval == "15s":
-
-            data = self.exchange_client.get_klines(symbol, interval="1s", limit=1000, start_time=int((time.time() - 3000)*1000))
-            data_1 = self.exchange_client.get_klines(symbol, interval="1s", limit=1000, start_time=int((time.time() - 2000)*1000))
-            data_2 = self.exchange_client.get_klines(symbol, "1s", limit=1000)
-
-            data.extend(data_1)
-            data.extend(data_2)
-            df_1sec = pd.DataFrame(data)
-            aggregated_data = []
-            for i in range(0, df_1sec.shape[0], 15):
-                interval_df = df_1sec.iloc[i:i+15]
-                aggregated_data.append({
-                    "timestamp": interval_df.iloc[0]["open_time"],
-                    "open_price": interval_df.iloc[0]["open_price"],
-                    "high": interval_df["high"].max(),
-                    "low": interval_df["low"].min(),
-                    "close_price": interval_df.iloc[-1]["close_price"],
-                    "close_time": interval_df.iloc[-1]["close_time"],
-                    "volume": interval_df["volume"].sum(),
-                    "trades_num": interval_df["trades_num"].sum()
-                })
-            df = pd.DataFrame(aggregated_data)
+        now = int(time.time() * 1000)
+        if interval in SUB_MINUTE_INTERVALS:
+            resampler = KlineResampler(interval)
+            # Two extra buckets, as the first one is dropped if the 1s klines start in its middle and the last one is open
+            data = self.kline_store.get_latest_klines(self.exchange_client, symbol, BASE_INTERVAL, (limit + 2) * resampler.bucket_size)
+            df = resampler.resample(data)
         else:
-            data = self.exchange_client.get_klines(symbol, interval=interval, limit=limit)
+            data = self.kline_store.get_latest_klines(self.exchange_client, symbol, interval, limit + 1)
             df = pd.DataFrame(data)
             df.rename(columns={"open_time": "timestamp"}, inplace=True)
 
-        return df
+        if not df.empty:
+            df = df[df["close_time"] < now]
+        return df.iloc[-limit:].reset_index(drop=True)
+
+
+    def open_market_stream(self, symbol: str, interval: str) -> BinanceMarketStream | None:
+        """
+        Opens a WebSocket market data stream of the symbol, if the exchange and the interval support it.
+        For sub-minute intervals, the 1s klines are streamed, to be resampled by the caller.
+
+        Args:
+            symbol (str): The crypto pair symbol.
+            interval (str): The klines interval.
+
+        Returns:
+            BinanceMarketStream | None: The started stream, None if streaming is not supported and REST must be polled.
+        """
+        if interval in SUB_MINUTE_INTERVALS:
+            interval = BASE_INTERVAL
+        if self.exchange_client.name in ["binance", "binance_testnet"] and interval in INTERVAL_MS:
+            stream = BinanceMarketStream(self.exchange_client, symbol, interval)
+            stream.start()
+            return stream
+        return None
 
 
     def get_symbol_trade_info(self, symbol: str) -> Dict[str, Any] | None:
@@ -93,35 +105,33 @@ class TacticianExchangeInterface:
 
     def get_last_kline(self, symbol: str, interval: str) -> pd.DataFrame | None:
         """
-        Calls the Exchange API to get the latest kline.
+        Calls the Exchange API to get the latest closed kline. The strategy ticks run just after a candle close,
+        when the latest kline of the exchange is the one that has just opened, so the one before it is returned.
+        For sub-minute intervals, it is the previous interval bucket, resampled from its 1s klines.
 
         Args:
             symbol (str): The crypto pair symbol.
             interval (str): The klines interval.
         """
-
-        if interval == "15s":
-            latest_klines = self.exchange_client.get_klines(symbol, interval="1s", limit=15)
-            aggregated_df = pd.DataFrame(latest_klines)
-            df = pd.DataFrame({
-                "timestamp": [aggregated_df.iloc[0]["open_time"]],
-                "open_price": [aggregated_df.iloc[0]["open_price"]],
-                "high": [aggregated_df["high"].max()],
-                "low": [aggregated_df["low"].min()],
-                "close_price": [aggregated_df.iloc[-1]["close_price"]],
-                "close_time": [aggregated_df.iloc[-1]["close_time"]],
-                "volume": [aggregated_df["volume"].sum()],
-                "trades_num": [aggregated_df["trades_num"].sum()]
-            })
+        now = int(time.time() * 1000)
+        if interval in SUB_MINUTE_INTERVALS:
+            resampler = KlineResampler(interval)
+            bucket_start = resampler.bucket_start(now)
+            latest_klines = self.exchange_client.get_klines(symbol, interval=BASE_INTERVAL, limit=resampler.bucket_size,
+                                                            start_time=bucket_start - resampler.step, end_time=bucket_start - 1)
+            if not latest_klines:
+                return None
+            df = resampler.resample(latest_klines, drop_partial_first=False)
         else:
-            latest_kline = self.exchange_client.get_klines(symbol, interval=interval, limit=1)
-            if latest_kline is None:
+            latest_klines = self.exchange_client.get_klines(symbol, interval=interval, limit=2)
+            if not latest_klines:
                 return None
 
-            df = pd.DataFrame(latest_kline)
+            df = pd.DataFrame(latest_klines)
             df.rename(columns={"open_time": "timestamp"}, inplace=True)
 
-        return df
+        df = df[df["close_time"] < now]
+        return df.iloc[-1:].reset_index(drop=True) if not df.empty else None
 
 
     def place_buy_order(self, quote_asset: str, base_asset: str, quote_amount: float) -> Dict[str, Any]:
@@ -0,0 +1,134 @@
+from typing import Dict, Any, List
+import numpy as np
+import pandas as pd
+
+
+KLINE_COLUMNS = ["timestamp", "open_price", "high", "low", "close_price", "close_time", "volume", "trades_num"]
+
+
+class KlineRingBuffer:
+    """
+    Fixed-capacity columnar ring buffer holding the latest klines of a strategy.
+
+    Each column is a preallocated NumPy array of twice the capacity. Every value is written both at its ring slot
+    and at the slot + capacity, so the klines in time order are always a contiguous slice of the array. This makes
+    appends O(1) and allocation-free and the time-ordered column views zero-copy, instead of rebuilding a DataFrame
+    on every tick.
+    """
+
+    def __init__(self, capacity: int, columns: List[str] = None) -> None:
+        """
+        Args:
+            capacity (int): The maximum number of klines kept. When full, each append drops the oldest kline.
+            columns (List[str], optional): The kline columns. Defaults to KLINE_COLUMNS.
+        """
+        if capacity < 1:
+            raise ValueError("KlineRingBuffer capacity must be positive.")
+        self.capacity = capacity
+        self.columns = list(columns) if columns is not None else list(KLINE_COLUMNS)
+        self._buffers = {column: np.zeros(2 * capacity, dtype=np.int64) if column == "timestamp" else np.full(2 * capacity, np.nan)
+                         for column in self.columns}
+        self._start = 0  # ring slot of the oldest kline
+        self._size = 0
+
+
+    @classmethod
+    def from_dataframe(cls, data: pd.DataFrame, capacity: int = None) -> "KlineRingBuffer":
+        """
+        Creates a buffer holding the given klines.
+
+        Args:
+            data (pd.DataFrame): The klines, oldest first.
+            capacity (int, optional): The buffer capacity. Defaults to the number of klines.
+
+        Returns:
+            KlineRingBuffer: The filled buffer. If there are more klines than the capacity, only the latest are kept.
+        """
+        capacity = capacity if capacity is not None else data.shape[0]
+        buffer = cls(capacity, [column for column in KLINE_COLUMNS if column in data.columns])
+        data = data.iloc[-capacity:]
+        size = data.shape[0]
+        for column, column_buffer in buffer._buffers.items():
+            values = data[column].to_numpy(dtype=column_buffer.dtype)
+            column_buffer[:size] = values
+            column_buffer[capacity:capacity + size] = values
+        buffer._size = size
+        return buffer
+
+
+    def __len__(self) -> int:
+        return self._size
+
+
+    def append(self, kline: Dict[str, Any]) -> None:
+        """
+        Appends a kline, dropping the oldest one if the buffer is full. Missing columns are filled with NaN.
+
+        Args:
+            kline (Dict[str, Any]): The new kline.
+        """
+        slot = (self._start + self._size) % self.capacity
+        for column, column_buffer in self._buffers.items():
+            value = kline.get(column, np.nan)
+            column_buffer[slot] = value
+            column_buffer[slot + self.capacity] = value
+
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+
+    def append_if_new(self, kline: Dict[str, Any]) -> bool:
+        """
+        Appends a kline only if it opened after the latest kline, so that a kline fetched twice (e.g. on a failed
+        fetch or a late exchange) is not duplicated in the dataset.
+
+        Args:
+            kline (Dict[str, Any]): The new kline, with its 'timestamp' (open time).
+
+        Returns:
+            bool: Whether the kline has been appended.
+        """
+        if self._size and kline["timestamp"] <= self._buffers["timestamp"][self._start + self._size - 1]:
+            return False
+        self.append(kline)
+        return True
+
+
+    def view(self, column: str) -> np.ndarray:
+        """
+        Returns the values of a column in time order, oldest first, without copying.
+        The view is only valid until the next append.
+
+        Args:
+            column (str): The column name.
+
+        Returns:
+            np.ndarray: A read-only view of the column values.
+        """
+        column_view = self._buffers[column][self._start:self._start + self._size]
+        column_view.flags.writeable = False
+        return column_view
+
+
+    def last(self) -> Dict[str, Any]:
+        """
+        Returns the latest kline.
+
+        Returns:
+            Dict[str, Any]: The latest kline, with Python scalar values.
+        """
+        slot = self._start + self._size - 1
+        return {column: column_buffer[slot].item() for column, column_buffer in self._buffers.items()}
+
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Returns the klines as a new DataFrame, oldest first. Only needed by strategies that recompute their signals
+        over the whole dataset; the DataFrame is a copy the strategy is free to modify.
+
+        Returns:
+            pd.DataFrame: The klines.
+        """
+        return pd.DataFrame({column: self.view(column) for column in self.columns})
@@ -0,0 +1,77 @@
+from typing import Dict, Any, List
+import numpy as np
+import pandas as pd
+
+
+SUB_MINUTE_INTERVALS = {"5s": 5000, "10s": 10000, "15s": 15000, "30s": 30000}  # interval -> milliseconds
+BASE_INTERVAL = "1s"
+
+
+class KlineResampler:
+    """
+    Aggregates 1s klines into sub-minute interval klines (5s, 10s, 15s, 30s), which most exchanges do not provide.
+
+    The 1s klines are grouped into buckets aligned to the Unix epoch, like the exchange klines, and each bucket is
+    reduced in one vectorized pass with `np.*.reduceat`. A leading bucket missing its first seconds is dropped, since
+    its open price would be wrong. The last bucket may still be open, the callers only keep the closed buckets.
+    """
+
+    def __init__(self, interval: str) -> None:
+        """
+        Args:
+            interval (str): The target interval, one of SUB_MINUTE_INTERVALS.
+        """
+        if interval not in SUB_MINUTE_INTERVALS:
+            raise ValueError(f"Unsupported resampling interval: {interval}")
+        self.interval = interval
+        self.step = SUB_MINUTE_INTERVALS[interval]
+        self.bucket_size = self.step // 1000  # number of 1s klines per bucket
+
+
+    def bucket_start(self, timestamp: int) -> int:
+        """
+        Args:
+            timestamp (int): A Unix timestamp in milliseconds.
+
+        Returns:
+            int: The open time of the interval bucket containing the timestamp.
+        """
+        return timestamp - timestamp % self.step
+
+
+    def resample(self, klines: pd.DataFrame | List[Dict[str, Any]], drop_partial_first: bool = True) -> pd.DataFrame:
+        """
+        Aggregates 1s klines into interval klines.
+
+        Args:
+            klines (pd.DataFrame | List[Dict[str, Any]]): The 1s klines, oldest first, in the exchange client
+                `get_klines` format (open_time, open_price, high, low, close_price, close_time, volume, trades_num).
+            drop_partial_first (bool): Whether to drop the first bucket if its first 1s kline is missing.
+
+        Returns:
+            pd.DataFrame: The interval klines, with their open time as `timestamp`.
+        """
+        klines = pd.DataFrame(klines)
+        if klines.empty:
+            return pd.DataFrame(columns=["timestamp", "open_price", "high", "low", "close_price", "close_time", "volume", "trades_num"])
+
+        open_time = klines["open_time"].to_numpy(dtype=np.int64)
+        buckets = open_time - open_time % self.step
+        # Start index of each bucket, the klines are sorted so each bucket is a contiguous run
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], open_time.size] - 1
+
+        resampled = pd.DataFrame({
+            "timestamp": buckets[starts],
+            "open_price": klines["open_price"].to_numpy(dtype=float)[starts],
+            "high": np.maximum.reduceat(klines["high"].to_numpy(dtype=float), starts),
+            "low": np.minimum.reduceat(klines["low"].to_numpy(dtype=float), starts),
+            "close_price": klines["close_price"].to_numpy(dtype=float)[ends],
+            "close_time": (buckets[starts] + self.step - 1).astype(float),
+            "volume": np.add.reduceat(klines["volume"].to_numpy(dtype=float), starts),
+            "trades_num": np.add.reduceat(klines["trades_num"].to_numpy(dtype=float), starts),
+        })
+        if drop_partial_first and open_time[0] != buckets[0]:
+            resampled = resampled.iloc[1:].reset_index(drop=True)
+        return resampled
+
@@ -0,0 +1,166 @@
+from typing import Any, Dict, Set, Tuple
+import threading
+import time
+from backend.src.broker.sibyl_trading_engine.tactician.exchange_interface import TacticianExchangeInterface
+from backend.src.broker.sibyl_trading_engine.tactician.kline_resampler import KlineResampler, SUB_MINUTE_INTERVALS
+
+
+MarketKey = Tuple[str, str, str, bool]  # (exchange, symbol, interval, is_price_only)
+
+
+class MarketFeed:
+    """
+    The latest market data of one (exchange, symbol, interval) market, shared by all its subscribed strategies.
+    """
+
+    def __init__(self, exchange_api: TacticianExchangeInterface, symbol: str, interval: str, interval_seconds: int, is_price_only: bool) -> None:
+        self.exchange_api = exchange_api
+        self.stream = exchange_api.open_market_stream(symbol, interval)  # None if the exchange must be polled
+        self.resampler = KlineResampler(interval) if interval in SUB_MINUTE_INTERVALS else None  # resamples the streamed 1s klines
+        self.symbol = symbol
+        self.interval = interval
+        self.interval_seconds = interval_seconds
+        self.is_price_only = is_price_only
+        self.subscribers: Set[str] = set()
+        self.lock = threading.Lock()
+        self.slot = None  # the interval slot of the cached kline
+        self.kline: Dict[str, Any] | None = None
+        self.requests_num = 0  # exchange requests made by the feed, shared by all its subscribers
+
+
+class MarketDataHub:
+    """
+    Fan-out of the live market data between the exchange and the running strategies.
+
+    Strategies are subscribed once per (exchange, symbol, interval) market. On every interval the first strategy tick
+    of a market fetches the latest kline from the exchange; the ticks of the other strategies of the same market, which
+    the StrategyScheduler runs at the same boundary, wait on the market lock and get the same kline instead of calling
+    the exchange again. The exchange requests therefore scale with the number of distinct markets, not strategies.
+
+    For the exchanges with WebSocket market data (Binance), the feeds read the latest kline and price from the
+    stream instead, and only fall back to REST polling while the stream is not live.
+    """
+
+    def __init__(self) -> None:
+        self.markets: Dict[MarketKey, MarketFeed] = {}
+        self.subscriptions: Dict[str, MarketKey] = {}
+        self._lock = threading.Lock()
+
+
+    def subscribe(self, strategy_id: str, exchange_api: TacticianExchangeInterface, symbol: str, interval: str, interval_seconds: int, is_price_only: bool) -> MarketKey:
+        """
+        Subscribes a strategy to a market, creating the market feed if it is the first subscriber.
+
+        Args:
+            strategy_id (str): The id of the strategy.
+            exchange_api (TacticianExchangeInterface): The exchange interface of the strategy, used to fetch the
+                market data if the feed is created.
+            symbol (str): The crypto pair symbol.
+            interval (str): The klines interval.
+            interval_seconds (int): The klines interval in seconds.
+            is_price_only (bool): Whether the strategy needs only the close price and not OHLCV data.
+
+        Returns:
+            MarketKey: The key of the market feed.
+        """
+        key = (exchange_api.exchange_client.name, symbol, interval, is_price_only)
+        with self._lock:
+            if key not in self.markets:
+                self.markets[key] = MarketFeed(exchange_api, symbol, interval, interval_seconds, is_price_only)
+            self.markets[key].subscribers.add(strategy_id)
+            self.subscriptions[strategy_id] = key
+        return key
+
+
+    def unsubscribe(self, strategy_id: str) -> None:
+        """
+        Unsubscribes a strategy, dropping its market feed if it was the last subscriber.
+
+        Args:
+            strategy_id (str): The id of the strategy.
+        """
+        with self._lock:
+            key = self.subscriptions.pop(strategy_id, None)
+            if key is None:
+                return
+            feed = self.markets[key]
+            feed.subscribers.discard(strategy_id)
+            if not feed.subscribers:
+                del self.markets[key]
+                if feed.stream is not None:
+                    feed.stream.stop()
+
+
+    def get_market_metrics(self, key: MarketKey) -> Dict[str, Any] | None:
+        """
+        Returns the usage of a market feed, showing that the exchange requests scale with the markets and not with
+        the strategies subscribed to them.
+
+        Args:
+            key (MarketKey): The market feed key, returned by `subscribe`.
+
+        Returns:
+            Dict[str, Any] | None: The number of subscribed strategies, of exchange requests made by the feed, and
+                whether the feed reads a live stream. None if the market has no subscriber anymore.
+        """
+        feed = self.markets.get(key)
+        if feed is None:
+            return None
+        return {"subscribers": len(feed.subscribers), "exchange_requests": feed.requests_num,
+                "is_streaming": feed.stream is not None and feed.stream.is_live()}
+
+
+    def get_last_kline(self, key: MarketKey) -> Dict[str, Any] | None:
+        """
+        Returns the latest closed kline of a market, from its stream if live. Otherwise the exchange is called only
+        once per interval slot, and the following calls in the same slot get the cached kline.
+        For price-only markets, it is the latest price instead.
+
+        Args:
+            key (MarketKey): The market feed key, returned by `subscribe`.
+
+        Returns:
+            Dict[str, Any] | None: A copy of the latest kline, None if fetching it failed.
+        """
+        feed = self.markets[key]
+        if feed.stream is not None and feed.stream.is_live():
+            if feed.is_price_only:
+                return {"timestamp": int(time.time() * 1000), "close_price": feed.stream.get_last_price()}
+            kline = self._get_stream_closed_kline(feed)
+            if kline is not None:
+                return kline
+            # The final event of the kline has not been received yet, fall back to REST
+
+        slot = int(time.time() // feed.interval_seconds)
+        with feed.lock:
+            if feed.slot != slot:
+                if feed.is_price_only:
+                    last_kline = feed.exchange_api.get_last_market_price(feed.symbol)
+                else:
+                    last_kline = feed.exchange_api.get_last_kline(feed.symbol, feed.interval)
+                feed.kline = last_kline.iloc[-1].to_dict() if last_kline is not None else None
+                feed.slot = slot
+                feed.requests_num += 1
+            return dict(feed.kline) if feed.kline is not None else None
+
+
+    @staticmethod
+    def _get_stream_closed_kline(feed: MarketFeed) -> Dict[str, Any] | None:
+        """
+        Returns the kline of the interval that has just closed, from the closed klines of the stream (final kline
+        events), None if the stream has not received it yet. For sub-minute intervals, the 1s klines of the previous
+        bucket are resampled, once its last second has closed.
+        """
+        now = int(time.time() * 1000)
+        if feed.resampler is not None:
+            bucket_start = feed.resampler.bucket_start(now)
+            klines = [kline for kline in feed.stream.get_closed_klines(bucket_start - feed.resampler.step) if kline["open_time"] < bucket_start]
+            if not klines or klines[-1]["open_time"] != bucket_start - 1000:
+                return None
+            return feed.resampler.resample(klines, drop_partial_first=False).iloc[-1].to_dict()
+
+        kline = feed.stream.get_last_closed_kline()
+        if kline is None or kline["open_time"] != now - now % (feed.interval_seconds * 1000) - feed.interval_seconds * 1000:
+            return None
+        kline["timestamp"] = kline.pop("open_time")
+        return kline
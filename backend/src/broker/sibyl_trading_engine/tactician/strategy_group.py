@@ -0,0 +1,169 @@
+from typing import Any, Dict, List
+import threading
+import time
+from backend.src.broker.sibyl_trading_engine.indicators.indicator_cache import IndicatorCache
+from backend.src.broker.sibyl_trading_engine.tactician.market_data_hub import MarketDataHub, MarketKey
+from backend.src.broker.sibyl_trading_engine.tactician.tactician_base import Tactician
+from backend.src.broker.sibyl_trading_engine.tactician.tick_metrics import TickMetrics
+
+
+class StrategyGroup:
+    """
+    Runtime of all the strategies running on the same market, scheduled as a single unit by the StrategyScheduler.
+
+    The group holds one kline dataset for the market, shared by its member Tacticians instead of one copy each.
+    On every tick the dataset is updated once and turned into a DataFrame once, and the member strategies generate
+    their signals over it with a shared IndicatorCache: the union of their indicators is computed once per tick
+    (e.g. the 14-period RSI of any number of RSI strategies), and each strategy only evaluates its own rules over
+    the shared indicator columns. Each member still trades and logs independently, with its own Tactician capital
+    and position.
+
+    Incremental strategies keep their O(1) `on_kline` path inside the group: their streaming state is updated with
+    every new kline, so they never need the DataFrame nor a warm-up when the group changes. Only the other strategies
+    share the DataFrame and the IndicatorCache.
+    """
+
+    def __init__(self, market_key: MarketKey, market_data_hub: MarketDataHub, interval_seconds: int) -> None:
+        """
+        Args:
+            market_key (MarketKey): The market of the group, as subscribed to the MarketDataHub.
+            market_data_hub (MarketDataHub): The hub fetching the market data.
+            interval_seconds (int): The klines interval in seconds, the group is ticked on its boundaries.
+        """
+        self.market_key = market_key
+        self.market_data_hub = market_data_hub
+        self.interval_seconds = interval_seconds
+        self.group_id = ":".join(str(part) for part in market_key)
+        self.members: Dict[str, Tactician] = {}
+        self.dataset = None
+        self.indicator_cache = IndicatorCache()
+        self.is_running = True
+        self.lock = threading.Lock()  # held during a tick, so that members are not added or removed mid-tick
+
+
+    def add(self, strategy_id: str, tactician: Tactician) -> None:
+        """
+        Adds a prepared Tactician to the group. Its dataset is replaced by the shared one, unless it holds more klines,
+        in which case it becomes the shared dataset: the members always see the largest history of the group.
+        The streaming state of the incremental strategies is brought in line with the shared dataset, so that every
+        member has seen the same klines.
+
+        Args:
+            strategy_id (str): The id of the strategy.
+            tactician (Tactician): The Tactician, after `run_strategy` has prepared it.
+        """
+        with self.lock:
+            if self.dataset is None:
+                self.dataset = tactician.dataset
+            else:
+                shared_last = self._last_timestamp(self.dataset)
+                new_last = self._last_timestamp(tactician.dataset)
+                if tactician.dataset.capacity > self.dataset.capacity and new_last >= shared_last:
+                    # The current members have not seen the klines of the new dataset fetched after their last tick
+                    new_klines = tactician.dataset.to_dataframe()
+                    new_klines = new_klines[new_klines["timestamp"] > shared_last].to_dict(orient="records")
+                    for member in self.members.values():
+                        if member.strategy.is_incremental:
+                            for kline in new_klines:
+                                member.strategy.on_kline(kline)
+                    self.dataset = tactician.dataset
+                elif new_last != shared_last and tactician.strategy.is_incremental:
+                    tactician.strategy.warm_up(self.dataset.to_dataframe())
+            self.members[strategy_id] = tactician
+            for member in self.members.values():
+                member.dataset = self.dataset
+
+
+    @staticmethod
+    def _last_timestamp(dataset) -> int:
+        return dataset.last()["timestamp"] if len(dataset) else -1
+
+
+    def remove(self, strategy_id: str) -> None:
+        """
+        Removes a strategy from the group, waiting for the running tick, if any, to finish.
+
+        Args:
+            strategy_id (str): The id of the strategy.
+        """
+        with self.lock:
+            self.members.pop(strategy_id, None)
+
+
+    def update_dataset(self) -> Dict[str, Any] | None:
+        """
+        Appends the latest closed market kline to the shared dataset, once for all the members.
+        If fetching fails, or the kline is already in the dataset, nothing is appended.
+
+        Returns:
+            Dict[str, Any] | None: The kline appended to the dataset, None if there is no new kline.
+        """
+        fetch_start = time.perf_counter()
+        last_kline = self.market_data_hub.get_last_kline(self.market_key)
+        fetch_time = time.perf_counter() - fetch_start
+        with self.lock:
+            for member in self.members.values():
+                member.metrics.record("fetch", fetch_time)
+            if last_kline is None or not self.dataset.append_if_new(last_kline):
+                return None
+        return last_kline
+
+
+    def get_tick_metrics(self) -> List[TickMetrics]:
+        """
+        Returns:
+            List[TickMetrics]: The tick metrics of the members, which all wait for the whole group tick.
+        """
+        # Without the lock, which is held by a running tick: the scheduler reports overruns during the tick
+        return [member.metrics for member in list(self.members.values())]
+
+
+    def strategy_step(self, last_kline: Dict[str, Any] | None) -> bool:
+        """
+        Runs one iteration of every member strategy over the shared dataset. Called by the StrategyScheduler on every
+        interval boundary, after `update_dataset`. The members that have been stopped or have reached their trades
+        limit are dropped from the group.
+
+        Args:
+            last_kline (Dict[str, Any] | None): The kline just appended to the dataset by `update_dataset`. If None,
+                there is no new kline and the iteration is skipped.
+
+        Returns:
+            bool: Whether the group still has active members.
+        """
+        with self.lock:
+            for strategy_id, member in list(self.members.items()):
+                if not member.is_active():
+                    member.is_running = False
+                    del self.members[strategy_id]
+            if not self.members:
+                return False
+            if last_kline is None:
+                return True
+
+            full_members = {}
+            for strategy_id, member in self.members.items():
+                if not member.strategy.is_incremental:
+                    full_members[strategy_id] = member
+                    continue
+                try:
+                    member.strategy_step(last_kline)
+                except Exception as e:
+                    print(f"StrategyGroup :: strategy_step :: {strategy_id} ::", e)
+            if not full_members:
+                return True
+
+            dataset = self.dataset.to_dataframe()
+            self.indicator_cache.clear()  # the indicators of the previous tick are stale
+            for strategy_id, member in full_members.items():
+                try:
+                    strategy = member.strategy
+                    strategy.indicator_cache = self.indicator_cache
+                    signal_start = time.perf_counter()
+                    # A shallow copy, the strategy columns are added to its own frame but the klines are not copied
+                    latest_row = strategy.generate_signals(dataset.copy(deep=False)).iloc[-1]
+                    member.metrics.record("signal", time.perf_counter() - signal_start)
+                    member.process_signal(latest_row)
+                except Exception as e:
+                    print(f"StrategyGroup :: strategy_step :: {strategy_id} ::", e)
+            return True
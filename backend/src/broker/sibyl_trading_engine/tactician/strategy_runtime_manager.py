@@ -1,27 +1,74 @@
-from typing import Dict, List
+from typing import Any, Dict, List
 from backend.src.broker.sibyl_trading_engine.tactician.tactician_base import Tactician
+from backend.src.broker.sibyl_trading_engine.tactician.strategy_scheduler import StrategyScheduler, DEFAULT_SETTLE_DELAY
+from backend.src.broker.sibyl_trading_engine.tactician.market_data_hub import MarketDataHub, MarketKey
+from backend.src.broker.sibyl_trading_engine.tactician.strategy_group import StrategyGroup
+from database.strategy.strategy_log_writer import StrategyLogWriter
 
 
 class StrategyRuntimeHandler:
     """Handles the runtime execution of trading strategies.
 
     This class keeps track of running strategies and provides methods to add, stop, and retrieve them.
+    The strategy loops are all driven by a single StrategyScheduler instead of one thread per strategy,
+    and the strategies on the same market share their market data fetches through the MarketDataHub.
+    The strategies on the same market are run together as a StrategyGroup, which holds one dataset per market
+    and computes their indicators once per tick.
     """
 
-    def __init__(self) -> None:
-        """Initializes the handler with an empty dictionary of running strategies."""
+    def __init__(self, max_workers: int = 16, max_concurrent_signals: int = None, settle_delay: float = DEFAULT_SETTLE_DELAY) -> None:
+        """Initializes the handler with an empty dictionary of running strategies.
+
+        Args:
+            max_workers (int): The size of the scheduler worker pool running the strategy iterations.
+            max_concurrent_signals (int, optional): The maximum number of signal computations running at once.
+            settle_delay (float): The seconds waited after each candle close before the strategy ticks.
+        """
         self.running_strategies: Dict[str, Tactician] = {}
+        self.scheduler = StrategyScheduler(max_workers, max_concurrent_signals, settle_delay)
+        self.market_data_hub = MarketDataHub()
+        self.strategy_groups: Dict[MarketKey, StrategyGroup] = {}
 
 
     def add_strategy(self, strategy_id: str, strategy: Tactician) -> None:
-        """Adds a new strategy to the running strategies list.
+        """Adds a new strategy to the running strategies list, subscribes it to its market data and adds it to the
+        strategy group of its market, scheduling the group loop if it is the first strategy on the market.
 
         Args:
             strategy_id (str): Unique identifier of the strategy.
             strategy (Tactician): Instance of the strategy to be executed.
         """
+        market_key = self.market_data_hub.subscribe(strategy_id, strategy.exchange_api, strategy.symbol, strategy.time_interval,
+                                                    strategy.interval_seconds, strategy.is_price_only)
+        strategy.market_key = market_key
+        strategy.market_data_hub = self.market_data_hub
         self.running_strategies[strategy_id] = strategy
 
+        group = self.strategy_groups.get(market_key)
+        if group is None or not group.members:  # a group without members has been unscheduled
+            group = StrategyGroup(market_key, self.market_data_hub, strategy.interval_seconds)
+            self.strategy_groups[market_key] = group
+            group.add(strategy_id, strategy)
+            self.scheduler.add(group.group_id, group)
+        else:
+            group.add(strategy_id, strategy)
+
+
+    def _remove_from_group(self, strategy_id: str) -> None:
+        """Removes a strategy from its strategy group, unscheduling the group if it was the last strategy on the market.
+
+        Args:
+            strategy_id (str): Unique identifier of the strategy.
+        """
+        market_key = self.running_strategies[strategy_id].market_key
+        group = self.strategy_groups.get(market_key)
+        if group is None or not group.members:  # a group without members has been unscheduled
+            return
+        group.remove(strategy_id)
+        if not group.members:
+            self.scheduler.remove(group.group_id)
+            del self.strategy_groups[market_key]
+
 
     def remove_strategy(self, strategy_id: str) -> None:
         """Removes a strategy from the running strategies list.
@@ -29,11 +76,13 @@ class StrategyRuntimeHandler:
         Args:
             strategy_id (str): Unique identifier of the strategy.
         """
+        self._remove_from_group(strategy_id)
+        self.market_data_hub.unsubscribe(strategy_id)
         del self.running_strategies[strategy_id]
 
 
     def stop_strategy(self, strategy_id: str) -> int | None:
-        """Stops a running strategy by invoking its stop method.
+        """Stops a running strategy by invoking its stop method, and waits for its logs to be written.
 
         Args:
             strategy_id (str): Unique identifier of the strategy to stop.
@@ -46,6 +95,10 @@ class StrategyRuntimeHandler:
             raise KeyError(f"Strategy with ID '{strategy_id}' is not running.")
 
         self.running_strategies[strategy_id].stop_strategy()
+        self._remove_from_group(strategy_id)
+        self.market_data_hub.unsubscribe(strategy_id)
+        if not self.running_strategies[strategy_id].log_writer.flush():
+            print(f"StrategyRuntimeHandler :: stop_strategy :: {strategy_id} :: Some logs could not be written.")
         del self.running_strategies[strategy_id]  # Remove from active strategies
         return 1
 
@@ -57,3 +110,37 @@ class StrategyRuntimeHandler:
             List[str]: A list of currently running strategy IDs.
         """
         return list(self.running_strategies.keys())
+
+
+    def _get_strategy_metrics(self, tactician: Tactician) -> Dict[str, Any]:
+        metrics = tactician.metrics.to_dict()
+        metrics["market"] = self.market_data_hub.get_market_metrics(tactician.market_key)
+        return metrics
+
+
+    def get_metrics(self, strategy_id: str = "all") -> Dict[str, Dict[str, Any]]:
+        """Returns the tick latency metrics of the running strategies, with the usage of their market feed.
+
+        Args:
+            strategy_id (str): Unique identifier of the strategy, or "all" for every running strategy.
+
+        Raises:
+            KeyError: If the strategy ID does not exist in the running strategies.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The metrics of each strategy (see TickMetrics.to_dict), with the usage of its
+                market feed under "market" (see MarketDataHub.get_market_metrics), by strategy ID.
+        """
+        if strategy_id == "all":
+            return {strategy_id: self._get_strategy_metrics(tactician) for strategy_id, tactician in list(self.running_strategies.items())}
+        if strategy_id not in self.running_strategies.keys():
+            raise KeyError(f"Strategy with ID '{strategy_id}' is not running.")
+        return {strategy_id: self._get_strategy_metrics(self.running_strategies[strategy_id])}
+
+
+    def shutdown(self) -> None:
+        """Stops all the running strategies and the scheduler, and writes the remaining strategy logs."""
+        for strategy_id in list(self.running_strategies.keys()):
+            self.stop_strategy(strategy_id)
+        self.scheduler.shutdown()
+        StrategyLogWriter.close_all()
@@ -0,0 +1,188 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, List, Tuple
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from backend.src.broker.sibyl_trading_engine.tactician.tactician_base import Tactician
+from backend.src.broker.sibyl_trading_engine.tactician.strategy_group import StrategyGroup
+
+
+DEFAULT_SETTLE_DELAY = 0.2  # seconds waited after a candle close, for the exchange to publish the closed candle
+MAX_SETTLE_FRACTION = 0.25  # the settle delay is capped to this fraction of the interval
+
+
+class StrategyScheduler:
+    """
+    Single scheduler that drives the loops of all the running strategies.
+
+    Instead of one sleeping thread per Tactician, one timer thread keeps a heap of the next wake-up time of every
+    strategy and dispatches the due ticks to a shared worker pool. The market data fetches of the strategies due at the
+    same boundary run concurrently in the pool, while a semaphore bounds how many signal computations run at once,
+    so that CPU-bound strategies do not all contend for the GIL at the same time.
+
+    The scheduled units are either single Tacticians or StrategyGroups, which run all the strategies of a market
+    in one tick.
+
+    The ticks are scheduled against the wall-clock candle boundaries, a settle delay after each candle close, and
+    never relative to the end of the previous tick, so that the fetch and compute times do not add up into drift.
+    A boundary is skipped when the previous tick is still running, or when the scheduler is late by more than an
+    interval; the skipped ticks are reported and counted as overruns in the strategy tick metrics.
+    """
+
+    def __init__(self, max_workers: int = 16, max_concurrent_signals: int = None, settle_delay: float = DEFAULT_SETTLE_DELAY) -> None:
+        """
+        Args:
+            max_workers (int): The size of the worker pool running the strategy ticks. Defaults to 16.
+            max_concurrent_signals (int, optional): The maximum number of signal computations running at once.
+                Defaults to the number of CPUs.
+            settle_delay (float): The seconds waited after each candle close before the tick, so that the exchange
+                has rolled over to the next candle despite clock skew and publication lag. Capped to
+                MAX_SETTLE_FRACTION of the interval. Defaults to DEFAULT_SETTLE_DELAY.
+        """
+        self.max_workers = max_workers
+        self.settle_delay = settle_delay
+        self.signal_semaphore = threading.Semaphore(max_concurrent_signals or os.cpu_count() or 1)
+        self.tacticians: Dict[str, Tactician | StrategyGroup] = {}
+        self.in_flight: Dict[str, Future] = {}
+        self._queue: List[Tuple[float, int, str]] = []  # (wake-up time, tie breaker, strategy id)
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._executor: ThreadPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+        self._is_running = False
+
+
+    @staticmethod
+    def next_boundary(interval: int, now: float, settle_delay: float = 0.0) -> float:
+        """
+        Returns the next interval boundary after :now:, aligned to the Unix epoch like the exchange klines and
+        shifted by the settle delay.
+
+        Args:
+            interval (int): The strategy interval in seconds.
+            now (float): The current Unix time in seconds.
+            settle_delay (float): The seconds after each boundary. Defaults to 0.
+
+        Returns:
+            float: The Unix time of the next boundary, plus the settle delay.
+        """
+        return (math.floor((now - settle_delay) / interval) + 1) * interval + settle_delay
+
+
+    def _get_settle_delay(self, interval: int) -> float:
+        return min(self.settle_delay, interval * MAX_SETTLE_FRACTION)
+
+
+    def _start(self) -> None:
+        self._is_running = True
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="strategy_worker")
+        self._thread = threading.Thread(target=self._run, daemon=True, name="strategy_scheduler")
+        self._thread.start()
+
+
+    def add(self, strategy_id: str, tactician: Tactician | StrategyGroup) -> None:
+        """
+        Schedules a prepared Tactician. Its first tick runs after the close of the current candle, which its dataset
+        was initiated with, and the following ones after each candle close.
+
+        Args:
+            strategy_id (str): The id of the strategy, or of the group.
+            tactician (Tactician | StrategyGroup): The Tactician, after `run_strategy` has prepared it, or a StrategyGroup.
+        """
+        with self._condition:
+            if not self._is_running:
+                self._start()
+            self.tacticians[strategy_id] = tactician
+            wake_up_time = self.next_boundary(tactician.interval_seconds, time.time(), self._get_settle_delay(tactician.interval_seconds))
+            heapq.heappush(self._queue, (wake_up_time, next(self._counter), strategy_id))
+            self._condition.notify()
+
+
+    def remove(self, strategy_id: str) -> None:
+        """
+        Unschedules a strategy and waits for its running tick, if any, to finish.
+
+        Args:
+            strategy_id (str): The id of the strategy.
+        """
+        with self._condition:
+            self.tacticians.pop(strategy_id, None)
+            future = self.in_flight.get(strategy_id)
+        # The stale heap entry is dropped by the scheduler thread when it comes up
+        if future is not None:
+            future.result()
+
+
+    def _run(self) -> None:
+        """
+        The scheduler thread. Sleeps until the earliest wake-up time and dispatches the due strategies.
+        """
+        while True:
+            with self._condition:
+                while self._is_running and (not self._queue or self._queue[0][0] > time.time()):
+                    timeout = self._queue[0][0] - time.time() if self._queue else None
+                    self._condition.wait(timeout)
+                if not self._is_running:
+                    return
+                wake_up_time, _, strategy_id = heapq.heappop(self._queue)
+                tactician = self.tacticians.get(strategy_id)
+                if tactician is None:  # removed
+                    continue
+                interval = tactician.interval_seconds
+                now = time.time()
+                # The boundaries passed since the wake-up time are skipped, the tick runs for the latest candle only
+                skipped = int((now - wake_up_time) // interval)
+                if strategy_id in self.in_flight:  # the previous tick overran, skip this boundary too
+                    skipped += 1
+                    print(f"StrategyScheduler :: Strategy {strategy_id} tick overran its interval, skipping {skipped} tick(s).")
+                elif skipped:
+                    print(f"StrategyScheduler :: Strategy {strategy_id} tick is {now - wake_up_time:.3f}s late, skipping {skipped} tick(s).")
+                if skipped:
+                    for metrics in tactician.get_tick_metrics():
+                        metrics.record_overrun(skipped)
+                if strategy_id not in self.in_flight:
+                    self.in_flight[strategy_id] = self._executor.submit(self._tick, strategy_id, tactician, wake_up_time + (skipped * interval))
+                heapq.heappush(self._queue, (self.next_boundary(interval, now, self._get_settle_delay(interval)), next(self._counter), strategy_id))
+
+
+    def _tick(self, strategy_id: str, tactician: Tactician | StrategyGroup, wake_up_time: float) -> None:
+        """
+        Runs one strategy iteration in a worker: the market data fetch runs unbounded, the signal computation
+        under the signal semaphore. Unschedules the strategy once it has finished.
+        The tick duration and its delay from the scheduled wake-up time are recorded in the strategy tick metrics.
+        """
+        start_delay = max(0.0, time.time() - wake_up_time)
+        tick_start = time.perf_counter()
+        is_active = True
+        try:
+            last_kline = tactician.update_dataset()
+            with self.signal_semaphore:
+                is_active = tactician.strategy_step(last_kline)
+        except Exception as e:
+            print(f"StrategyScheduler :: _tick :: {strategy_id} ::", e)
+        finally:
+            tick_time = time.perf_counter() - tick_start
+            for metrics in tactician.get_tick_metrics():
+                metrics.record("tick", tick_time)
+                metrics.record("start_delay", start_delay)
+            with self._condition:
+                self.in_flight.pop(strategy_id, None)
+                if not is_active:
+                    self.tacticians.pop(strategy_id, None)
+                    tactician.is_running = False
+
+
+    def shutdown(self) -> None:
+        """
+        Stops the scheduler thread and waits for the running ticks to finish.
+        """
+        with self._condition:
+            if not self._is_running:
+                return
+            self._is_running = False
+            self._condition.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
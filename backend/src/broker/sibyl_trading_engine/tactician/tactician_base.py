@@ -1,12 +1,14 @@
 from backend.src.broker.sibyl_trading_engine.strategies.strategy_base import BaseStrategy
 from typing import Any, Dict, List
 import time
-import threading
 import json
 import os
 import pandas as pd
 from database.strategy.strategy_db_client import StrategyDBClient
+from database.strategy.strategy_log_writer import StrategyLogWriter
 from backend.src.broker.sibyl_trading_engine.tactician.exchange_interface import TacticianExchangeInterface
+from backend.src.broker.sibyl_trading_engine.tactician.kline_buffer import KlineRingBuffer
+from backend.src.broker.sibyl_trading_engine.tactician.tick_metrics import TickMetrics
 from numpy import isnan
 from decimal import Decimal, ROUND_DOWN
 
@@ -45,25 +47,32 @@ class Tactician:
         self.is_running = False  # Track if the strategy is running
         self.last_order_type = "None"
         self.time_interval = None
+        self.interval_seconds = None
         # SYMBOL TRADING INFO
         symbol_info = self.exchange_api.get_symbol_trade_info(self.symbol)
         self.quote_min_notional = symbol_info["min_trade_value"]
         self.quote_precision = symbol_info["quote_precision"]
         self.base_precision = symbol_info["base_precision"]
 
-        # Threading
-        self.thread = None
+        # Runtime, the strategy loop is driven by the StrategyScheduler
+        self.strategy_id = None
+        self.strategy: BaseStrategy | None = None
+        self.trades_limit = None
+        self.metrics = TickMetrics()  # per-stage latencies of the ticks
         self.thread_id = None
+        self.market_data_hub = None  # Set by the StrategyRuntimeHandler, shares the market data fetches
+        self.market_key = None
         self.history_file = "./trade_history.json"
         self.pid_file = "./tactician_pid.txt"
 
         # Data
-        self.dataset = None
+        self.dataset: KlineRingBuffer | None = None
         self.is_price_only = False
 
         # Setup logging
         # logging.basicConfig(filename="trade_log.log", level=logging.INFO)
         self.db_client = StrategyDBClient()
+        self.log_writer = StrategyLogWriter.get_writer(self.db_client)  # writes the logs in the background
 
 
     def _save_trade_history(self) -> None:
@@ -133,7 +142,9 @@ class Tactician:
         if action == "BUY":
             if self.last_order_type != "BUY" and self.capital > self.quote_min_notional:
                 self.last_order_type = "BUY"
+                request_start = time.perf_counter()
                 order = self.exchange_api.place_buy_order(quote_asset=self.quote_asset, base_asset=self.base_asset, quote_amount=self.fix_asset_precision(self.capital, None))
+                self.metrics.record("exchange_rtt", time.perf_counter() - request_start)
                 if order:
                     self.position += order["position"]
                     self.capital = self.capital - order["executed_quote_amount"]
@@ -150,7 +161,9 @@ class Tactician:
         elif action == "SELL":
             if self.last_order_type != "SELL" and self.position > 0:
                 self.last_order_type = "SELL"
+                request_start = time.perf_counter()
                 order = self.exchange_api.place_sell_order(quote_asset=self.quote_asset, base_asset=self.base_asset, quantity=self.fix_asset_precision(None, self.position))
+                self.metrics.record("exchange_rtt", time.perf_counter() - request_start)
                 if order:
                     self.capital += float(order["executed_quote_amount"])
                     self.position = self.fix_asset_precision(None, self.position - float(order["position"]))
@@ -194,117 +207,171 @@ class Tactician:
         Args:
             limit (int): The number of prices to fetch.
         """
-        self.dataset = self.exchange_api.get_kline_data(symbol=self.symbol, interval=self.time_interval, limit=limit)
+        klines = self.exchange_api.get_kline_data(symbol=self.symbol, interval=self.time_interval, limit=limit)
+        self.dataset = KlineRingBuffer.from_dataframe(klines)
 
 
-    def update_dataset(self) -> None:
+    def update_dataset(self) -> Dict[str, Any] | None:
         """
         Updates the dataset with the latest market data.
 
         - If `is_price_only` is True, fetches only the latest closing price.
-        - Otherwise, retrieves the latest OHLCV (Open, High, Low, Close, Volume) data.
-        - If fetching fails, it fills in with the last known dataset entry.
+        - Otherwise, retrieves the latest closed OHLCV (Open, High, Low, Close, Volume) kline.
+        - If fetching fails, or the kline is already in the dataset, nothing is appended.
         - The dataset is maintained at a fixed size by removing the oldest entry.
 
         This ensures the strategy always has the most recent data while keeping
-        the dataset length consistent.
+        the dataset length consistent. The dataset is a ring buffer, so the update
+        is O(1) and does not copy the dataset.
+
+        If the Tactician is subscribed to the market data hub, the kline is fetched once per
+        interval for all the strategies on the same market.
 
         Returns:
-            None
+            Dict[str, Any] | None: The kline appended to the dataset, None if there is no new kline.
         """
-        if self.is_price_only:  # Only close_price is needed
-            last_kline = self.exchange_api.get_last_market_price(self.symbol)
-        else:  # OHLCV data is needed
-            last_kline = self.exchange_api.get_last_kline(self.symbol, self.time_interval)
-        # if it fails it fills with the last value
-        if last_kline is None:
-            last_kline = self.dataset.iloc[-1]
+        fetch_start = time.perf_counter()
+        if self.market_data_hub is not None:
+            last_kline = self.market_data_hub.get_last_kline(self.market_key)
+        else:
+            if self.is_price_only:  # Only close_price is needed
+                last_kline = self.exchange_api.get_last_market_price(self.symbol)
+            else:  # OHLCV data is needed
+                last_kline = self.exchange_api.get_last_kline(self.symbol, self.time_interval)
+            last_kline = last_kline.iloc[-1].to_dict() if last_kline is not None else None
+        self.metrics.record("fetch", time.perf_counter() - fetch_start)
+        # dedupe by open time, the strategy must not see the same kline twice
+        if last_kline is None or not self.dataset.append_if_new(last_kline):
+            return None
+        return last_kline
 
-        self.dataset = self.dataset.iloc[1:].reset_index(drop=True)
-        self.dataset = pd.concat([self.dataset, last_kline], ignore_index=True)
+
+    def get_tick_metrics(self) -> List[TickMetrics]:
+        """
+        Returns:
+            List[TickMetrics]: The tick metrics recorded by the StrategyScheduler for this unit, the Tactician's own.
+        """
+        return [self.metrics]
 
 
-    def strategy_loop(self, strategy_id: str, strategy: BaseStrategy, interval: int, min_capital: float, trades_limit: int) -> None:
+    def is_active(self) -> bool:
         """
-        Runs the trading strategy in a loop, checking for signals and executing trades.
+        Returns:
+            bool: Whether the strategy is running and has not reached its trades limit yet.
+        """
+        if not self.is_running:
+            return False
+        # exit after N trades, must be even to end with a sell
+        if len(self.get_trade_history()) >= self.trades_limit*2:
+            print(f"Maximum number of trades reached {self.trades_limit}.")
+            return False
+        return True
+
+
+    def strategy_step(self, last_kline: Dict[str, Any] | None) -> bool:
+        """
+        Runs one iteration of the trading strategy: computes the signal for the latest kline, executes the trade and
+        logs it. Called by the StrategyScheduler on every interval boundary, after `update_dataset`.
 
         Args:
-            strategy (TradingStrategy): The strategy that generates trade signals.
-            strategy_id (str): The id of the strategy.
-            interval (int): Time interval (in seconds) between checking for new signals. Default is 5.
-            min_capital (float): The minimum capital threshold for running the strategy. If capital goes below this, the strategy will stop. Default is 0.
-            trades_limit (int): Number of trades (one trade is consisted of one BUY then one SELL order) to execute before stopping. Must be even to end with a SELL.
+            last_kline (Dict[str, Any] | None): The kline just appended to the dataset by `update_dataset`. If None,
+                there is no new kline and the iteration is skipped.
+
+        Returns:
+            bool: Whether the strategy is still active. False once it has been stopped or has reached its trades limit.
         """
+        if not self.is_active():
+            return False
+        if last_kline is None:
+            return True
 
-        self.is_running = True
-        self.thread_id = threading.get_ident()
-        while self.is_running:
-            # exit after N trades, must be even to end with a sell
-            if len(self.get_trade_history()) >= trades_limit*2:
-                print(f"Maximum number of trades reached {trades_limit}.")
-                break
-            # Fetch latest klines data
-            self.update_dataset()
-            # Call strategy to get the latest signal (e.g. BUY, SELL, HOLD)
-            slippage = 0.0
-            signals = strategy.generate_signals(self.dataset.copy())
-            latest_signal = signals.iloc[-1]["signal"]
-            latest_price = signals.iloc[-1]["close_price"]
-            timestamp = signals.iloc[-1]["timestamp"]
-            print(f"Tactician :: Strategy signals | t: {pd.to_datetime(timestamp, unit="ms").strftime('%H:%M:%S')}, p: {latest_price}, action: {latest_signal}")
-
-            if latest_signal in ["BUY", "SELL"]:
-                res = self.execute_trade(latest_signal)
-                if res is None: # order failed
-                    latest_signal = f"INVALID_{latest_signal}"
-                else:
-                    slippage = res["price"] - latest_price
-                    print(f"Tactician :: strategy_loop :: Slippage {slippage}")
-                    latest_price = res["price"]  # Replace with the actual sold value
+        strategy = self.strategy
+        signal_start = time.perf_counter()
+        # Call strategy to get the latest signal (e.g. BUY, SELL, HOLD)
+        if strategy.is_incremental:  # O(1) update of the strategy indicators with the new kline only
+            latest_row = strategy.on_kline(last_kline)
+        else:
+            latest_row = strategy.generate_signals(self.dataset.to_dataframe()).iloc[-1]
+        self.metrics.record("signal", time.perf_counter() - signal_start)
+        self.process_signal(latest_row)
+        return True
 
-            # Add log to the DB
-            if isnan(latest_price):  # NaN will make json logs fail
-                latest_signal = signals.iloc[-2]["close_price"]
-            self.db_client.add_log(strategy_id, int(timestamp), latest_price, slippage, latest_signal)
-            # Wait before checking again
-            time.sleep(interval)
+
+    def process_signal(self, latest_row: Dict[str, Any] | pd.Series) -> None:
+        """
+        Executes the trade of the latest strategy signal, if any, and logs it.
+
+        Args:
+            latest_row (Dict[str, Any] | pd.Series): The latest row of the strategy signals, with its 'timestamp',
+                'close_price' and 'signal'.
+        """
+        slippage = 0.0
+        latest_signal = latest_row["signal"]
+        latest_price = latest_row["close_price"]
+        timestamp = latest_row["timestamp"]
+        print(f"Tactician :: Strategy signals | t: {pd.to_datetime(timestamp, unit="ms").strftime('%H:%M:%S')}, p: {latest_price}, action: {latest_signal}")
+
+        if latest_signal in ["BUY", "SELL"]:
+            order_start = time.perf_counter()
+            res = self.execute_trade(latest_signal)
+            self.metrics.record("order", time.perf_counter() - order_start)
+            if res is None: # order failed
+                latest_signal = f"INVALID_{latest_signal}"
+            else:
+                slippage = res["price"] - latest_price
+                print(f"Tactician :: strategy_step :: Slippage {slippage}")
+                self.metrics.record_slippage(slippage, latest_price)
+                latest_price = res["price"]  # Replace with the actual sold value
+
+        # Queue the log for the DB, written in the background
+        if isnan(latest_price):  # NaN will make json logs fail
+            latest_price = float(self.dataset.view("close_price")[-2])
+        log_start = time.perf_counter()
+        self.log_writer.add_log(self.strategy_id, int(timestamp), latest_price, slippage, latest_signal)
+        self.metrics.record("log_write", time.perf_counter() - log_start)
 
 
     def run_strategy(self, strategy_id: str, strategy: BaseStrategy, interval: str, min_capital: float, trades_limit: int, dataset_size: int) -> None:
         """
-        Initiates the trading loop.
+        Prepares the trading loop: registers the strategy, initiates the dataset and warms up the strategy.
+        The loop itself is driven by the StrategyScheduler, which calls `update_dataset` and `strategy_step`
+        on every interval boundary once the Tactician is added to the StrategyRuntimeHandler.
 
         Args:
             strategy_id (str): The id of the strategy to run.
             strategy (TradingStrategy): The strategy that generates trade signals.
-            interval (int): Time interval (in seconds) between checking for new signals. Default is 5.
+            interval (str): The klines interval, which is also the time interval between checking for new signals.
             min_capital (float): The minimum capital threshold for running the strategy. If capital goes below this, the strategy will stop. Default is 0.
             trades_limit (int): Number of trades to execute before stopping. Must be even to end with a SELL.
             dataset_size (int): The size of the dataset to be fed in the strategy algorithm.
         """
-        time_interval_dict = {'1s': 1, '15s': 15, '1m': 60, '5m': 300, '15m': 900,
+        time_interval_dict = {'1s': 1, '5s': 5, '10s': 10, '15s': 15, '30s': 30, '1m': 60, '5m': 300, '15m': 900,
                          '30m': 1800, '1h': 3600, '4h': 14400, '12h': 43200, '1d': 86400}
 
         self.time_interval = interval
+        self.interval_seconds = time_interval_dict[interval]
+        self.strategy_id = strategy_id
+        self.strategy = strategy
+        self.trades_limit = trades_limit
+        self.metrics = TickMetrics(self.interval_seconds)
         self.is_price_only = strategy.is_price_only  # whether the strategy needs only the close price and not OHLCV data
         self.db_client.add_strategy(strategy_id, self.quote_asset, self.base_asset, self.capital, interval, trades_limit, strategy.name, int(time.time()*1000))
 
         print(f"Tactician :: Initiating Strategy loop with id {strategy_id}.")
         self.initiate_dataset(dataset_size)
-        self.thread = threading.Thread(target=self.strategy_loop, daemon=True, args=(strategy_id, strategy, time_interval_dict[interval], min_capital, trades_limit))
-        self.thread.start()
-        print("Tactician :: Strategy loop started.")
+        if strategy.is_incremental:
+            strategy.warm_up(self.dataset.to_dataframe())
+        self.is_running = True
+        print("Tactician :: Strategy ready to be scheduled.")
 
 
     def stop_strategy(self) -> None:
         """
         Stops the strategy loop. This will stop further execution of trades.
-
+        The StrategyRuntimeHandler also unschedules the strategy and waits for its running iteration.
         """
         self.is_running = False
         self._clear_pid()
-        if self.thread and self.thread.is_alive():
-            self.thread.join()
         print("Tactician :: Strategy has been stopped.")
 
 
@@ -0,0 +1,138 @@
+from typing import Any, Dict, List
+import bisect
+import math
+import threading
+
+
+TICK_STAGES = ["tick", "start_delay", "fetch", "signal", "order", "exchange_rtt", "log_write"]
+LATENCY_BUCKET_EDGES = [10 ** (exponent / 10) for exponent in range(-60, 31)]  # 1us to 1000s, 10 buckets per decade
+SLIPPAGE_BUCKET_EDGES = [10 ** (exponent / 10) for exponent in range(-30, 51)]  # 0.001 to 100000 bps
+
+
+class Histogram:
+    """
+    Fixed-size histogram with logarithmic buckets, so that the memory of a metric stays bounded however long the
+    strategy runs. The percentiles are approximated by their bucket upper edge (~26% resolution with 10 buckets per
+    decade), clipped to the observed range.
+
+    The buckets hold the absolute values, while the mean, minimum, maximum and last value keep their sign.
+    """
+
+    def __init__(self, bucket_edges: List[float]) -> None:
+        """
+        Args:
+            bucket_edges (List[float]): The increasing bucket upper edges. Larger values fall in an overflow bucket.
+        """
+        self.bucket_edges = bucket_edges
+        self.counts = [0] * (len(bucket_edges) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.last = None
+
+
+    def record(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bucket_edges, abs(value))] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.last = value
+
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Args:
+            q (float): The percentile, in [0, 100].
+
+        Returns:
+            float | None: The approximate q-th percentile of the absolute values, None if nothing was recorded.
+        """
+        if self.count == 0:
+            return None
+        rank = math.ceil(q / 100 * self.count) or 1
+        cumulative = 0
+        for bucket, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                break
+        upper_edge = self.bucket_edges[bucket] if bucket < len(self.bucket_edges) else math.inf
+        return min(upper_edge, max(abs(self.min), abs(self.max)))
+
+
+    def to_dict(self, scale: float = 1.0) -> Dict[str, Any]:
+        """
+        Args:
+            scale (float): The factor applied to the values, e.g. 1000 for seconds to milliseconds.
+
+        Returns:
+            Dict[str, Any]: The count, mean, 50th, 90th and 99th percentiles, maximum and last value.
+        """
+        if self.count == 0:
+            return {"count": 0, "mean": None, "p50": None, "p90": None, "p99": None, "max": None, "last": None}
+        return {"count": self.count, "mean": self.sum / self.count * scale, "p50": self.percentile(50) * scale,
+                "p90": self.percentile(90) * scale, "p99": self.percentile(99) * scale, "max": self.max * scale,
+                "last": self.last * scale}
+
+
+class TickMetrics:
+    """
+    Latency metrics of the ticks of a live strategy, measured with the monotonic clock (time.perf_counter).
+
+    Stages:
+        - tick: the whole tick, from the kline fetch to the log write, as run by the StrategyScheduler.
+        - start_delay: the delay between the scheduled wake-up time of the tick and its start.
+        - fetch: the latest kline fetch (`update_dataset`).
+        - signal: the signal computation (`on_kline` or `generate_signals`).
+        - order: the trade execution (`execute_trade`), for the ticks with a BUY or SELL signal.
+        - exchange_rtt: the round trip of the order request to the exchange.
+        - log_write: the strategy log queueing (`StrategyLogWriter.add_log`), the write itself runs in the background.
+    The slippage of the executed orders is kept in basis points of the signal price. The metrics are written by the
+    scheduler workers and read by the API, hence the lock.
+    """
+
+    def __init__(self, interval_seconds: int | None = None) -> None:
+        """
+        Args:
+            interval_seconds (int, optional): The strategy interval, to which the tick durations are compared.
+        """
+        self.interval_seconds = interval_seconds
+        self.stages = {stage: Histogram(LATENCY_BUCKET_EDGES) for stage in TICK_STAGES}
+        self.slippage_bps = Histogram(SLIPPAGE_BUCKET_EDGES)
+        self.overruns = 0  # ticks skipped because the previous one was still running or the scheduler was late
+        self.lock = threading.Lock()
+
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self.lock:
+            self.stages[stage].record(seconds)
+
+
+    def record_slippage(self, slippage: float, price: float) -> None:
+        if price:
+            with self.lock:
+                self.slippage_bps.record(slippage / price * 1e4)
+
+
+    def record_overrun(self, skipped: int = 1) -> None:
+        with self.lock:
+            self.overruns += skipped
+
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: The metrics, with the stage latencies in milliseconds and:
+                - "load": The 99th percentile tick duration over the interval. Above 1 the strategy does not keep up.
+        """
+        with self.lock:
+            tick_p99 = self.stages["tick"].percentile(99)
+            return {
+                "interval_seconds": self.interval_seconds,
+                "ticks": self.stages["tick"].count,
+                "overruns": self.overruns,
+                "load": tick_p99 / self.interval_seconds if tick_p99 is not None and self.interval_seconds else None,
+                "stages_ms": {stage: histogram.to_dict(1e3) for stage, histogram in self.stages.items()},
+                "slippage_bps": self.slippage_bps.to_dict(),
+            }
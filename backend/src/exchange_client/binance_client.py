@@ -6,21 +6,35 @@ from binance.enums import ORDER_TYPE_STOP_LOSS, ORDER_TYPE_LIMIT, ORDER_TYPE_MAR
     ORDER_TYPE_TAKE_PROFIT_LIMIT, ORDER_TYPE_TAKE_PROFIT
 from typing import Optional, Dict, Any, List, Union
 from database.trade_history_db_client import TradeHistoryDBClient
-import requests
 import bisect
 
 
 class BinanceClient(ExchangeAPIClient):
 
-    def __init__(self):
+    def __init__(self, name: str = 'binance', api_base_url: str = 'https://api.binance.com',
+                 ws_base_url: str = 'wss://stream.binance.com:9443'):
         super().__init__()
-        self.name = 'binance'
-        self.api_base_url = 'https://api.binance.com'  # api[1-4]
+        self.name = name
+        self.api_base_url = api_base_url  # api[1-4]
+        self.ws_base_url = ws_base_url
+        self.client = self.connect()
+
+    def connect(self) -> Optional[Client]:
+        """
+        Creates the Binance SDK client with the API credentials stored under the client name.
+
+        Returns:
+            Optional[Client]: The SDK client, None if no credentials are stored.
+        """
         api_creds = APIEncryptedDatabase.get_api_key_by_name(self.name)
         if api_creds is None:
-            self.client = None
-        else:
-            self.client = Client(api_creds.api_key, api_creds.secret_key)
+            return None
+        return Client(api_creds.api_key, api_creds.secret_key)
+
+    def close(self) -> None:
+        super().close()
+        if self.client is not None:
+            self.client.close_connection()
 
     def check_status(self) -> str:
         """
@@ -402,7 +416,9 @@ class BinanceClient(ExchangeAPIClient):
                                               or None if an error occurs.
         """
         try:
-            if start_time:
+            if start_time and end_time:
+                klines = self.client.get_klines(symbol=symbol.upper(), interval=interval, limit=limit, startTime=start_time, endTime=end_time)
+            elif start_time:
                 klines = self.client.get_klines(symbol=symbol.upper(), interval=interval, limit=limit, startTime=start_time)
             else:
                 klines = self.client.get_klines(symbol=symbol.upper(), interval=interval, limit=limit)
@@ -585,7 +601,7 @@ class BinanceClient(ExchangeAPIClient):
         # static implementation
         pair_symbol = f"{base_asset}{quote_asset}"
         binance_orderbook_url = "https://api.binance.com/api/v3/depth"
-        response = requests.get(binance_orderbook_url, params={"symbol": pair_symbol, "limit": limit})
+        response = self.session.get(binance_orderbook_url, params={"symbol": pair_symbol, "limit": limit})
         if response.status_code == 200:
             order_book = response.json()
             bids = order_book["bids"]
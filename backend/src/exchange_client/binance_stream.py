@@ -0,0 +1,227 @@
+from backend.src.exchange_client.exchange_client import ExchangeAPIClient
+from database.klines.kline_db_client import INTERVAL_MS
+from websockets.asyncio.client import connect
+from collections import deque
+from typing import Dict, Any, List
+import asyncio
+import json
+import threading
+import time
+
+
+class BinanceMarketStream:
+    """
+    Streaming market data of one symbol and interval, from the Binance kline and bookTicker WebSocket streams.
+
+    The streams run on an asyncio event loop in a background thread and keep the latest kline and best bid/ask
+    in memory, so reading the market data costs no request. The connection is re-opened automatically with an
+    exponential backoff, and the klines closed while disconnected are backfilled through the REST API.
+    """
+
+    def __init__(self, exchange_client: ExchangeAPIClient, symbol: str, interval: str, ws_base_url: str = None,
+                 stale_after: float = 30.0, max_reconnect_delay: float = 60.0, history_size: int = 1000) -> None:
+        """
+        Args:
+            exchange_client (ExchangeAPIClient): The Binance client, used for the REST backfill.
+            symbol (str): Trading pair symbol (e.g., "BTCUSDT").
+            interval (str): The klines interval. Must be a Binance stream interval.
+            ws_base_url (str, optional): The WebSocket base url. Defaults to the client `ws_base_url`.
+            stale_after (float): Seconds without a message after which the stream is not considered live.
+            max_reconnect_delay (float): The maximum delay in seconds between reconnection attempts.
+            history_size (int): The number of closed klines kept in memory.
+        """
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Unsupported stream interval: {interval}")
+        self.exchange_client = exchange_client
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.ws_base_url = ws_base_url or exchange_client.ws_base_url
+        self.url = f"{self.ws_base_url}/stream?streams={self.symbol.lower()}@kline_{interval}/{self.symbol.lower()}@bookTicker"
+        self.stale_after = stale_after
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.kline: Dict[str, Any] | None = None  # latest kline update, the kline may still be open
+        self.closed_klines = deque(maxlen=history_size)
+        self.book_ticker: Dict[str, float] | None = None
+        self.last_message_time = 0.0
+        self.reconnects_num = 0
+
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._websocket = None
+        self._is_running = False
+
+
+    def start(self) -> None:
+        """
+        Starts the stream in a background thread.
+        """
+        self._is_running = True
+        self._thread = threading.Thread(target=self._run_loop, daemon=True, name=f"binance_stream_{self.symbol}_{self.interval}")
+        self._thread.start()
+
+
+    def stop(self) -> None:
+        """
+        Closes the connection and stops the background thread.
+        """
+        self._is_running = False
+        if self._loop is not None and self._websocket is not None:
+            asyncio.run_coroutine_threadsafe(self._websocket.close(), self._loop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+    def is_live(self) -> bool:
+        """
+        Returns:
+            bool: Whether the stream is connected and has received a message in the last `stale_after` seconds.
+        """
+        return self._websocket is not None and self.kline is not None and time.time() - self.last_message_time < self.stale_after
+
+
+    def get_last_kline(self) -> Dict[str, Any] | None:
+        """
+        Returns the latest kline, in the exchange client `get_klines` format.
+
+        Returns:
+            Dict[str, Any] | None: A copy of the latest kline, None if no kline has been received yet.
+        """
+        with self._lock:
+            return dict(self.kline) if self.kline is not None else None
+
+
+    def get_last_closed_kline(self) -> Dict[str, Any] | None:
+        """
+        Returns the latest closed kline (final kline event, or backfilled), in the exchange client `get_klines` format.
+
+        Returns:
+            Dict[str, Any] | None: A copy of the latest closed kline, None if no kline has closed yet.
+        """
+        with self._lock:
+            return dict(self.closed_klines[-1]) if self.closed_klines else None
+
+
+    def get_last_price(self) -> float | None:
+        """
+        Returns the latest market price, the mid price of the best bid and ask, or the latest close price
+        if no bookTicker has been received yet.
+
+        Returns:
+            float | None: The latest market price, None if no data has been received yet.
+        """
+        with self._lock:
+            if self.book_ticker is not None:
+                return (self.book_ticker["bid_price"] + self.book_ticker["ask_price"]) / 2
+            return self.kline["close_price"] if self.kline is not None else None
+
+
+    def get_closed_klines(self, from_open_time: int = None) -> List[Dict[str, Any]]:
+        """
+        Returns the closed klines received or backfilled, oldest first.
+
+        Args:
+            from_open_time (int, optional): Only return the klines opened at or after this time (ms).
+
+        Returns:
+            List[Dict[str, Any]]: The closed klines.
+        """
+        with self._lock:
+            return [dict(kline) for kline in self.closed_klines if from_open_time is None or kline["open_time"] >= from_open_time]
+
+
+    def _run_loop(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+
+
+    async def _run(self) -> None:
+        """
+        Connection loop. Re-connects with an exponential backoff until the stream is stopped.
+        """
+        reconnect_delay = 1.0
+        while self._is_running:
+            try:
+                async with connect(self.url) as websocket:
+                    self._websocket = websocket
+                    reconnect_delay = 1.0
+                    # Fill the gap of the klines closed while disconnected, the backfill runs in a worker thread
+                    # so that the stream messages keep being read
+                    if self.closed_klines:
+                        asyncio.get_running_loop().run_in_executor(None, self.backfill)
+                    async for message in websocket:
+                        self._handle_message(message)
+            except Exception as e:
+                print(f"BinanceMarketStream :: {self.symbol} {self.interval} :: Connection error: {e}")
+            self._websocket = None
+            if self._is_running:
+                self.reconnects_num += 1
+                await asyncio.sleep(reconnect_delay)
+                reconnect_delay = min(reconnect_delay * 2, self.max_reconnect_delay)
+
+
+    def _handle_message(self, message: str) -> None:
+        """
+        Handles a combined stream message.
+
+        :kline event:
+            {"stream": "btcusdt@kline_1m", "data": {"e": "kline", "E": 1672515782136, "s": "BTCUSDT",
+             "k": {"t": 1672515780000, "T": 1672515839999, "i": "1m", "o": "0.0010", "c": "0.0020", "h": "0.0025",
+                   "l": "0.0015", "v": "1000", "n": 100, "x": false, ...}}}
+
+        :bookTicker event:
+            {"stream": "btcusdt@bookTicker", "data": {"u": 400900217, "s": "BTCUSDT", "b": "25.35190000",
+             "B": "31.21000000", "a": "25.36520000", "A": "40.66000000"}}
+        """
+        data = json.loads(message)["data"]
+        with self._lock:
+            self.last_message_time = time.time()
+            if data.get("e") == "kline":
+                k = data["k"]
+                kline = {
+                    "open_time": k["t"],
+                    "open_price": float(k["o"]),
+                    "high": float(k["h"]),
+                    "low": float(k["l"]),
+                    "close_price": float(k["c"]),
+                    "close_time": float(k["T"]),
+                    "volume": float(k["v"]),
+                    "trades_num": float(k["n"]),
+                }
+                if self.kline is None or kline["open_time"] >= self.kline["open_time"]:
+                    self.kline = kline
+                if k["x"]:
+                    self._add_closed_kline(kline)
+            else:  # bookTicker
+                self.book_ticker = {"bid_price": float(data["b"]), "ask_price": float(data["a"])}
+
+
+    def _add_closed_kline(self, kline: Dict[str, Any]) -> None:
+        if not self.closed_klines or kline["open_time"] > self.closed_klines[-1]["open_time"]:
+            self.closed_klines.append(kline)
+
+
+    def backfill(self) -> None:
+        """
+        Fetches through the REST API the klines closed since the latest closed kline received, and refreshes the latest kline.
+        """
+        with self._lock:
+            if not self.closed_klines:
+                return
+            start_time = self.closed_klines[-1]["open_time"] + INTERVAL_MS[self.interval]
+        klines = self.exchange_client.get_klines(self.symbol, self.interval, limit=self.closed_klines.maxlen, start_time=start_time)
+        if not klines:
+            return
+
+        now = int(time.time() * 1000)
+        with self._lock:
+            for kline in klines:
+                if kline["close_time"] < now:
+                    self._add_closed_kline(kline)
+            if self.kline is None or klines[-1]["open_time"] > self.kline["open_time"]:
+                self.kline = klines[-1]
+        print(f"BinanceMarketStream :: {self.symbol} {self.interval} :: Backfilled {len(klines)} klines.")
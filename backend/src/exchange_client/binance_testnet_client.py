@@ -1,17 +1,16 @@
 from backend.src.exchange_client.binance_client import BinanceClient
 from database.api_keys_db_client import APIEncryptedDatabase
 from binance.client import Client
+from typing import Optional
 
 
 class BinanceTestnetClient(BinanceClient):
 
     def __init__(self):
-        super().__init__()
-        self.name = 'binance_testnet'
-        self.api_base_url = 'https://testnet.binance.vision'
-        # Set API Keys
+        super().__init__('binance_testnet', 'https://testnet.binance.vision', 'wss://stream.testnet.binance.vision')
+
+    def connect(self) -> Optional[Client]:
         api_creds = APIEncryptedDatabase.get_api_key_by_name(self.name)
         if api_creds is None:
-            self.client = None
-        else:
-            self.client = Client(api_creds.api_key, api_creds.secret_key, testnet=True)
+            return None
+        return Client(api_creds.api_key, api_creds.secret_key, testnet=True)
@@ -2,7 +2,7 @@ import json
 
 from backend.src.exchange_client.exchange_client import ExchangeAPIClient
 from database.api_keys_db_client import APIEncryptedDatabase
-import requests, time, hmac, hashlib, base64
+import time, hmac, hashlib, base64
 from typing import Dict, Any, Optional, Union, List
 import math
 
@@ -97,7 +97,7 @@ class CoinbaseSandboxClient(ExchangeAPIClient):
         """
         endpoint = '/fees'
         headers = self.generate_request_headers(endpoint)
-        response = requests.get(self.api_base_url + endpoint, headers=headers)
+        response = self.session.get(self.api_base_url + endpoint, headers=headers)
         res_dict = response.json()
         return {"maker_commission": float(res_dict["maker_fee_rate"])*100, "taker_commission": float(res_dict["taker_fee_rate"])*100, "buyer_commission": "N/A", "seller_commission": "N/A",
                 "can_trade": "N/A", "can_deposit": "N/A", "can_withdraw": "N/A"}
@@ -117,7 +117,7 @@ class CoinbaseSandboxClient(ExchangeAPIClient):
         try:
             endpoint = '/accounts'
             headers = self.generate_request_headers(endpoint)
-            response = requests.get(self.api_base_url+endpoint, headers=headers)
+            response = self.session.get(self.api_base_url+endpoint, headers=headers)
 
             if response.status_code == 200:
                 accounts = response.json()
@@ -192,7 +192,7 @@ class CoinbaseSandboxClient(ExchangeAPIClient):
                 order_payload["stop_price"] = str(stop_price)
 
             headers = self.generate_request_headers(endpoint, "POST", order_payload)
-            response = requests.post(self.api_base_url + endpoint, headers=headers, json=order_payload)
+            response = self.session.post(self.api_base_url + endpoint, headers=headers, json=order_payload)
             print(response.json())
             if response.status_code in [200, 201]:
                 return {"status": "success", "message": response.json()}
@@ -236,7 +236,7 @@ class CoinbaseSandboxClient(ExchangeAPIClient):
         try:
             endpoint = "/products"
             headers = self.generate_request_headers(endpoint)
-            response = requests.get(self.api_base_url + endpoint, headers=headers)
+            response = self.session.get(self.api_base_url + endpoint, headers=headers)
 
             if response.status_code == 200:
                 data = response.json()
@@ -315,7 +315,7 @@ class CoinbaseSandboxClient(ExchangeAPIClient):
         """
         try:
             endpoint = f"{self.api_base_url}/products/{symbol}"
-            response = requests.get(endpoint)
+            response = self.session.get(endpoint)
 
             if response.status_code == 200:
                 data = response.json()
@@ -354,7 +354,7 @@ class CoinbaseSandboxClient(ExchangeAPIClient):
         """
         try:
             endpoint = f"{self.api_base_url}/products/{symbol}"
-            response = requests.get(endpoint)
+            response = self.session.get(endpoint)
 
             if response.status_code == 200:
                 data = response.json()
@@ -379,7 +379,7 @@ class CoinbaseSandboxClient(ExchangeAPIClient):
         try:
             endpoint = f"/products/{pair_symbol}/ticker"
             headers = self.generate_request_headers(endpoint)
-            response = requests.get(self.coinbase_base_url + endpoint, headers=headers)
+            response = self.session.get(self.coinbase_base_url + endpoint, headers=headers)
 
             if response.status_code == 200:
                 data = response.json()
@@ -1,5 +1,10 @@
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any, List, Union
+from requests.adapters import HTTPAdapter
+import requests
+
+
+HTTP_POOL_SIZE = 16  # keep-alive connections per host, as many as the strategy scheduler workers
 
 
 class ExchangeAPIClient(ABC):
@@ -9,6 +14,31 @@ class ExchangeAPIClient(ABC):
         self.api_key: str = ""
         self.api_secret: str = ""
         self.api_base_url: str = ""
+        self.session: requests.Session = self.create_session()
+
+    @staticmethod
+    def create_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+        """
+        Creates the HTTP session of the client, keeping its connections alive between the requests so that they do
+        not pay a new TCP and TLS handshake each.
+
+        Args:
+            pool_size (int): The maximum number of connections kept per host.
+
+        Returns:
+            requests.Session: The HTTP session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self) -> None:
+        """
+        Closes the connections of the client.
+        """
+        self.session.close()
 
     @abstractmethod
     def check_status(self) -> str:
@@ -1,11 +1,23 @@
+from backend.src.exchange_client.exchange_client import ExchangeAPIClient
 from backend.src.exchange_client.binance_client import BinanceClient
 from backend.src.exchange_client.binance_testnet_client import BinanceTestnetClient
 from backend.src.exchange_client.coinbase_client import CoinbaseClient
 from backend.src.exchange_client.coinbase_sandbox_client import CoinbaseSandboxClient
 from backend.src.exchange_client.kraken_client import KrakenClient
 from backend.src.exchange_client.mock_exchance_client import MockExchangeClient
+from typing import Dict, Optional
+import threading
+
 
 class ExchangeClientFactory:
+    """
+    Registry of the exchange clients, one long-lived client per exchange and process.
+
+    A client is built on first use (credentials lookup, SDK client and HTTP connection pool) and then shared by all
+    the requests, so that they reuse its keep-alive connections. The client of an exchange is dropped by
+    `invalidate_client` when its credentials change, and rebuilt with the new ones on next use.
+    """
+
     _clients = {
         'binance': BinanceClient,
         'binance_testnet': BinanceTestnetClient,
@@ -14,11 +26,54 @@ class ExchangeClientFactory:
         'kraken': KrakenClient,
         'mock_exchange': MockExchangeClient
     }
+    _instances: Dict[str, ExchangeAPIClient] = {}
+    _instances_lock = threading.Lock()
 
     @classmethod
-    def get_client(cls, exchange_name: str):
+    def get_client(cls, exchange_name: str) -> ExchangeAPIClient:
+        """
+        Returns the client of an exchange, building it on first use.
+
+        Args:
+            exchange_name (str): The name of the exchange, e.g. 'binance'.
+
+        Returns:
+            ExchangeAPIClient: The shared client of the exchange.
+
+        Raises:
+            ValueError: If the exchange is unknown.
+        """
+        exchange_name = exchange_name.lower()
+        client = cls._instances.get(exchange_name)
+        if client is not None:
+            return client
+
         # Get the client class based on the exchange_name
-        client_class = cls._clients.get(exchange_name.lower())
+        client_class = cls._clients.get(exchange_name)
         if not client_class:
             raise ValueError(f"Unknown exchange name: {exchange_name}")
-        return client_class()
+        with cls._instances_lock:
+            client = cls._instances.get(exchange_name)  # built by another thread meanwhile
+            if client is None:
+                client = client_class()
+                cls._instances[exchange_name] = client
+            return client
+
+
+    @classmethod
+    def invalidate_client(cls, exchange_name: Optional[str] = None) -> None:
+        """
+        Drops the client of an exchange, so that the next `get_client` builds it again, e.g. with new credentials.
+
+        Args:
+            exchange_name (str, optional): The name of the exchange, all the clients are dropped if None.
+        """
+        with cls._instances_lock:
+            if exchange_name is None:
+                clients = list(cls._instances.values())
+                cls._instances.clear()
+            else:
+                client = cls._instances.pop(exchange_name.lower(), None)
+                clients = [client] if client is not None else []
+        for client in clients:
+            client.close()
@@ -0,0 +1,133 @@
+from database.klines.kline_db_client import INTERVAL_MS
+from websockets.asyncio.server import serve
+from urllib.parse import urlparse, parse_qs
+import asyncio
+import json
+import random
+import threading
+import time
+
+
+class MockBinanceStreamServer:
+    """
+    Local stand-in of the Binance combined WebSocket streams, for testing the market data streams without
+    connecting to the exchange.
+
+    Serves `/stream?streams=<symbol>@kline_<interval>/<symbol>@bookTicker` connections with the Binance message
+    format. A random walk price is pushed as kline and bookTicker events every `push_interval` seconds, with the
+    final (closed) event of each kline sent when its interval ends. `drop_connections` closes the open connections
+    to test the client reconnection.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, push_interval: float = 0.1, base_price: float = 50000.0, volatility: float = 0.0005) -> None:
+        """
+        Args:
+            host (str): The host to listen on.
+            port (int): The port to listen on. Defaults to 0, a free port picked by the OS.
+            push_interval (float): Seconds between the pushed updates.
+            base_price (float): The starting price of the random walk.
+            volatility (float): The standard deviation of the price returns per update.
+        """
+        self.host = host
+        self.port = port
+        self.push_interval = push_interval
+        self.price = base_price
+        self.volatility = volatility
+        self.connections = set()
+        self.messages_num = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._started = threading.Event()
+        self._stop: asyncio.Event | None = None
+
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+
+    def start(self) -> None:
+        """
+        Starts the server in a background thread and waits until it is listening.
+        """
+        self._thread = threading.Thread(target=self._run_loop, daemon=True, name="mock_binance_stream_server")
+        self._thread.start()
+        self._started.wait(timeout=5)
+
+
+    def stop(self) -> None:
+        """
+        Stops the server.
+        """
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+    def drop_connections(self) -> None:
+        """
+        Closes all the open connections, as an exchange disconnection would.
+        """
+        for connection in list(self.connections):
+            asyncio.run_coroutine_threadsafe(connection.close(), self._loop)
+
+
+    def _run_loop(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            self._loop.close()
+
+
+    async def _serve(self) -> None:
+        self._stop = asyncio.Event()
+        async with serve(self._handler, self.host, self.port) as server:
+            self.port = list(server.sockets)[0].getsockname()[1]
+            self._started.set()
+            await self._stop.wait()
+
+
+    async def _handler(self, connection) -> None:
+        streams = parse_qs(urlparse(connection.request.path).query).get("streams", [""])[0].split("/")
+        kline_stream = next(stream for stream in streams if "@kline_" in stream)
+        symbol, interval = kline_stream.split("@kline_")
+        step = INTERVAL_MS[interval]
+
+        self.connections.add(connection)
+        try:
+            kline = None
+            while True:
+                now = int(time.time() * 1000)
+                open_time = now - now % step
+                if kline is not None and kline["t"] != open_time:  # the previous kline closed
+                    kline["x"] = True
+                    await self._send(connection, f"{symbol}@kline_{interval}", {"e": "kline", "E": now, "s": symbol.upper(), "k": kline})
+                    kline = None
+
+                self.price *= 1 + random.gauss(0, self.volatility)
+                price = f"{self.price:.8f}"
+                if kline is None:
+                    kline = {"t": open_time, "T": open_time + step - 1, "s": symbol.upper(), "i": interval, "o": price, "c": price,
+                             "h": price, "l": price, "v": "0.00000000", "n": 0, "x": False}
+                kline["c"] = price
+                kline["h"] = f"{max(float(kline['h']), self.price):.8f}"
+                kline["l"] = f"{min(float(kline['l']), self.price):.8f}"
+                kline["v"] = f"{float(kline['v']) + random.uniform(0, 2):.8f}"
+                kline["n"] += 1
+
+                await self._send(connection, f"{symbol}@kline_{interval}", {"e": "kline", "E": now, "s": symbol.upper(), "k": kline})
+                await self._send(connection, f"{symbol}@bookTicker", {"u": self.messages_num, "s": symbol.upper(),
+                                                                      "b": f"{self.price * 0.9999:.8f}", "B": "1.00000000",
+                                                                      "a": f"{self.price * 1.0001:.8f}", "A": "1.00000000"})
+                await asyncio.sleep(self.push_interval)
+        except Exception:  # connection closed
+            pass
+        finally:
+            self.connections.discard(connection)
+
+
+    async def _send(self, connection, stream: str, data: dict) -> None:
+        await connection.send(json.dumps({"stream": stream, "data": data}))
+        self.messages_num += 1
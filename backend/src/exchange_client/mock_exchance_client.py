@@ -1,5 +1,7 @@
 import random
 from backend.src.exchange_client.exchange_client import ExchangeAPIClient
+from backend.src.exchange_client.synthetic_market import SyntheticMarket, EPOCH_MS
+from database.klines.kline_db_client import INTERVAL_MS
 from typing import Optional, Dict, Any, List, Union
 import time
 from dotenv import load_dotenv, dotenv_values, set_key
@@ -10,10 +12,11 @@ ENV_PATH = "backend/src/exchange_client/mock_status.env"
 
 class MockExchangeClient(ExchangeAPIClient):
 
-    def __init__(self):
+    def __init__(self, seed: int = 42):
         super().__init__()
         self.name = 'mock_exchange'
         self.api_base_url = ""
+        self.market = SyntheticMarket(seed)
         load_dotenv(ENV_PATH)
 
 
@@ -164,6 +167,9 @@ class MockExchangeClient(ExchangeAPIClient):
     def get_klines(self, symbol: str, interval: str, limit: int, start_time: int = None, end_time: int = None) -> Optional[List[Dict[str, float]]]:
         """
         Mock function to generate realistic kline (candlestick) data for testing.
+        The klines are generated by a seeded SyntheticMarket, so that the same time range always returns the same klines.
+        Like the exchanges, it returns the klines opened in [start_time, end_time], up to :limit: of them from start_time,
+        or the latest :limit: ones if only end_time is given. The klines end at the current (still open) kline.
 
         Args:
             symbol (str): The trading pair symbol (e.g., "ETHUSDT").
@@ -183,50 +189,27 @@ class MockExchangeClient(ExchangeAPIClient):
                 - 'volume' (float): The volume of trades.
                 - 'trades_num' (float): The number of trades.
         """
-        current_time = int(time.time() * 1000)
-        time_step = 60000  # default: 1-minute candles
-
-        if start_time is not None:
-            start_time = current_time - (limit * time_step)
-
-        price_ranges = {
-            "BTCUSDT": (50000, 0.01),  # (starting price, volatility)
-            "ETHUSDT": (3000, 0.015),
-            "ADAUSDT": (1.0, 0.02),
-        }
-
-        base_price, volatility = price_ranges.get(symbol.upper(), (1000, 0.01))
-
-        klines = []
-        price = base_price
-
-        for i in range(limit):
-            open_time = start_time + (i * time_step)
-
-            # Simulate open -> close with some drift
-            drift = random.uniform(-1, 1) * volatility * price
-            close_price = round(price + drift, 2)
-
-            high = round(max(price, close_price) + abs(drift) * random.uniform(0.2, 0.5), 2)
-            low = round(min(price, close_price) - abs(drift) * random.uniform(0.2, 0.5), 2)
-
-            volume = round(random.uniform(10, 10000), 2)
-            trades_num = random.randint(50, 1000)
-
-            klines.append({
-                "open_time": open_time,
-                "open_price": round(price, 2),
-                "high": high,
-                "low": low,
-                "close_price": close_price,
-                "close_time": open_time + time_step,
-                "volume": volume,
-                "trades_num": trades_num,
-            })
-
-            price = close_price  # Set next candle's open to current close
-
-        return klines
+        try:
+            if interval not in INTERVAL_MS:
+                raise ValueError(f"Unsupported interval: {interval}")
+            time_step = INTERVAL_MS[interval]
+            current_time = int(time.time() * 1000)
+            last_open_time = current_time - current_time % time_step
+            if end_time is not None:
+                last_open_time = min(last_open_time, end_time - end_time % time_step)
+
+            if start_time is not None:
+                start_time = max(start_time, EPOCH_MS)
+                first_open_time = start_time + (-start_time) % time_step  # first kline opened at or after start_time
+                limit = min(limit, (last_open_time - first_open_time) // time_step + 1)
+            else:
+                first_open_time = max(last_open_time - (limit - 1) * time_step, EPOCH_MS)
+                limit = (last_open_time - first_open_time) // time_step + 1
+
+            return self.market.generate_klines(symbol, interval, first_open_time, limit)
+        except Exception as e:
+            print(f"MockExchangeClient :: get_klines :: {e}")
+            return None
 
 
     def get_symbol_info(self, symbol: str) -> Dict[str, Any] | None:
@@ -0,0 +1,164 @@
+import zlib
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from backend.src.broker.sibyl_trading_engine.indicators import kernels
+from database.klines.kline_db_client import INTERVAL_MS
+
+
+EPOCH_MS = 1262304000000  # 2010-01-01, open time of the first synthetic kline of every market
+YEAR_MS = 365.25 * 86400000
+BLOCK_SIZE = 1024  # klines generated from one random stream
+ANCHOR_CHUNK_SIZE = 4096  # block returns generated from one random stream
+MEAN_REVERSION_YEARS = 1.0  # time scale over which the log price is pulled back to the market base price
+ABS_NORMAL_MEAN = np.sqrt(2 / np.pi)  # E|z| of a standard normal z
+
+# symbol -> (base price, annualized volatility, mean volume per minute, mean trade size)
+MARKETS = {
+    "BTCUSDT": (50000.0, 0.6, 20.0, 0.02),
+    "ETHUSDT": (3000.0, 0.75, 300.0, 0.3),
+    "ADAUSDT": (1.0, 0.9, 200000.0, 500.0),
+}
+DEFAULT_MARKET = (1000.0, 0.7, 100.0, 1.0)
+
+
+class SyntheticMarket:
+    """
+    Seeded, vectorized generator of synthetic klines, following a geometric Brownian motion with optional regime switches.
+
+    The klines of a (symbol, interval) market form a single path starting at EPOCH_MS, so that any time range of it can
+    be generated independently and consistently: the same seed and time range always return identical klines, and
+    overlapping ranges agree on their common klines.
+    To that end, the path is split into blocks of BLOCK_SIZE klines, each drawn from its own random stream keyed by
+    (seed, symbol, interval, block):
+        - The log price at the start of every block (its anchor) is a mean-reverting random walk over the blocks,
+          computed once per market from the epoch, which costs one random number per block.
+        - Within a block, the log prices are a Brownian bridge between the block anchor and the next one.
+    Generating N klines therefore only draws the random numbers of the N klines, whatever their distance to the epoch.
+
+    The volume of a kline grows with the size of its move, and its number of trades is the volume over a noisy mean
+    trade size.
+    """
+
+    def __init__(self, seed: int = 42, regimes: Sequence[Tuple[float, float]] = ((0.0, 1.0),),
+                 mean_regime_duration_ms: float = 30 * 86400000) -> None:
+        """
+        Args:
+            seed (int): The random seed of all the markets.
+            regimes (Sequence[Tuple[float, float]]): The (annualized drift, volatility multiplier) of each market regime.
+                The regimes follow each other in order, cyclically. A single regime is a plain geometric Brownian motion.
+            mean_regime_duration_ms (float): The mean duration of a regime, in milliseconds.
+        """
+        if not regimes:
+            raise ValueError("At least one regime is required")
+        self.seed = seed
+        self.regimes = np.asarray(regimes, dtype=float).reshape(-1, 2)
+        self.mean_regime_duration_ms = mean_regime_duration_ms
+        self.anchors: Dict[Tuple[str, int], Tuple[np.ndarray, np.ndarray]] = {}  # market -> (block anchors, block regimes)
+
+
+    def _stream(self, symbol: str, step: int, kind: int, index: int) -> np.random.Generator:
+        return np.random.default_rng([self.seed, zlib.crc32(symbol.encode()), step, kind, index])
+
+
+    def _get_anchors(self, symbol: str, step: int, blocks_num: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The log price anchors and the regimes of the first :blocks_num: blocks of the
+                market, the anchors having one more entry: the end of the last block.
+        """
+        anchors, regimes = self.anchors.get((symbol, step), (np.empty(0), np.empty(0, dtype=int)))
+        if regimes.size >= blocks_num:
+            return anchors, regimes
+
+        chunks_num = -(-blocks_num // ANCHOR_CHUNK_SIZE)
+        streams = [self._stream(symbol, step, 0, chunk) for chunk in range(chunks_num)]
+        uniform = np.concatenate([stream.random(ANCHOR_CHUNK_SIZE) for stream in streams])
+        normal = np.concatenate([stream.standard_normal(ANCHOR_CHUNK_SIZE) for stream in streams])
+        base_price, volatility = MARKETS.get(symbol, DEFAULT_MARKET)[:2]
+        block_ms = BLOCK_SIZE * step
+
+        # The regime changes in a block with probability block duration / mean regime duration
+        switches = uniform < min(1.0, block_ms / self.mean_regime_duration_ms)
+        regimes = np.cumsum(switches) % len(self.regimes)
+        drift, volatility_multiplier = self.regimes[regimes].T
+
+        # Ornstein-Uhlenbeck log price deviation from the base price, sampled exactly at the block boundaries
+        decay = np.exp(-block_ms / YEAR_MS / MEAN_REVERSION_YEARS)
+        sigma = volatility * volatility_multiplier
+        horizon = MEAN_REVERSION_YEARS * (1 - decay)  # ~ the block duration in years, when it is short
+        returns = (drift - sigma ** 2 / 2) * horizon + sigma * np.sqrt(MEAN_REVERSION_YEARS / 2 * (1 - decay ** 2)) * normal
+        deviation = kernels.decay_filter(returns, decay)
+        anchors = np.log(base_price) + np.r_[0.0, deviation]
+
+        self.anchors[(symbol, step)] = (anchors, regimes)
+        return anchors, regimes
+
+
+    def generate(self, symbol: str, interval: str, start_time: int, limit: int) -> Dict[str, np.ndarray]:
+        """
+        Generates consecutive klines of a market.
+
+        Args:
+            symbol (str): The trading pair symbol (e.g., "BTCUSDT").
+            interval (str): The klines interval, one of INTERVAL_MS.
+            start_time (int): The open time of the first kline, rounded up to the interval and to EPOCH_MS.
+            limit (int): The number of klines.
+
+        Returns:
+            Dict[str, np.ndarray]: The kline fields, as columns: open_time, open_price, high, low, close_price,
+                close_time, volume and trades_num.
+        """
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Unsupported interval: {interval}")
+        symbol = symbol.upper()
+        step = INTERVAL_MS[interval]
+        first = max(0, -(-(start_time - EPOCH_MS) // step))  # index of the first kline since the epoch
+        limit = max(0, limit)
+        first_block = first // BLOCK_SIZE
+        end_block = max(first_block + 1, -(-(first + limit) // BLOCK_SIZE))
+
+        anchors, regimes = self._get_anchors(symbol, step, end_block)
+        _, volatility, volume_per_minute, trade_size = MARKETS.get(symbol, DEFAULT_MARKET)
+        volatility_multiplier = self.regimes[regimes[first_block:end_block], 1]
+        sigma = (volatility * volatility_multiplier * np.sqrt(step / YEAR_MS))[:, None]  # volatility of one kline, by block
+
+        z = np.stack([self._stream(symbol, step, 1, block).standard_normal((5, BLOCK_SIZE))
+                      for block in range(first_block, end_block)]).reshape(-1, 5, BLOCK_SIZE)
+
+        # Brownian bridge from each block anchor to the next one
+        path = np.cumsum(sigma * z[:, 0], axis=1)
+        block_return = (anchors[first_block + 1:end_block + 1] - anchors[first_block:end_block])[:, None]
+        path -= np.arange(1, BLOCK_SIZE + 1) / BLOCK_SIZE * (path[:, -1:] - block_return)
+        log_close = anchors[first_block:end_block, None] + path
+        log_open = np.concatenate([anchors[first_block:end_block, None], log_close[:, :-1]], axis=1)
+
+        high = np.maximum(log_open, log_close) + 0.5 * sigma * np.abs(z[:, 1])
+        low = np.minimum(log_open, log_close) - 0.5 * sigma * np.abs(z[:, 2])
+        move = np.abs(log_close - log_open) / sigma
+        volume = (volume_per_minute * step / 60000 * np.exp(0.5 * z[:, 3] - 0.125)  # log-normal noise of mean 1
+                  * (1 + 2 * move) / (1 + 2 * ABS_NORMAL_MEAN))
+        trades_num = np.maximum(1, np.rint(volume / trade_size * np.exp(0.2 * z[:, 4] - 0.02)))
+
+        rows = slice(first - first_block * BLOCK_SIZE, first - first_block * BLOCK_SIZE + limit)
+        open_time = EPOCH_MS + (first + np.arange(limit, dtype=np.int64)) * step
+        return {
+            "open_time": open_time,
+            "open_price": np.round(np.exp(log_open.ravel()[rows]), 8),
+            "high": np.round(np.exp(high.ravel()[rows]), 8),
+            "low": np.round(np.exp(low.ravel()[rows]), 8),
+            "close_price": np.round(np.exp(log_close.ravel()[rows]), 8),
+            "close_time": open_time + step - 1,
+            "volume": np.round(volume.ravel()[rows], 8),
+            "trades_num": trades_num.ravel()[rows],
+        }
+
+
+    def generate_klines(self, symbol: str, interval: str, start_time: int, limit: int) -> List[Dict[str, float]]:
+        """
+        Generates consecutive klines of a market, in the format of `ExchangeAPIClient.get_klines`.
+        See `generate` for the arguments.
+        """
+        columns = self.generate(symbol, interval, start_time, limit)
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*(column.tolist() for column in columns.values()))]
+
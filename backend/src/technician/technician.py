@@ -51,6 +51,8 @@ class Technician:
                 APIEncryptedDatabase.update_api_key(api_name, api_key, secret_key, api_metadata)
             else:
                 APIEncryptedDatabase.insert_api_key(api_name, api_key, secret_key, api_metadata)
+            # Rebuild the exchange client with the new credentials on next use
+            ExchangeClientFactory.invalidate_client(api_name)
             return True
         except Exception as e:
             print(e)
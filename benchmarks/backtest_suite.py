@@ -0,0 +1,242 @@
+"""
+Performance benchmarks of the backtesting and trading hot paths, written to JSON so that runs can be compared.
+
+Benchmarks:
+    - backtest: `Backtester.run_backtest` of every strategy of the StrategyFactory, at several dataset sizes.
+    - evaluator: `Evaluator.evaluate`, at several log sizes.
+    - tactician_update_dataset: `Tactician.update_dataset`, per tick, at several dataset sizes.
+    - analyst_score: `Analyst.get_market_condition_score`, at several dataset sizes.
+    - monte_carlo: `MonteCarloAnalyzer.run` of the per-bar returns, at several log sizes.
+
+The klines come from the MockExchangeClient (seeded, so every run uses the same klines), or from the klines already
+in the local store with `--source store`, without calling the exchange. Both go through the local klines store like
+the Backtester, so the first mock run also fills the store (rate-limited like an exchange), and is used as warm-up.
+
+Usage:
+    $ python -m benchmarks.backtest_suite --output bench.json
+    $ python -m benchmarks.backtest_suite --compare bench.json  # exits with an error on regressions
+    $ python -m benchmarks.backtest_suite --source store --exchange binance --symbol BTCUSDT --sizes 1000 10000
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+from typing import Any, Callable, Dict, List
+import numpy as np
+import pandas as pd
+from backend.src.analyst.analyst import Analyst
+from backend.src.broker.sibyl_trading_engine.backtester.backtester import Backtester
+from backend.src.broker.sibyl_trading_engine.backtester.monte_carlo import MonteCarloAnalyzer
+from backend.src.broker.sibyl_trading_engine.evaluator.evaluator import Evaluator
+from backend.src.broker.sibyl_trading_engine.strategies.strategy_factory import StrategyFactory
+from backend.src.broker.sibyl_trading_engine.tactician.exchange_interface import TacticianExchangeInterface
+from backend.src.broker.sibyl_trading_engine.tactician.kline_buffer import KlineRingBuffer
+from backend.src.broker.sibyl_trading_engine.tactician.tactician_base import Tactician
+from backend.src.exchange_client.mock_exchance_client import MockExchangeClient
+from backend.src.exchange_client.synthetic_market import SyntheticMarket
+from database.klines.kline_db_client import KlineDBClient, INTERVAL_MS
+
+
+END_TIME = 1735689600000  # 2025-01-01, fixed end of the benchmark klines, so that every run uses the same ones
+DEFAULT_THRESHOLD = 1.25  # slowdown ratio reported as a regression by --compare
+
+
+class StoredKlinesClient:
+    """
+    Exchange client stand-in serving only the klines already in the local store: its requests for missing klines fail,
+    so the store neither downloads nor marks them as covered.
+    """
+
+    def __init__(self, exchange: str) -> None:
+        self.name = exchange
+
+
+    def get_klines(self, symbol: str, interval: str, limit: int, start_time: int = None, end_time: int = None) -> None:
+        return None
+
+
+    def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
+        # The Tactician needs the symbol trading info, which is not stored
+        return {"status": "TRADING", "quote_precision": 0.01, "base_precision": 0.0001, "min_trade_value": 0.001}
+
+
+def time_call(function: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """
+    Returns:
+        Dict[str, float]: The median and the minimum run time of the function, in seconds.
+    """
+    times = timeit.repeat(function, number=1, repeat=repeat)
+    return {"median_s": float(np.median(times)), "min_s": float(np.min(times))}
+
+
+def load_klines(exchange_client: Any, symbol: str, interval: str, size: int) -> List[Dict[str, Any]]:
+    """
+    Returns:
+        List[Dict[str, Any]]: The :size: klines ending at END_TIME, from the local klines store.
+    """
+    start_time = END_TIME - size * INTERVAL_MS[interval]
+    return KlineDBClient().get_klines(exchange_client, symbol, interval, start_time, END_TIME - 1)
+
+
+def benchmark_backtests(exchange_client: Any, symbol: str, interval: str, sizes: List[int], repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    for size in sizes:
+        start_time = END_TIME - size * INTERVAL_MS[interval]
+        for strategy_name in StrategyFactory.get_strategy_names():
+            strategy = StrategyFactory.get_strategy(strategy_name, {})
+            backtester = Backtester(strategy, exchange_client, symbol, interval, start_time=start_time, end_time=END_TIME - 1)
+
+            def run_backtest() -> None:
+                backtester.backtesting_logs = []
+                backtester.run_backtest()
+
+            run_backtest()  # warm-up, fills the klines store
+            results.append({"name": f"backtest/{strategy_name}/{size}", "benchmark": "backtest", "strategy": strategy_name,
+                            "size": size, "logs": len(backtester.backtesting_logs), **time_call(run_backtest, repeat)})
+    return results
+
+
+def make_logs(size: int, seed: int) -> List[Dict[str, Any]]:
+    klines = SyntheticMarket(seed).generate("BTCUSDT", "1m", END_TIME - size * 60000, size)
+    orders = np.random.default_rng(seed).choice(["BUY", "SELL", "HOLD"], size=size, p=[0.02, 0.02, 0.96])
+    return [{"timestamp": timestamp, "price": price, "order": order}
+            for timestamp, price, order in zip(klines["open_time"].tolist(), klines["close_price"].tolist(), orders.tolist())]
+
+
+def benchmark_evaluator(sizes: List[int], repeat: int, seed: int) -> List[Dict[str, Any]]:
+    results = []
+    for size in sizes:
+        logs = make_logs(size, seed)
+        results.append({"name": f"evaluator/{size}", "benchmark": "evaluator", "size": size,
+                        **time_call(lambda: Evaluator(logs).evaluate(), repeat)})
+    return results
+
+
+def benchmark_tactician_update(exchange_client: Any, symbol: str, interval: str, sizes: List[int], ticks: int, repeat: int) -> List[Dict[str, Any]]:
+    exchange_api = TacticianExchangeInterface(exchange_client)
+    base_asset, quote_asset = symbol[:-4], symbol[-4:]
+    results = []
+    for size in sizes:
+        klines = pd.DataFrame(load_klines(exchange_client, symbol, interval, size)).rename(columns={"open_time": "timestamp"})
+        tactician = Tactician(exchange_api, quote_asset, base_asset, 100)
+        tactician.time_interval = interval
+
+        def run_ticks() -> None:
+            tactician.dataset = KlineRingBuffer.from_dataframe(klines)
+            for _ in range(ticks):
+                tactician.update_dataset()
+
+        timing = time_call(run_ticks, repeat)
+        results.append({"name": f"tactician_update_dataset/{size}", "benchmark": "tactician_update_dataset", "size": size,
+                        "ticks": ticks, **{key: value / ticks for key, value in timing.items()}})  # per tick
+    return results
+
+
+def benchmark_analyst_score(exchange_client: Any, symbol: str, interval: str, sizes: List[int], repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    for size in sizes:
+        analyst = Analyst(load_klines(exchange_client, symbol, interval, size))
+        results.append({"name": f"analyst_score/{size}", "benchmark": "analyst_score", "size": size,
+                        **time_call(analyst.get_market_condition_score, repeat)})
+    return results
+
+
+def benchmark_monte_carlo(sizes: List[int], runs: int, repeat: int, seed: int) -> List[Dict[str, Any]]:
+    results = []
+    for size in sizes:
+        logs = make_logs(size, seed)
+        results.append({"name": f"monte_carlo/{size}", "benchmark": "monte_carlo", "size": size, "runs": runs,
+                        **time_call(lambda: MonteCarloAnalyzer(logs, runs, "bars", seed=seed).run(), repeat)})
+    return results
+
+
+def get_metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        commit = None
+    return {"created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(), "commit": commit,
+            "python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+            "platform": platform.platform(), "arguments": vars(args)}
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> List[str]:
+    """
+    Returns:
+        List[str]: The benchmarks slower than in the baseline by more than the threshold ratio.
+    """
+    with open(baseline_path, "r") as f:
+        baseline = {result["name"]: result for result in json.load(f)["results"]}
+
+    regressions = []
+    print(f"\n{'benchmark':<58}{'baseline (ms)':>15}{'current (ms)':>14}{'ratio':>8}")
+    for result in results:
+        if result["name"] not in baseline:
+            continue
+        baseline_time, current_time = baseline[result["name"]]["median_s"], result["median_s"]
+        ratio = current_time / baseline_time
+        print(f"{result['name']:<58}{baseline_time * 1e3:>15.3f}{current_time * 1e3:>14.3f}{ratio:>7.2f}x")
+        if ratio > threshold:
+            regressions.append(f"{result['name']}: {ratio:.2f}x slower")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backtesting and trading hot paths benchmarks.")
+    parser.add_argument("--source", choices=["mock", "store"], default="mock", help="klines from the MockExchangeClient or only from the local store")
+    parser.add_argument("--exchange", default="binance", help="exchange of the stored klines, with --source store")
+    parser.add_argument("--symbol", default="BTCUSDT")
+    parser.add_argument("--interval", default="1m", choices=list(INTERVAL_MS))
+    parser.add_argument("--seed", type=int, default=42, help="seed of the mock klines and of the evaluator logs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="dataset sizes of the backtests")
+    parser.add_argument("--log-sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="log sizes of the evaluator")
+    parser.add_argument("--tick-sizes", type=int, nargs="+", default=[500, 5000], help="dataset sizes of the tactician updates")
+    parser.add_argument("--ticks", type=int, default=100, help="tactician updates per timed run")
+    parser.add_argument("--mc-sizes", type=int, nargs="+", default=[1000, 10000], help="log sizes of the Monte Carlo analyses")
+    parser.add_argument("--mc-runs", type=int, default=1000, help="resampled histories per Monte Carlo analysis")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--benchmarks", nargs="+", default=["backtest", "evaluator", "tactician_update_dataset", "analyst_score", "monte_carlo"],
+                        choices=["backtest", "evaluator", "tactician_update_dataset", "analyst_score", "monte_carlo"])
+    parser.add_argument("--output", help="results JSON file, defaults to benchmarks/results/<UTC time>.json")
+    parser.add_argument("--compare", help="baseline results JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    exchange_client = MockExchangeClient(args.seed) if args.source == "mock" else StoredKlinesClient(args.exchange)
+    results = []
+    if "backtest" in args.benchmarks:
+        results += benchmark_backtests(exchange_client, args.symbol, args.interval, args.sizes, args.repeat)
+    if "evaluator" in args.benchmarks:
+        results += benchmark_evaluator(args.log_sizes, args.repeat, args.seed)
+    if "tactician_update_dataset" in args.benchmarks:
+        results += benchmark_tactician_update(exchange_client, args.symbol, args.interval, args.tick_sizes, args.ticks, args.repeat)
+    if "analyst_score" in args.benchmarks:
+        results += benchmark_analyst_score(exchange_client, args.symbol, args.interval, args.sizes, args.repeat)
+    if "monte_carlo" in args.benchmarks:
+        results += benchmark_monte_carlo(args.mc_sizes, args.mc_runs, args.repeat, args.seed)
+
+    print(f"{'benchmark':<58}{'median (ms)':>13}{'min (ms)':>12}")
+    for result in results:
+        print(f"{result['name']:<58}{result['median_s'] * 1e3:>13.3f}{result['min_s'] * 1e3:>12.3f}")
+
+    output = args.output or os.path.join("benchmarks", "results", f"{datetime.datetime.now(datetime.timezone.utc):%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"metadata": get_metadata(args), "results": results}, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold}x:")
+            print("\n".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Micro-benchmarks of the NumPy indicator kernels against the pandas and `ta` implementations they replace.
+
+Usage:
+    $ python -m benchmarks.indicator_kernels --sizes 500 100000 --repeat 20
+
+Prints the median run time of both implementations of every indicator on random-walk klines. The cases are defined in
+tests/indicator_cases.py, and the kernels are checked against the same references by tests/test_indicator_kernels.py.
+"""
+
+import argparse
+import timeit
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from tests.indicator_cases import generate_klines, get_cases
+
+
+def run_benchmarks(data: pd.DataFrame, repeat: int) -> List[Dict[str, object]]:
+    """
+    Returns:
+        List[Dict[str, object]]: The median run time of the reference and the kernel of each indicator, in microseconds.
+    """
+    results = []
+    for name, (reference, kernel) in get_cases(data).items():
+        reference_time = np.median(timeit.repeat(reference, number=1, repeat=repeat)) * 1e6
+        kernel_time = np.median(timeit.repeat(kernel, number=1, repeat=repeat)) * 1e6
+        results.append({"indicator": name, "reference_us": reference_time, "kernel_us": kernel_time,
+                        "speedup": reference_time / kernel_time})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Indicator kernels micro-benchmarks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 100000], help="numbers of klines")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per indicator")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        data = generate_klines(size)
+        print(f"\n{size} klines")
+        print(f"{'indicator':<26}{'reference (us)':>16}{'kernel (us)':>14}{'speedup':>10}")
+        for result in run_benchmarks(data, args.repeat):
+            print(f"{result['indicator']:<26}{result['reference_us']:>16.1f}{result['kernel_us']:>14.1f}{result['speedup']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
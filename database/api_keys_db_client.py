@@ -3,7 +3,9 @@ import sqlalchemy as sa
 from sqlalchemy.orm import sessionmaker, declarative_base
 from cryptography.fernet import Fernet, InvalidToken
 from dotenv import load_dotenv
+import threading
 import logging
+import time
 
 logging.basicConfig()
 logging.getLogger('sqlalchemy').setLevel(logging.ERROR)
@@ -21,6 +23,41 @@ class APIEncryptedDatabase:
     Base = declarative_base()
     cipher = None  # Placeholder for encryption cipher
 
+    # Decrypted credentials cache, name -> (CachedCredentials or None if no key is stored, expiry time or None)
+    cache_ttl = float(os.getenv("API_KEYS_CACHE_TTL")) if os.getenv("API_KEYS_CACHE_TTL") else None
+    _cache = {}
+    _cache_lock = threading.Lock()
+    _cache_generation = 0  # incremented on invalidation, so that a lookup racing with it does not cache stale keys
+
+    class APICredentials:
+        """Decrypted API credentials, as returned by get_api_key_by_name."""
+
+        def __init__(self, name: str, api_key: str, secret_key: str = None, api_metadata: str = None):
+            self.name = name
+            self.api_key = api_key
+            self.secret_key = secret_key
+            self.api_metadata = api_metadata
+
+    class CachedCredentials:
+        """
+        Decrypted API credentials kept in the cache. The values are held in bytearrays, so that they can be
+        overwritten with zeros when the entry is evicted instead of lingering in memory until garbage collection.
+        """
+
+        def __init__(self, credentials: "APIEncryptedDatabase.APICredentials"):
+            self.name = credentials.name
+            self.values = [bytearray(value.encode()) if value is not None else None
+                           for value in (credentials.api_key, credentials.secret_key, credentials.api_metadata)]
+
+        def get_credentials(self) -> "APIEncryptedDatabase.APICredentials":
+            api_key, secret_key, api_metadata = [value.decode() if value is not None else None for value in self.values]
+            return APIEncryptedDatabase.APICredentials(self.name, api_key, secret_key, api_metadata)
+
+        def zero(self):
+            for value in self.values:
+                if value is not None:
+                    value[:] = bytes(len(value))
+
     # Database Model
     class APIKeyStore(Base):
         __tablename__ = "api_keys"
@@ -66,6 +103,7 @@ class APIEncryptedDatabase:
     def init_cipher(cls):
         """Initializes the encryption cipher."""
         cls.cipher = Fernet(cls.load_or_generate_key())
+        cls.invalidate_cache()
 
     @classmethod
     def init_db(cls):
@@ -90,6 +128,7 @@ class APIEncryptedDatabase:
         session.add(new_key)
         session.commit()
         session.close()
+        cls.invalidate_cache(name)
         print(f"APIEncryptedDatabase :: ✅ API Key '{name}' added successfully.")
 
     @classmethod
@@ -104,14 +143,43 @@ class APIEncryptedDatabase:
 
     @classmethod
     def get_api_key_by_name(cls, name: str):
-        """Retrieves and decrypts an API key by name."""
+        """
+        Retrieves and decrypts an API key by name.
+
+        The decrypted credentials (or their absence) are cached, so that only the first lookup of a name pays for the
+        database query and the decryption. The entry is invalidated when the key is inserted, updated or deleted,
+        and expires after `cache_ttl` seconds if set (API_KEYS_CACHE_TTL), e.g. for a process sharing the database
+        with the one changing the keys.
+        """
+        with cls._cache_lock:
+            entry = cls._cache.get(name)
+            if entry is not None:
+                cached, expires_at = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    return cached.get_credentials() if cached is not None else None
+                cls._evict(name)
+            generation = cls._cache_generation
+
+        credentials = cls._load_api_key(name)
+        cached = cls.CachedCredentials(credentials) if credentials is not None else None
+        with cls._cache_lock:
+            if generation == cls._cache_generation:
+                cls._evict(name)
+                cls._cache[name] = (cached, time.monotonic() + cls.cache_ttl if cls.cache_ttl is not None else None)
+            elif cached is not None:
+                cached.zero()
+        return credentials
+
+    @classmethod
+    def _load_api_key(cls, name: str):
+        """Retrieves and decrypts an API key by name from the database."""
         session = cls.Session()
         key = session.query(cls.APIKeyStore).filter_by(name=name).first()
         if key:
             try:
                 key.decrypt_data()
                 session.close()
-                return key
+                return cls.APICredentials(key.name, key.api_key, key.secret_key, key.api_metadata)
             except AttributeError as e:
                 print(e)
                 return None
@@ -119,6 +187,21 @@ class APIEncryptedDatabase:
         print(f"APIEncryptedDatabase :: ⚠️ No API Key found with name '{name}'.")
         return None
 
+    @classmethod
+    def _evict(cls, name: str):
+        """Removes a cache entry and zeroes its credentials. The cache lock must be held."""
+        entry = cls._cache.pop(name, None)
+        if entry is not None and entry[0] is not None:
+            entry[0].zero()
+
+    @classmethod
+    def invalidate_cache(cls, name: str = None):
+        """Invalidates the cached credentials of an API key, or of all the keys if name is None."""
+        with cls._cache_lock:
+            cls._cache_generation += 1
+            for cached_name in ([name] if name is not None else list(cls._cache)):
+                cls._evict(cached_name)
+
     @classmethod
     def update_api_key(cls, name: str, new_api_key: str = None, new_secret_key: str = None, new_metadata: str = None):
         """Updates an existing API key by name."""
@@ -138,6 +221,7 @@ class APIEncryptedDatabase:
 
         session.commit()
         session.close()
+        cls.invalidate_cache(name)
         print(f"APIEncryptedDatabase :: ✅ API Key '{name}' updated successfully.")
 
     @classmethod
@@ -153,4 +237,5 @@ class APIEncryptedDatabase:
         session.delete(key)
         session.commit()
         session.close()
+        cls.invalidate_cache(name)
         print(f"APIEncryptedDatabase :: 🗑️ API Key '{name}' deleted successfully.")
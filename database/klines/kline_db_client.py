@@ -0,0 +1,298 @@
+from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple
+import numpy as np
+import pandas as pd
+import threading
+import json
+import time
+import os
+
+
+# Interval lengths in milliseconds. Only intervals aligned to the Unix epoch are stored (e.g. not 1w, 1M).
+INTERVAL_MS = {'1s': 1000, '1m': 60000, '3m': 180000, '5m': 300000, '15m': 900000, '30m': 1800000,
+               '1h': 3600000, '2h': 7200000, '4h': 14400000, '6h': 21600000, '8h': 28800000, '12h': 43200000,
+               '1d': 86400000}
+
+KLINE_FIELDS = {"open_time": np.int64, "open_price": np.float64, "high": np.float64, "low": np.float64,
+                "close_price": np.float64, "close_time": np.float64, "volume": np.float64, "trades_num": np.float64}
+
+KLINE_DTYPE = np.dtype(list(KLINE_FIELDS.items()))  # one record per kline, so that the fields of a kline are written together
+SEGMENT_KLINES = 10000  # klines per segment file, an update only rewrites the segments its klines fall in
+
+EXCHANGE_KLINES_LIMIT = 1000  # Maximum number of klines returned by a single exchange request
+MAX_CONCURRENT_REQUESTS = 5  # Maximum number of concurrent kline requests per download
+EXCHANGE_REQUESTS_PER_SECOND = 10  # Maximum kline requests started per second, per exchange
+
+
+class RequestRateLimiter:
+    """
+    Thread-safe limiter spacing out the start of requests to an exchange.
+    """
+
+    def __init__(self, requests_per_second: float) -> None:
+        self.min_interval = 1.0 / requests_per_second
+        self.next_request_time = 0.0
+        self.lock = threading.Lock()
+
+
+    def wait(self) -> None:
+        """
+        Blocks until a new request can be started.
+        """
+        with self.lock:
+            now = time.monotonic()
+            request_time = max(now, self.next_request_time)
+            self.next_request_time = request_time + self.min_interval
+        if request_time > now:
+            time.sleep(request_time - now)
+
+
+class KlineDBClient:
+    """
+    A persistent columnar store of historical klines, keyed by exchange, symbol and interval.
+
+    Each key is a directory holding the klines in segment files, plus a coverage file with the time ranges already
+    downloaded. A segment covers SEGMENT_KLINES consecutive kline slots aligned to the epoch, and holds the klines
+    stored in that span as one NumPy record array sorted by open time. Writing new klines therefore only rewrites the
+    segments they fall in, whatever the size of the stored history, and each segment is replaced atomically with all
+    its fields. Reads are served from the memory-mapped segments overlapping the requested range, and only the ranges
+    missing from the coverage are downloaded from the exchange. Only closed klines are persisted, the kline that is
+    still open is always fetched from the exchange.
+    """
+
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+    _rate_limiters: Dict[str, RequestRateLimiter] = {}
+
+    def __init__(self, db_path_env: str = 'database/db_paths.env') -> None:
+        """
+        Initializes the store.
+
+        :param db_path_env: Path to the environment file containing the store path.
+        """
+        load_dotenv(db_path_env)
+        self.db_path = os.getenv("KLINES_DB_PATH")
+        if not self.db_path:
+            raise ValueError("Klines store path not found in environment variables.")
+
+
+    def _get_key_path(self, exchange: str, symbol: str, interval: str) -> str:
+        return os.path.join(self.db_path, exchange, symbol.upper(), interval)
+
+
+    def _get_lock(self, key_path: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key_path, threading.Lock())
+
+
+    @classmethod
+    def _get_rate_limiter(cls, exchange: str) -> RequestRateLimiter:
+        with cls._locks_guard:
+            return cls._rate_limiters.setdefault(exchange, RequestRateLimiter(EXCHANGE_REQUESTS_PER_SECOND))
+
+
+    @staticmethod
+    def _merge_ranges(ranges: List[Tuple[int, int]], step: int) -> List[Tuple[int, int]]:
+        """
+        Merges overlapping or adjacent (closer than a kline) time ranges.
+        """
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + step:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+
+    def _read_coverage(self, key_path: str) -> List[Tuple[int, int]]:
+        coverage_file = os.path.join(key_path, "coverage.json")
+        if not os.path.exists(coverage_file):
+            return []
+        with open(coverage_file, "r") as f:
+            return [tuple(time_range) for time_range in json.load(f)]
+
+
+    @staticmethod
+    def _get_segment_path(key_path: str, segment: int) -> str:
+        return os.path.join(key_path, f"segment_{segment}.npy")
+
+
+    def _read_columns(self, key_path: str, start_time: int, end_time: int, step: int) -> Dict[str, np.ndarray]:
+        """
+        Reads the stored klines with open time in [start_time, end_time] from the memory-mapped segments.
+        """
+        segment_span = SEGMENT_KLINES * step
+        parts = []
+        for segment in range(max(start_time, 0) // segment_span, max(end_time, 0) // segment_span + 1):
+            segment_path = self._get_segment_path(key_path, segment)
+            if not os.path.exists(segment_path):
+                continue
+            records = np.load(segment_path, mmap_mode="r")
+            first = int(np.searchsorted(records["open_time"], start_time, side="left"))
+            last = int(np.searchsorted(records["open_time"], end_time, side="right"))
+            parts.append(np.array(records[first:last]))
+            del records
+        records = np.concatenate(parts) if parts else np.empty(0, dtype=KLINE_DTYPE)
+        return {field: records[field] for field in KLINE_FIELDS}
+
+
+    def _write(self, key_path: str, klines: List[Dict[str, Any]], covered_ranges: List[Tuple[int, int]], step: int) -> None:
+        """
+        Merges new klines and covered ranges into the stored ones. Each segment the new klines fall in is rewritten
+        to a temporary file and atomically moved in place, and the coverage last, so a crash never leaves a partly
+        written segment nor marks missing klines as covered.
+        """
+        os.makedirs(key_path, exist_ok=True)
+
+        if klines:
+            new = np.array([tuple(kline[field] for field in KLINE_FIELDS) for kline in klines], dtype=KLINE_DTYPE)
+            segments = new["open_time"] // (SEGMENT_KLINES * step)
+            for segment in np.unique(segments):
+                segment_path = self._get_segment_path(key_path, int(segment))
+                stored = np.load(segment_path) if os.path.exists(segment_path) else np.empty(0, dtype=KLINE_DTYPE)
+                # New klines first, so they replace the stored ones with the same open time
+                merged = np.concatenate((new[segments == segment], stored))
+                _, unique_index = np.unique(merged["open_time"], return_index=True)
+                temporary_path = os.path.join(key_path, f"segment_{segment}.tmp.npy")
+                np.save(temporary_path, merged[unique_index])
+                os.replace(temporary_path, segment_path)
+
+        coverage = self._merge_ranges(self._read_coverage(key_path) + covered_ranges, step)
+        with open(os.path.join(key_path, "coverage.tmp.json"), "w") as f:
+            json.dump(coverage, f)
+        os.replace(os.path.join(key_path, "coverage.tmp.json"), os.path.join(key_path, "coverage.json"))
+
+
+    def find_missing_ranges(self, exchange: str, symbol: str, interval: str, start_time: int, end_time: int) -> List[Tuple[int, int]]:
+        """
+        Finds the time ranges in [start_time, end_time] that have not been downloaded yet.
+
+        :param exchange: The exchange name.
+        :param symbol: The trading pair symbol.
+        :param interval: The klines interval.
+        :param start_time: Range start, Unix timestamp in milliseconds.
+        :param end_time: Range end, Unix timestamp in milliseconds.
+        :return: The missing ranges as (start_time, end_time) tuples, aligned to the interval.
+        """
+        step = INTERVAL_MS[interval]
+        start_time = start_time - start_time % step  # open time of the kline containing start_time
+        key_path = self._get_key_path(exchange, symbol, interval)
+        missing = []
+        cursor = start_time
+        for covered_start, covered_end in self._read_coverage(key_path):
+            if covered_end < cursor:
+                continue
+            if covered_start > end_time:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start - 1))
+            cursor = max(cursor, covered_end + 1)
+        if cursor <= end_time:
+            missing.append((cursor, end_time))
+        return missing
+
+
+    @classmethod
+    def fetch_ranges(cls, exchange_client: Any, symbol: str, interval: str, time_ranges: List[Tuple[int, int]]) -> Tuple[List[Dict[str, Any]], List[Tuple[int, int]]]:
+        """
+        Downloads the klines with open time in the given ranges.
+
+        Each range is split into pages of EXCHANGE_KLINES_LIMIT klines, which are fetched concurrently
+        (at most MAX_CONCURRENT_REQUESTS at a time, EXCHANGE_REQUESTS_PER_SECOND per exchange).
+
+        :param exchange_client: The exchange client (ExchangeAPIClient).
+        :param symbol: The trading pair symbol.
+        :param interval: The klines interval.
+        :param time_ranges: The (start_time, end_time) ranges, Unix timestamps in milliseconds.
+        :return: A tuple with the klines, sorted and unique by open time, and the ranges actually downloaded.
+            A page only covers its range up to its last kline, and not at all if it has none: the request may have
+            failed, or the exchange not have published the klines yet, so these ranges are requested again next time.
+        """
+        step = INTERVAL_MS[interval]
+        page_span = EXCHANGE_KLINES_LIMIT * step
+        pages = [(page_start, min(page_start + page_span - 1, end_time))
+                 for start_time, end_time in time_ranges for page_start in range(start_time, end_time + 1, page_span)]
+        if not pages:
+            return [], []
+
+        rate_limiter = cls._get_rate_limiter(exchange_client.name)
+
+        def fetch_page(page: Tuple[int, int]) -> Optional[List[Dict[str, Any]]]:
+            rate_limiter.wait()
+            return exchange_client.get_klines(symbol, interval, limit=EXCHANGE_KLINES_LIMIT, start_time=page[0], end_time=page[1])
+
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(pages))) as executor:
+            results = list(executor.map(fetch_page, pages))
+
+        klines, downloaded_ranges = {}, []
+        for (page_start, page_end), page_klines in zip(pages, results):
+            page_klines = [kline for kline in page_klines or [] if page_start <= kline["open_time"] <= page_end]
+            if not page_klines:  # request failed or no kline returned
+                continue
+            for kline in page_klines:
+                klines[kline["open_time"]] = kline  # de-duplicates by open time
+            last_open_time = max(int(kline["open_time"]) for kline in page_klines)
+            downloaded_ranges.append((page_start, min(page_end, last_open_time + step - 1)))
+        return [klines[open_time] for open_time in sorted(klines)], downloaded_ranges
+
+
+    def get_klines_frame(self, exchange_client: Any, symbol: str, interval: str, start_time: int, end_time: int = None) -> pd.DataFrame:
+        """
+        Returns the klines with open time in [start_time, end_time], downloading only the ranges missing from the store.
+
+        :param exchange_client: The exchange client (ExchangeAPIClient) used to download missing klines.
+        :param symbol: The trading pair symbol.
+        :param interval: The klines interval.
+        :param start_time: Range start, Unix timestamp in milliseconds.
+        :param end_time: Range end, Unix timestamp in milliseconds. Defaults to now.
+        :return: A DataFrame with one row per kline, sorted by open time, in the exchange client get_klines format.
+        """
+        now = int(time.time() * 1000)
+        end_time = now if end_time is None else min(end_time, now)
+
+        if interval not in INTERVAL_MS:  # not stored, e.g. 1w, 1M
+            klines = exchange_client.get_klines(symbol, interval, limit=EXCHANGE_KLINES_LIMIT, start_time=start_time, end_time=end_time)
+            return pd.DataFrame(klines or [], columns=list(KLINE_FIELDS))
+
+        step = INTERVAL_MS[interval]
+        last_closed_end = now - now % step - 1  # the kline opened at now - now % step is still open
+        key_path = self._get_key_path(exchange_client.name, symbol, interval)
+
+        with self._get_lock(key_path):
+            closed_end = min(end_time, last_closed_end)
+            if start_time <= closed_end:
+                missing_ranges = self.find_missing_ranges(exchange_client.name, symbol, interval, start_time, closed_end)
+                new_klines, covered_ranges = self.fetch_ranges(exchange_client, symbol, interval, missing_ranges)
+                if new_klines or covered_ranges:
+                    self._write(key_path, new_klines, covered_ranges, step)
+            columns = self._read_columns(key_path, start_time, closed_end, step)
+
+        data = pd.DataFrame(columns)
+        if end_time > last_closed_end:  # append the open kline, without storing it
+            open_klines, _ = self.fetch_ranges(exchange_client, symbol, interval, [(max(start_time, last_closed_end + 1), end_time)])
+            if open_klines:
+                data = pd.concat([data, pd.DataFrame(open_klines, columns=list(KLINE_FIELDS))], ignore_index=True)
+                data = data.drop_duplicates(subset="open_time", keep="last").reset_index(drop=True)
+        return data
+
+
+    def get_klines(self, exchange_client: Any, symbol: str, interval: str, start_time: int, end_time: int = None) -> List[Dict[str, Any]]:
+        """
+        Same as get_klines_frame, but returns the klines as a list of dictionaries, like ExchangeAPIClient.get_klines.
+        """
+        return self.get_klines_frame(exchange_client, symbol, interval, start_time, end_time).to_dict(orient="records")
+
+
+    def get_latest_klines(self, exchange_client: Any, symbol: str, interval: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Returns the latest :limit: klines (the last one being the open kline), like ExchangeAPIClient.get_klines
+        without start time.
+        """
+        if interval not in INTERVAL_MS:
+            return exchange_client.get_klines(symbol, interval, limit=limit)
+        now = int(time.time() * 1000)
+        step = INTERVAL_MS[interval]
+        start_time = now - now % step - (limit - 1) * step
+        return self.get_klines_frame(exchange_client, symbol, interval, start_time, now).tail(limit).to_dict(orient="records")
@@ -1,15 +1,62 @@
-from tinydb import TinyDB, Query
-from datetime import datetime
 from dotenv import load_dotenv
+import sqlite3
+import threading
+import json
 import os
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set, Tuple
+
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+LOG_FIELDS = ["strategy_id", "timestamp", "price", "slippage", "order"]
+LOGS_PAGE_SIZE = 1000  # Default number of logs per page of get_logs_page
+MAX_LOGS_PAGE_SIZE = 10000
+STRATEGY_FIELDS = ["strategy_id", "quote_asset", "base_asset", "quote_amount", "time_interval", "trades_limit", "strategy_name", "created_at"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY,
+    strategy_id TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    price REAL,
+    slippage REAL,
+    "order" TEXT
+);
+CREATE INDEX IF NOT EXISTS logs_strategy_timestamp ON logs (strategy_id, timestamp);
+CREATE INDEX IF NOT EXISTS logs_strategy_id ON logs (strategy_id);
+CREATE TABLE IF NOT EXISTS strategies (
+    id INTEGER PRIMARY KEY,
+    strategy_id TEXT NOT NULL,
+    quote_asset TEXT,
+    base_asset TEXT,
+    quote_amount REAL,
+    time_interval TEXT,
+    trades_limit INTEGER,
+    strategy_name TEXT,
+    created_at INTEGER
+);
+CREATE INDEX IF NOT EXISTS strategies_strategy_id ON strategies (strategy_id);
+"""
 
 
 class StrategyDBClient:
     """
-    A class to interact with the TinyDB database for storing and retrieving strategy results.
+    A class to interact with the SQLite database for storing and retrieving strategy results.
+
+    The database runs in WAL mode, so that a log insert appends to the write-ahead log instead of rewriting the
+    database, and the API can read the logs while the strategies write them. The logs are indexed on
+    (strategy_id, timestamp), so the log queries of a strategy only read its rows in the requested time range.
+    The log ids increase with the inserts, and serve as the cursors of the incremental log reads (`get_logs_page`),
+    indexed on (strategy_id, id).
+    Each thread uses its own connection, as the logs are written by the scheduler workers and read by the API.
+
+    A strategy database still in the former TinyDB (JSON) format is migrated once, the first time it is opened,
+    and kept next to it as `<path>.tinydb.json`.
     """
 
+    _initialized_paths: Set[str] = set()
+    _init_lock = threading.Lock()
+    _local = threading.local()
+
     def __init__(self, db_path_env: str = 'database/db_paths.env') -> None:
         """
         Initializes the database connection.
@@ -20,9 +67,86 @@ class StrategyDBClient:
         db_path = os.getenv("STRATEGY_DB_PATH")
         if not db_path:
             raise ValueError("Database path not found in environment variables.")
-        self.db = TinyDB(db_path) # will be created if it doesnt exist
-        self.logs_table = self.db.table("logs")
-        self.metadata_table = self.db.table("strategies")
+        self.db_path = os.path.abspath(db_path)
+        with self._init_lock:
+            if self.db_path not in self._initialized_paths:
+                self._initialize_db()
+                self._initialized_paths.add(self.db_path)
+
+
+    def _initialize_db(self) -> None:
+        """
+        Creates the database (if it doesn't exist) and its tables, migrating a TinyDB database first.
+        """
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        if self.is_tinydb_file(self.db_path):
+            self.migrate_from_tinydb(self.db_path, self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")  # persistent, set once for the database file
+        conn.executescript(SCHEMA)
+        conn.close()
+
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """
+        The connection of the current thread to the database.
+        """
+        connections = self._local.__dict__.setdefault("connections", {})
+        conn = connections.get(self.db_path)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute("PRAGMA synchronous=NORMAL")  # in WAL mode, commits are not fsynced, only the checkpoints
+            connections[self.db_path] = conn
+        return conn
+
+
+    @staticmethod
+    def is_tinydb_file(db_path: str) -> bool:
+        """
+        Checks whether a database file is a TinyDB (JSON) file, i.e., a non-empty file without the SQLite header.
+
+        :param db_path: Path to the database file.
+        :return: True if the file must be migrated.
+        """
+        if not os.path.isfile(db_path) or os.path.getsize(db_path) == 0:
+            return False
+        with open(db_path, "rb") as f:
+            return f.read(len(SQLITE_HEADER)) != SQLITE_HEADER
+
+
+    @staticmethod
+    def migrate_from_tinydb(tinydb_path: str, db_path: str) -> Dict[str, int]:
+        """
+        Migrates the strategies and logs of a TinyDB database to a new SQLite database, in insertion order.
+        The SQLite database is written next to the target and only moved in place once complete. If the TinyDB file
+        is the target itself, it is kept as `<db_path>.tinydb.json`.
+
+        :param tinydb_path: Path to the TinyDB (JSON) database file.
+        :param db_path: Path to the SQLite database to create.
+        :return: The number of migrated "strategies" and "logs".
+        """
+        with open(tinydb_path, "r") as f:
+            tables = json.load(f)
+        # TinyDB tables are {document_id: document}, ordered by insertion
+        strategies = [[document.get(field) for field in STRATEGY_FIELDS] for document in tables.get("strategies", {}).values()]
+        logs = [[document.get(field) for field in LOG_FIELDS] for document in tables.get("logs", {}).values()]
+
+        migrating_path = f"{db_path}.migrating"
+        if os.path.exists(migrating_path):
+            os.remove(migrating_path)
+        conn = sqlite3.connect(migrating_path)
+        conn.executescript(SCHEMA)
+        with conn:
+            conn.executemany(f"INSERT INTO strategies ({', '.join(STRATEGY_FIELDS)}) VALUES ({', '.join('?' * len(STRATEGY_FIELDS))})", strategies)
+            conn.executemany("INSERT INTO logs (strategy_id, timestamp, price, slippage, \"order\") VALUES (?, ?, ?, ?, ?)", logs)
+        conn.close()
+
+        if os.path.abspath(tinydb_path) == os.path.abspath(db_path):
+            os.replace(tinydb_path, f"{db_path}.tinydb.json")
+        os.replace(migrating_path, db_path)
+        print(f"StrategyDBClient :: migrate_from_tinydb :: Migrated {len(strategies)} strategies and {len(logs)} logs to {db_path}.")
+        return {"strategies": len(strategies), "logs": len(logs)}
 
 
     def add_strategy(self, strategy_id: str, quote_asset: str, base_asset: str, quote_amount: float, time_interval: str, trades_limit: int, strategy_name: str, created_at: int ) -> None:
@@ -38,16 +162,9 @@ class StrategyDBClient:
         :param strategy_name: The name of the strategy.
         :param created_at: The time the strategy was created.
         """
-        self.metadata_table.insert({
-            "strategy_id": strategy_id,
-            "quote_asset": quote_asset,
-            "base_asset": base_asset,
-            "quote_amount": quote_amount,
-            "time_interval": time_interval,
-            "trades_limit": trades_limit,
-            "strategy_name": strategy_name,
-            "created_at": created_at
-        })
+        with self.conn:
+            self.conn.execute(f"INSERT INTO strategies ({', '.join(STRATEGY_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                              (strategy_id, quote_asset, base_asset, quote_amount, time_interval, trades_limit, strategy_name, created_at))
 
 
     def add_log(self, strategy_id: str, timestamp: int, price: float, slippage: float, order: str) -> None:
@@ -60,57 +177,73 @@ class StrategyDBClient:
         :param slippage: Slippage of the Order (Order Price - Price which was used to make the decision.).
         :param order: Type of order executed (e.g., 'buy', 'sell').
         """
-        self.logs_table.insert({
-            "strategy_id": strategy_id,
-            "timestamp": timestamp,
-            "price": price,
-            "slippage": slippage,
-            "order": order,
-        })
-
-
-    # def get_logs(self, strategy_id: str, timestamp: Optional[str] = None) -> List[Dict[str, Any]]:
-    #     """
-    #     Retrieves strategy results. If a timestamp is provided, it returns all results from that timestamp onward.
-    #
-    #     :param strategy_name: The name of the strategy to query.
-    #     :param timestamp: An optional timestamp string (ISO format). If provided, results are filtered accordingly.
-    #     :return: A list of strategy records.
-    #     """
-    #     logs = Query()
-    #     results = self.logs_table.search(logs.strategy_id == strategy_id)
-    #
-    #     if timestamp:
-    #         try:
-    #             timestamp_dt = datetime.fromisoformat(timestamp)
-    #             results = [r for r in results if datetime.fromisoformat(r["timestamp"]) > timestamp_dt]
-    #         except ValueError:
-    #             raise ValueError("Invalid timestamp format. Use ISO 8601 format.")
-    #
-    #     return results
-
-    def get_logs(self, strategy_id: str, timestamp: Optional[int] = None) -> List[Dict[str, Any]]:
-        """
-        Retrieves strategy results. If a timestamp is provided, it returns all results from that timestamp onward.
+        with self.conn:
+            self.conn.execute("INSERT INTO logs (strategy_id, timestamp, price, slippage, \"order\") VALUES (?, ?, ?, ?, ?)",
+                              (strategy_id, timestamp, price, slippage, order))
+
+
+    def add_logs(self, logs: List[Tuple[str, int, float, float, str]]) -> None:
+        """
+        Adds many log entries in a single transaction (one commit), e.g. the batches of the StrategyLogWriter.
+
+        :param logs: The (strategy_id, timestamp, price, slippage, order) log entries.
+        """
+        with self.conn:
+            self.conn.executemany("INSERT INTO logs (strategy_id, timestamp, price, slippage, \"order\") VALUES (?, ?, ?, ?, ?)", logs)
+
+
+    def get_logs(self, strategy_id: str, timestamp: Optional[int] = None, end_timestamp: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Retrieves strategy results, in time order. If a timestamp is provided, it returns all results from that timestamp onward.
 
         :param strategy_id: The ID of the strategy to query.
-        :param timestamp: An optional Unix timestamp (float, int). If provided, results are filtered accordingly.
+        :param timestamp: An optional Unix timestamp (float, int). If provided, only the results after it are returned.
+        :param end_timestamp: An optional Unix timestamp (float, int). If provided, only the results up to it (included) are returned.
+        :param limit: An optional maximum number of results, the earliest ones are returned.
         :return: A list of strategy records.
         """
-        logs = Query()
-        results = self.logs_table.search(logs.strategy_id == strategy_id)
+        for bound in (timestamp, end_timestamp):
+            if bound is not None and (isinstance(bound, bool) or not isinstance(bound, (int, float))):
+                raise ValueError("Invalid timestamp format. Use a Unix timestamp (int or float).")
 
+        query = "SELECT strategy_id, timestamp, price, slippage, \"order\" FROM logs WHERE strategy_id = ?"
+        params = [strategy_id]
         if timestamp:
-            try:
-                # Ensure timestamp is a number
-                if not isinstance(timestamp, (int, float)):
-                    raise ValueError("Timestamp must be a Unix timestamp (int or float).")
+            query += " AND timestamp > ?"
+            params.append(timestamp)
+        if end_timestamp is not None:
+            query += " AND timestamp <= ?"
+            params.append(end_timestamp)
+        query += " ORDER BY timestamp, id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
 
-                results = [r for r in results if r["timestamp"] > timestamp]
-            except (ValueError, TypeError):
-                raise ValueError("Invalid timestamp format. Use a Unix timestamp (int or float).")
+        rows = self.conn.execute(query, params).fetchall()
+        return [dict(zip(LOG_FIELDS, row)) for row in rows]
+
+
+    def get_logs_page(self, strategy_id: str, cursor: int = 0, limit: int = LOGS_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        Retrieves the strategy results inserted after a cursor, in insertion order, e.g. the new results since the
+        last read. The cost only depends on the number of results returned, not on the size of the history.
+
+        :param strategy_id: The ID of the strategy to query.
+        :param cursor: The cursor returned by the previous read, 0 to read from the first result.
+        :param limit: The maximum number of results, between 1 and MAX_LOGS_PAGE_SIZE.
+        :return: A dictionary with the "logs" (strategy records, with their "log_id"), the "cursor" to pass to the
+            next read, and "has_more", whether more results are available after this page.
+        """
+        if isinstance(cursor, bool) or not isinstance(cursor, int) or cursor < 0:
+            raise ValueError("The cursor must be a non-negative integer.")
+        if not 1 <= limit <= MAX_LOGS_PAGE_SIZE:
+            raise ValueError(f"The page size must be between 1 and {MAX_LOGS_PAGE_SIZE}.")
+
+        rows = self.conn.execute("SELECT id, strategy_id, timestamp, price, slippage, \"order\" FROM logs WHERE strategy_id = ? AND id > ? ORDER BY id LIMIT ?",
+                                 (strategy_id, cursor, limit + 1)).fetchall()
+        logs = [dict(zip(["log_id"] + LOG_FIELDS, row)) for row in rows[:limit]]
+        return {"logs": logs, "cursor": logs[-1]["log_id"] if logs else cursor, "has_more": len(rows) > limit}
 
-        return results
 
     def get_latest_log_price(self, strategy_name: str) -> Optional[float]:
         """
@@ -119,17 +252,16 @@ class StrategyDBClient:
         :param strategy_name: The name of the strategy to query.
         :return: The latest price if available, otherwise None.
         """
-        results = self.get_logs(strategy_name)
-        return results[-1]["price"] if results else None
+        row = self.conn.execute("SELECT price FROM logs WHERE strategy_id = ? ORDER BY timestamp DESC, id DESC LIMIT 1", (strategy_name,)).fetchone()
+        return row[0] if row else None
 
 
     def get_strategy_metadata(self, strategy_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieves metadata for a strategy.
         """
-        strategy = Query()
-        results = self.metadata_table.search(strategy.strategy_id == strategy_id)
-        return results[0] if results else None
+        row = self.conn.execute(f"SELECT {', '.join(STRATEGY_FIELDS)} FROM strategies WHERE strategy_id = ? ORDER BY id LIMIT 1", (strategy_id,)).fetchone()
+        return dict(zip(STRATEGY_FIELDS, row)) if row else None
 
 
     def get_all_strategies(self) -> List[Dict[str, Any]]:
@@ -138,5 +270,5 @@ class StrategyDBClient:
 
         :return: A list of dictionaries containing strategy metadata.
         """
-
-        return self.metadata_table.all()
+        rows = self.conn.execute(f"SELECT {', '.join(STRATEGY_FIELDS)} FROM strategies ORDER BY id").fetchall()
+        return [dict(zip(STRATEGY_FIELDS, row)) for row in rows]
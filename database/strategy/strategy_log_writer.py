@@ -0,0 +1,266 @@
+from database.strategy.strategy_db_client import StrategyDBClient
+from typing import Any, AsyncIterator, Dict, List, Tuple
+import threading
+import asyncio
+import atexit
+import queue
+import time
+
+
+LOG_QUEUE_SIZE = 10000  # Maximum number of logs waiting to be written, add_log blocks when the queue is full
+LOG_BATCH_SIZE = 500  # Maximum number of logs written in one commit
+LOG_FLUSH_INTERVAL = 0.1  # Maximum seconds a log waits for its batch to fill up
+LOG_WRITE_RETRIES = 3  # Retries of a failed batch commit, before writing its logs one by one
+LOG_RETRY_DELAY = 0.05  # Seconds waited before the first retry, doubled on each retry
+
+
+class _FlushMarker:
+    """
+    Queued by `flush`, set by the writer thread once the logs queued before it are written.
+    """
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.failed_logs = 0
+
+
+class StrategyLogWriter:
+    """
+    Background writer of the strategy logs, one per database and process.
+
+    The strategies only put their logs in a bounded queue, so that the strategy ticks do not wait on the disk.
+    A writer thread takes the logs of all the running strategies off the queue and inserts them in group commits,
+    once LOG_BATCH_SIZE logs are waiting or LOG_FLUSH_INTERVAL seconds after the first one. When the disk does not
+    keep up, the queue fills up and add_log blocks, so that the memory stays bounded and no log is dropped.
+
+    A failed batch commit (e.g. a locked database) is retried with an exponential backoff. If it still fails, its
+    logs are written one by one, so that only the logs that cannot be written are lost. The failed logs are counted
+    and reported by the next `flush`.
+
+    `flush` waits until the logs added before it are written. It is called when a strategy is stopped, and
+    `close_all` flushes and stops the writers at shutdown (also registered at interpreter exit).
+
+    The readers following the logs of a strategy (`follow_async`, e.g. the SSE endpoint) are woken up through their
+    event loop after each written batch, so that the new logs are pushed to them as soon as they are in the database,
+    without polling it and without holding a thread while waiting.
+    """
+
+    _writers: Dict[str, "StrategyLogWriter"] = {}
+    _writers_lock = threading.Lock()
+    _stop = object()  # queue sentinel stopping the writer thread
+
+    def __init__(self, db_client: StrategyDBClient, max_queue_size: int = LOG_QUEUE_SIZE, batch_size: int = LOG_BATCH_SIZE,
+                 flush_interval: float = LOG_FLUSH_INTERVAL, write_retries: int = LOG_WRITE_RETRIES,
+                 retry_delay: float = LOG_RETRY_DELAY) -> None:
+        """
+        Starts the writer thread.
+
+        :param db_client: The client of the database the logs are written to.
+        :param max_queue_size: The maximum number of logs waiting to be written.
+        :param batch_size: The maximum number of logs written in one commit.
+        :param flush_interval: The maximum seconds a log waits for its batch to fill up.
+        :param write_retries: The retries of a failed batch commit, before writing its logs one by one.
+        :param retry_delay: The seconds waited before the first retry, doubled on each retry.
+        """
+        self.db_client = db_client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.write_retries = write_retries
+        self.retry_delay = retry_delay
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.lock = threading.Lock()
+        self.is_running = True
+        self.batches_written = 0
+        self.failed_logs = 0  # logs that could not be written, since the start
+        self._failed_since_flush = 0  # reported by the next flush, only accessed by the writer thread
+        self.written = threading.Lock()  # guards batches_written and the waiters
+        self._async_waiters: Dict[asyncio.Event, asyncio.AbstractEventLoop] = {}  # set after each written batch
+        self.thread = threading.Thread(target=self._run, name="strategy-log-writer", daemon=True)
+        self.thread.start()
+
+
+    @classmethod
+    def get_writer(cls, db_client: StrategyDBClient) -> "StrategyLogWriter":
+        """
+        Returns the writer of the database of a client, starting it on first use.
+
+        :param db_client: A client of the database the logs are written to.
+        :return: The log writer of the database.
+        """
+        with cls._writers_lock:
+            writer = cls._writers.get(db_client.db_path)
+            if writer is None:
+                writer = cls(db_client)
+                cls._writers[db_client.db_path] = writer
+            return writer
+
+
+    @classmethod
+    def close_all(cls) -> None:
+        """
+        Flushes and stops all the writers.
+        """
+        with cls._writers_lock:
+            writers = list(cls._writers.values())
+            cls._writers.clear()
+        for writer in writers:
+            writer.close()
+
+
+    def add_log(self, strategy_id: str, timestamp: int, price: float, slippage: float, order: str) -> None:
+        """
+        Queues a log entry to be written (see StrategyDBClient.add_log). Once the writer is closed, the log is
+        written synchronously.
+
+        :param strategy_id: Unique identifier for the trading strategy.
+        :param timestamp: Unix timestamp of the log entry.
+        :param price: Price at the time of logging.
+        :param slippage: Slippage of the Order (Order Price - Price which was used to make the decision.).
+        :param order: Type of order executed (e.g., 'buy', 'sell').
+        """
+        with self.lock:
+            if self.is_running:
+                self.queue.put((strategy_id, timestamp, price, slippage, order))
+                return
+        self.db_client.add_log(strategy_id, timestamp, price, slippage, order)
+
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Waits until the logs added so far are written.
+
+        :param timeout: The maximum seconds to wait, unbounded if None.
+        :return: True if the logs were written, False on timeout or if logs failed to be written since the
+            previous flush.
+        """
+        flushed = _FlushMarker()
+        with self.lock:
+            if not self.is_running:
+                return True
+            self.queue.put(flushed)
+        return flushed.event.wait(timeout) and flushed.failed_logs == 0
+
+
+    def close(self) -> None:
+        """
+        Writes the queued logs and stops the writer thread.
+        """
+        with self.lock:
+            if not self.is_running:
+                return
+            self.is_running = False
+            self.queue.put(self._stop)
+        self.thread.join()
+
+
+    async def wait_for_write_async(self, batches_written: int, timeout: float) -> int:
+        """
+        Waits until a batch is written after the given number of batches, in the event loop instead of blocking a thread.
+
+        :param batches_written: The number of batches written when the caller last read the logs.
+        :param timeout: The maximum seconds to wait.
+        :return: The number of batches written so far.
+        """
+        written = asyncio.Event()
+        with self.written:
+            if self.batches_written > batches_written:
+                return self.batches_written
+            self._async_waiters[written] = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(written.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self.written:
+                self._async_waiters.pop(written, None)
+        return self.batches_written
+
+
+    async def follow_async(self, strategy_id: str, cursor: int = 0, timeout: float = 15.0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Follows the logs of a strategy: yields the pages of logs after the cursor (see StrategyDBClient.get_logs_page)
+        as they are written. The first page is always yielded, and then an empty page whenever no log was written for
+        `timeout` seconds, so that the caller can check the strategy is still running or keep its connection alive.
+        The pages are read in the default executor of the event loop and the writes are awaited without holding a
+        thread, so that the followers do not starve the worker threads of the server.
+
+        :param strategy_id: The ID of the strategy.
+        :param cursor: The cursor to follow the logs from, 0 for all the logs of the strategy.
+        :param timeout: The maximum seconds between two pages.
+        :return: An async iterator over the pages of logs.
+        """
+        last_page_time = time.monotonic() - timeout  # the first page is always yielded
+        while True:
+            batches_written = self.batches_written
+            page = await asyncio.to_thread(self.db_client.get_logs_page, strategy_id, cursor)
+            cursor = page["cursor"]
+            if page["logs"] or time.monotonic() - last_page_time >= timeout:
+                yield page
+                last_page_time = time.monotonic()
+            if not page["has_more"]:
+                # Woken up by the batches of every strategy, until the timeout
+                await self.wait_for_write_async(batches_written, max(0.0, last_page_time + timeout - time.monotonic()))
+
+
+    def _write(self, batch: List[Tuple[str, int, float, float, str]]) -> None:
+        """
+        Writes a batch in one commit, retrying with a backoff on failure, and then one log at a time.
+        """
+        for retry in range(self.write_retries + 1):
+            try:
+                self.db_client.add_logs(batch)
+                break
+            except Exception as e:
+                print(f"StrategyLogWriter :: _write :: Failed to write {len(batch)} logs (attempt {retry + 1}) ::", e)
+                if retry < self.write_retries:
+                    time.sleep(self.retry_delay * 2 ** retry)
+        else:
+            for log in batch:
+                try:
+                    self.db_client.add_log(*log)
+                except Exception as e:
+                    print(f"StrategyLogWriter :: _write :: Failed to write log {log} ::", e)
+                    self.failed_logs += 1
+                    self._failed_since_flush += 1
+
+        with self.written:
+            self.batches_written += 1
+            for written, loop in self._async_waiters.items():
+                loop.call_soon_threadsafe(written.set)
+
+
+    def _run(self) -> None:
+        """
+        The writer thread. Collects the queued logs into batches and writes each batch in one commit.
+        """
+        while True:
+            item = self.queue.get()
+            batch, flushed, stop = [], [], False
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is self._stop:
+                    stop = True
+                    break
+                if isinstance(item, _FlushMarker):  # write the batch now
+                    flushed.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(batch)
+            for marker in flushed:
+                marker.failed_logs = self._failed_since_flush
+                marker.event.set()
+            if flushed:
+                self._failed_since_flush = 0
+            if stop:
+                return
+
+
+atexit.register(StrategyLogWriter.close_all)
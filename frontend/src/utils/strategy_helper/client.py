@@ -1,5 +1,6 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator, Tuple
 import requests
+import json
 from frontend.config.config import BACKEND_SERVER_ADDRESS
 from streamlit import cache_data
 
@@ -69,6 +70,42 @@ def get_strategy_logs(strategy_id: str, from_timestamp: int = None):
         return None
 
 
+def get_strategy_logs_page(strategy_id: str, cursor: int = 0, limit: int = 1000) -> Dict[str, Any] | None:
+
+    url = f"{BACKEND_SERVER_ADDRESS}/broker/strategy/logs/page?strategy_id={strategy_id}&cursor={cursor}&limit={limit}"
+
+    response = requests.get(url=url)
+    if response.status_code == 200:
+        return response.json()
+    else:
+        return None
+
+
+def stream_strategy_logs(strategy_id: str, cursor: int = 0) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Follows the Server-Sent Events log stream of a strategy.
+
+    Yields:
+        Tuple[int, List[Dict[str, Any]]]: The cursor and the new logs of each "logs" event, until the strategy stops.
+    """
+    url = f"{BACKEND_SERVER_ADDRESS}/broker/strategy/logs/stream?strategy_id={strategy_id}&cursor={cursor}"
+
+    with requests.get(url=url, stream=True, timeout=(5, 60)) as response:
+        if response.status_code != 200:
+            return
+        event = {}
+        for line in response.iter_lines(decode_unicode=True):
+            if line:  # event fields, comments (keep-alive) start with ':'
+                field, _, value = line.partition(":")
+                event[field] = value.lstrip()
+                continue
+            if event.get("event") == "end":
+                return
+            if event.get("event") == "logs":
+                yield int(event["id"]), json.loads(event["data"])
+            event = {}
+
+
 def get_strategy_evaluation(strategy_id: str) -> Dict[str, Any] | None:
 
     url = f"{BACKEND_SERVER_ADDRESS}/broker/strategy/evaluation?strategy_id={strategy_id}"
@@ -80,6 +117,17 @@ def get_strategy_evaluation(strategy_id: str) -> Dict[str, Any] | None:
         return None
 
 
+def get_strategy_metrics(strategy_id: str) -> Dict[str, Any] | None:
+
+    url = f"{BACKEND_SERVER_ADDRESS}/broker/strategy/metrics?strategy_id={strategy_id}"
+
+    response = requests.get(url=url)
+    if response.status_code == 200:
+        return response.json()
+    else:
+        return None
+
+
 @cache_data(ttl=100000)
 def get_available_strategies() -> List[str]:
 
@@ -3,7 +3,12 @@ import time
 import plotly.graph_objs as go
 import numpy as np
 import pandas as pd
-from frontend.src.utils.strategy_helper.client import get_strategy_logs, get_strategy_evaluation
+from frontend.src.utils.strategy_helper.client import get_strategy_logs_page, stream_strategy_logs, get_strategy_evaluation, get_strategy_metrics
+from frontend.src.utils.strategy_helper.live_chart import LiveStrategyChartData, ORDER_SERIES
+import requests
+
+
+LOGS_HISTORY_PAGE_SIZE = 10000  # logs per request when loading the history of the live chart
 
 
 # Function to generate a random initial DataFrame
@@ -13,78 +18,56 @@ def generate_random_df(size=50):
     orders = np.random.choice(["BUY", "SELL", "HOLD"], size=size)
     return pd.DataFrame({"timestamp": timestamps, "price": prices, "order": orders})
 
-def update_logs(strategy_id: str, last_timestamp: int):
-
-    logs = get_strategy_logs(strategy_id, last_timestamp)  # df_to_show["strategy_id"].iloc[0])
-    if logs is None or len(logs) == 0:
-        return None
-
-    logs_df = pd.DataFrame(logs)
-    logs_df['timestamp'] = pd.to_datetime(logs_df['timestamp'], unit='ms')
-    return logs_df
-
 
 @st.fragment()
-def real_time_strategy_plot(df: pd.DataFrame, strategy_id: str, time_interval: str, show_invalid:bool):
-
-    time_interval_dict = {'1s': 5, '15s': 15, '1m': 60, '5m': 300, '15m': 900,
-                          '30m': 1800, '1h': 3600, '4h': 14400, '12h': 43200, '1d': 86400}
-    time_interval = time_interval_dict[time_interval]
+def real_time_strategy_plot(strategy_id: str, show_invalid: bool):
+    """
+    Live chart of a running strategy. The history is loaded page by page, then the new logs are pushed by the
+    backend log stream and appended to the chart series, which downsample the older logs (see LiveStrategyChartData),
+    so that each update costs time proportional to the new logs, not to the history.
+    """
+    chart_data = LiveStrategyChartData()
+    cursor = 0
+    has_more = True
+    while has_more:
+        page = get_strategy_logs_page(strategy_id, cursor, LOGS_HISTORY_PAGE_SIZE)
+        if page is None:
+            st.warning("Failed to load Strategy Logs", icon=":material/warning:")
+            return
+        chart_data.append(page["logs"])
+        cursor, has_more = page["cursor"], page["has_more"]
 
     # Create a placeholder for the Plotly chart
     chart = st.empty()
     # Initialize figure
     fig = go.Figure()
-
-    # Add initial traces
-    fig.add_trace(go.Scatter(x=df["timestamp"], y=df["price"], mode='lines', name='Price'))
-    fig.add_trace(go.Scatter(x=df[df["order"] == "BUY"]["timestamp"], y=df[df["order"] == "BUY"]["price"], mode='markers', marker=dict(color='green', size=12, symbol='triangle-up'), name='BUY'))
-    fig.add_trace(go.Scatter(x=df[df["order"] == "SELL"]["timestamp"], y=df[df["order"] == "SELL"]["price"], mode='markers', marker=dict(color='red', size=12, symbol='triangle-down'), name='SELL'))
+    fig.add_trace(go.Scatter(mode='lines', name='Price'))
+    fig.add_trace(go.Scatter(mode='markers', marker=dict(color='green', size=12, symbol='triangle-up'), name='BUY'))
+    fig.add_trace(go.Scatter(mode='markers', marker=dict(color='red', size=12, symbol='triangle-down'), name='SELL'))
     if show_invalid:
-        fig.add_trace(go.Scatter(x=df[df["order"] == "INVALID_BUY"]["timestamp"], y=df[df["order"] == "INVALID_BUY"]["price"], mode='markers', marker=dict(color='green', size=10, symbol='triangle-up-open'), name='Invalid BUY'))
-        fig.add_trace(go.Scatter(x=df[df["order"] == "INVALID_SELL"]["timestamp"], y=df[df["order"] == "INVALID_SELL"]["price"], mode='markers', marker=dict(color='red', size=10, symbol='triangle-down-open'), name='Invalid SELL'))
-
-    # Display the empty chart
-    chart.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
-
-    # Real-time update loop
+        fig.add_trace(go.Scatter(mode='markers', marker=dict(color='green', size=10, symbol='triangle-up-open'), name='Invalid BUY'))
+        fig.add_trace(go.Scatter(mode='markers', marker=dict(color='red', size=10, symbol='triangle-down-open'), name='Invalid SELL'))
+    orders = ORDER_SERIES if show_invalid else ORDER_SERIES[:2]
+
+    def draw():
+        with fig.batch_update():
+            fig.data[0].x, fig.data[0].y = chart_data.get_price_series()
+            for trace, order in enumerate(orders, start=1):
+                fig.data[trace].x, fig.data[trace].y = chart_data.get_marker_series(order)
+        chart.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+    draw()
+    # Real-time updates, pushed by the backend until the strategy stops
     while True:
-        upd_logs = update_logs(strategy_id, int(df['timestamp'].iloc[-1].timestamp() * 1000))
-        if upd_logs is not None:
-            df = pd.concat([df, upd_logs])
-            with fig.batch_update():
-                fig.data[0].x = df["timestamp"]  # Price line
-                fig.data[0].y = df["price"]
-
-                # Update BUY markers
-                fig.data[1].x = df[df["order"] == "BUY"]["timestamp"]
-                fig.data[1].y = df[df["order"] == "BUY"]["price"]
-
-                # Update SELL markers
-                fig.data[2].x = df[df["order"] == "SELL"]["timestamp"]
-                fig.data[2].y = df[df["order"] == "SELL"]["price"]
-
-                if show_invalid:
-                    # Update INVALID_BUY markers
-                    fig.data[3].x = df[df["order"] == "INVALID_BUY"]["timestamp"]
-                    fig.data[3].y = df[df["order"] == "INVALID_BUY"]["price"]
-
-                    # Update INVALID_SELL markers
-                    fig.data[4].x = df[df["order"] == "INVALID_SELL"]["timestamp"]
-                    fig.data[4].y = df[df["order"] == "INVALID_SELL"]["price"]
-
-            chart.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
-
-
-        progress_text = "Updating logs..."
-        my_bar = st.progress(0, text=progress_text)
-        for percent_complete in range(50):
-            time.sleep(time_interval/50)
-            my_bar.progress(percent_complete/50, text=progress_text)
-        # time.sleep(1)
-        my_bar.empty()
-
-        # time.sleep(time_interval)
+        try:
+            for cursor, logs in stream_strategy_logs(strategy_id, cursor):
+                chart_data.append(logs)
+                draw()
+            break
+        except requests.exceptions.RequestException as e:  # reconnect, resuming after the last logs received
+            print("console_helper :: real_time_strategy_plot ::", e)
+            time.sleep(1)
+    st.info("The strategy has stopped, the chart is no longer updated.", icon=":material/info:")
 
 
 # Static plotting function
@@ -188,8 +171,8 @@ def show_evaluation_metrics(strategy_id: str) -> None:
         st.subheader("Trading Performance Metrics Explained")
 
         st.subheader("Total Profit")
-        st.write("The overall profit or loss from all trades over the evaluation period.")
-        st.latex(r"\text{Total Profit} = \sum (\text{Profit from each trade})")
+        st.write("The overall profit or loss from all trades over the evaluation period, as a percentage of the initial capital.")
+        st.latex(r"\text{Total Profit} = \left( \prod (1 + R_t) - 1 \right) \times 100")
 
         st.subheader("Sharpe Ratio")
         st.write(
@@ -231,6 +214,17 @@ def show_evaluation_metrics(strategy_id: str) -> None:
         st.write("The ratio of total profits to total losses.")
         st.latex(r"\text{Profit Factor} = \frac{\text{Total Profit}}{\text{Total Loss}}")
 
+        st.subheader("Max Drawdown Duration")
+        st.write("The longest period, in bars, the equity stayed below its previous peak.")
+
+        st.subheader("Exposure")
+        st.write("The percentage of bars in which the strategy held a position.")
+        st.latex(r"\text{Exposure} = \left( \frac{\text{Bars in Position}}{\text{Total Bars}} \right) \times 100")
+
+        st.subheader("Turnover")
+        st.write("The total value traded relative to the average equity.")
+        st.latex(r"\text{Turnover} = \frac{\sum \text{Equity at each Order}}{\text{Average Equity}}")
+
         st.subheader("Number of Trades")
         st.write("The total count of trades executed.")
         st.latex(r"\text{Number of Trades} = \text{Winning Trades} + \text{Losing Trades}")
@@ -295,6 +289,36 @@ def show_evaluation_metrics(strategy_id: str) -> None:
             st.rerun()
 
 
+@st.fragment()
+def show_latency_metrics(strategy_id: str) -> None:
+    st.caption("The time spent in each stage of the strategy ticks, in **milliseconds**: the kline **fetch**, the **signal** computation, "
+               "the **order** execution with its **exchange round trip** and the **log write**. The **start delay** is how late a tick started after its scheduled time. "
+               "The **load** compares the 99th percentile tick duration to the strategy interval: above **100%** the strategy does not keep up with its interval.")
+
+    metrics = get_strategy_metrics(strategy_id)
+    if metrics is None or strategy_id not in metrics:
+        st.warning("No latency metrics to show. The metrics are only kept while the strategy is running.", icon=":material/smart_toy:")
+        return
+
+    metrics = metrics[strategy_id]
+    ticks_col, overruns_col, load_col, slippage_col = st.columns(4)
+    ticks_col.metric("Ticks", metrics["ticks"])
+    overruns_col.metric("Skipped Ticks (overruns)", metrics["overruns"])
+    load_col.metric("Load (p99 tick / interval)", "-" if metrics["load"] is None else f"{metrics['load'] * 100:.1f}%")
+    slippage = metrics["slippage_bps"]
+    slippage_col.metric("Mean Slippage (bps)", "-" if slippage["mean"] is None else f"{slippage['mean']:.2f}")
+
+    if metrics["load"] is not None and metrics["load"] > 1:
+        st.warning("The slowest ticks take longer than the strategy interval.", icon=":material/timer:")
+
+    stages_df = pd.DataFrame(metrics["stages_ms"]).T.reset_index(names="stage")
+    stages_df["stage"] = stages_df["stage"].str.replace("_", " ")
+    st.dataframe(stages_df[["stage", "count", "mean", "p50", "p90", "p99", "max", "last"]], use_container_width=True, hide_index=True)
+
+    if st.button("Refresh Latency Metrics", icon=":material/update:", type="tertiary"):
+        st.rerun()
+
+
 def show_active_strategy_count(active_strategies: int, total_strategies: int):
     st.html(f"""
     <style>
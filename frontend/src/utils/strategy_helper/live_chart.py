@@ -0,0 +1,149 @@
+from typing import Any, Dict, List, Tuple
+import numpy as np
+
+
+MAX_RECENT_POINTS = 1000  # latest logs shown as they are, the older ones are downsampled by blocks of this size
+BLOCK_POINTS = 100  # points kept from each downsampled block
+MAX_ARCHIVE_POINTS = 2000  # downsampled points, halved with LTTB when exceeded
+ORDER_SERIES = ["BUY", "SELL", "INVALID_BUY", "INVALID_SELL"]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling: keeps the first and last points, and from each of the buckets in
+    between the point forming the largest triangle with the point kept from the previous bucket and the average of
+    the next bucket, which preserves the visual shape (peaks and troughs) of the line.
+
+    Args:
+        x (np.ndarray): The x values, increasing.
+        y (np.ndarray): The y values.
+        threshold (int): The number of points to keep.
+
+    Returns:
+        np.ndarray: The indices of the points kept.
+    """
+    size = x.size
+    if threshold >= size or threshold < 3:
+        return np.arange(size)
+
+    x = x.astype(np.float64)
+    edges = np.linspace(1, size - 1, threshold - 1).astype(np.int64)  # buckets between the first and last points
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, size - 1
+    kept = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = end, edges[bucket + 2] if bucket + 2 < threshold - 1 else size
+        next_x, next_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        # Twice the triangle areas, with the point kept from the previous bucket and the next bucket average
+        areas = np.abs((x[kept] - next_x) * (y[start:end] - y[kept]) - (x[kept] - x[start:end]) * (next_y - y[kept]))
+        kept = start + int(np.argmax(areas))
+        indices[bucket + 1] = kept
+    return indices
+
+
+class AppendOnlyBuffer:
+    """
+    Growable NumPy array, doubling its capacity when full, so that appending costs time proportional to the new values.
+    """
+
+    def __init__(self, dtype: Any, capacity: int = 1024) -> None:
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+
+    def append(self, values: np.ndarray) -> None:
+        if self.size + values.size > self.data.size:
+            data = np.empty(max(2 * self.data.size, self.size + values.size), dtype=self.data.dtype)
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+        self.data[self.size:self.size + values.size] = values
+        self.size += values.size
+
+
+    def drop_first(self, count: int) -> None:
+        self.data[:self.size - count] = self.data[count:self.size]
+        self.size -= count
+
+
+    def replace(self, values: np.ndarray) -> None:
+        self.size = 0
+        self.append(values)
+
+
+    @property
+    def values(self) -> np.ndarray:
+        return self.data[:self.size]
+
+
+class LiveStrategyChartData:
+    """
+    The series of the live strategy chart, updated with the new logs only.
+
+    The price line shows the latest logs as they are (between MAX_RECENT_POINTS and twice that), and the older ones
+    downsampled with LTTB: each block of MAX_RECENT_POINTS logs leaving the recent points is reduced to BLOCK_POINTS
+    points, and the downsampled points are halved again whenever they exceed MAX_ARCHIVE_POINTS. The order markers
+    are few and all kept. So an update costs time proportional to the new logs (amortized), and the chart never
+    holds more than a few thousand points, however long the strategy runs.
+    """
+
+    def __init__(self) -> None:
+        self.archive_x, self.archive_y = AppendOnlyBuffer(np.int64), AppendOnlyBuffer(np.float64)
+        self.recent_x, self.recent_y = AppendOnlyBuffer(np.int64), AppendOnlyBuffer(np.float64)
+        self.markers = {order: (AppendOnlyBuffer(np.int64), AppendOnlyBuffer(np.float64)) for order in ORDER_SERIES}
+        self.logs_count = 0
+
+
+    def append(self, logs: List[Dict[str, Any]]) -> None:
+        """
+        Args:
+            logs (List[Dict[str, Any]]): The new strategy logs, in time order, with 'timestamp' (ms), 'price' and 'order'.
+        """
+        if not logs:
+            return
+        timestamps = np.fromiter((log["timestamp"] for log in logs), dtype=np.int64, count=len(logs))
+        prices = np.fromiter((log["price"] for log in logs), dtype=np.float64, count=len(logs))
+        orders = np.array([log["order"] for log in logs])
+        self.logs_count += len(logs)
+
+        for order, (marker_x, marker_y) in self.markers.items():
+            is_order = orders == order
+            if is_order.any():
+                marker_x.append(timestamps[is_order])
+                marker_y.append(prices[is_order])
+
+        self.recent_x.append(timestamps)
+        self.recent_y.append(prices)
+        while self.recent_x.size >= 2 * MAX_RECENT_POINTS:
+            block_x, block_y = self.recent_x.values[:MAX_RECENT_POINTS], self.recent_y.values[:MAX_RECENT_POINTS]
+            kept = lttb(block_x, block_y, BLOCK_POINTS)
+            self.archive_x.append(block_x[kept])
+            self.archive_y.append(block_y[kept])
+            self.recent_x.drop_first(MAX_RECENT_POINTS)
+            self.recent_y.drop_first(MAX_RECENT_POINTS)
+
+        if self.archive_x.size > MAX_ARCHIVE_POINTS:
+            kept = lttb(self.archive_x.values, self.archive_y.values, MAX_ARCHIVE_POINTS // 2)
+            self.archive_x.replace(self.archive_x.values[kept])
+            self.archive_y.replace(self.archive_y.values[kept])
+
+
+    def get_price_series(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The times (datetime64) and prices of the price line.
+        """
+        x = np.concatenate((self.archive_x.values, self.recent_x.values)).astype("datetime64[ms]")
+        return x, np.concatenate((self.archive_y.values, self.recent_y.values))
+
+
+    def get_marker_series(self, order: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Args:
+            order (str): The order type, one of ORDER_SERIES.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The times (datetime64) and prices of the orders.
+        """
+        marker_x, marker_y = self.markers[order]
+        return marker_x.values.astype("datetime64[ms]"), marker_y.values.copy()
@@ -2,7 +2,7 @@ import streamlit as st
 from frontend.src.utils.ui_elements import fix_page_layout, set_page_title
 from frontend.src.utils.strategy_helper.client import get_strategy_metadata, get_strategy_logs, stop_strategy
 import pandas as pd
-from frontend.src.utils.strategy_helper.console_helper import real_time_strategy_plot, static_strategy_plot, show_evaluation_metrics, show_active_strategy_count, strategy_plot_info, strategy_info_card
+from frontend.src.utils.strategy_helper.console_helper import real_time_strategy_plot, static_strategy_plot, show_evaluation_metrics, show_latency_metrics, show_active_strategy_count, strategy_plot_info, strategy_info_card
 from frontend.src.utils.oracle.ui_elements import oracle_button
 
 
@@ -88,9 +88,13 @@ if strategies:
             st.html("<h3 style='text-align: left;margin-top:0.1em; margin-bottom:0.1em; padding:0;color:#5E5E5E'>2. Strategy Evaluation Metrics</h3>")
             show_evaluation_metrics(strategy_id)
 
+            st.divider()
+            st.html("<h3 style='text-align: left;margin-top:0.1em; margin-bottom:0.1em; padding:0;color:#5E5E5E'>3. Strategy Tick Latency</h3>")
+            show_latency_metrics(strategy_id)
+
             st.divider()
             st.html(
-                "<h3 style='text-align: left;margin-top:0.1em; margin-bottom:0.1em; padding:0;color:#5E5E5E'>3. Strategy Logs Plot</h3>")
+                "<h3 style='text-align: left;margin-top:0.1em; margin-bottom:0.1em; padding:0;color:#5E5E5E'>4. Strategy Logs Plot</h3>")
             strategy_plot_info()
 
             st.badge("Real Time Monitor Line Plot", icon=":material/live_tv:", color="blue")
@@ -99,7 +103,7 @@ if strategies:
             show_slippage = "Show Slippage" in plot_options
             show_invalid = "Show Invalid Orders" in plot_options
             if real_time_option:
-                real_time_strategy_plot(logs_df[["timestamp", "price", "order"]], strategy_id, df_to_show["time_interval"].iloc[0], show_invalid)
+                real_time_strategy_plot(strategy_id, show_invalid)
             else:
                 static_strategy_plot(logs_df[["timestamp", "price", "slippage", "order"]], show_invalid, show_slippage)
 
@@ -0,0 +1,16 @@
+import pandas as pd
+import pytest
+from backend.src.exchange_client.synthetic_market import SyntheticMarket, EPOCH_MS
+
+
+@pytest.fixture
+def make_dataset():
+    """
+    Returns a factory of SyntheticMarket klines in the dataset format of the strategies (open time as 'timestamp').
+    The default seed is the one of MockExchangeClient, so that the datasets match the klines it serves.
+    """
+    def make(size: int, symbol: str = "BTCUSDT", interval: str = "1m", seed: int = 42,
+             start_time: int = EPOCH_MS + 86400000) -> pd.DataFrame:
+        klines = SyntheticMarket(seed).generate(symbol, interval, start_time, size)
+        return pd.DataFrame(klines).rename(columns={"open_time": "timestamp"})
+    return make
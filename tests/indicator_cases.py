@@ -0,0 +1,85 @@
+"""
+The indicator kernels with the pandas and `ta` implementations they replace, on random-walk klines. Shared by
+tests/test_indicator_kernels.py, which checks the kernels against the references, and the
+benchmarks/indicator_kernels.py micro-benchmarks.
+"""
+
+from typing import Callable, Dict, Tuple
+import numpy as np
+import pandas as pd
+from ta.momentum import RSIIndicator
+from ta.trend import MACD, ADXIndicator
+from ta.volatility import BollingerBands
+from backend.src.broker.sibyl_trading_engine.indicators import kernels
+
+
+def generate_klines(size: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Generates random-walk OHLCV klines.
+    """
+    rng = np.random.default_rng(seed)
+    close_price = 30000 * np.exp(np.cumsum(rng.normal(0, 0.002, size)))
+    open_price = np.r_[close_price[0], close_price[:-1]]
+    spread = np.abs(rng.normal(0, 0.001, size)) * close_price
+    return pd.DataFrame({
+        "timestamp": np.arange(size, dtype=np.int64) * 60000,
+        "open_price": open_price,
+        "high": np.maximum(open_price, close_price) + spread,
+        "low": np.minimum(open_price, close_price) - spread,
+        "close_price": close_price,
+        "volume": rng.lognormal(3, 1, size),
+    })
+
+
+def pandas_rsi(close: pd.Series, window: int, min_periods: int | None, epsilon: float) -> pd.Series:
+    delta = close.diff()
+    gain = pd.Series(np.where(delta > 0, delta, 0), index=close.index).rolling(window=window, min_periods=min_periods).mean()
+    loss = pd.Series(np.where(delta < 0, -delta, 0), index=close.index).rolling(window=window, min_periods=min_periods).mean()
+    return 100 - (100 / (1 + gain / (loss + epsilon)))
+
+
+def pandas_atr(data: pd.DataFrame, window: int) -> pd.Series:
+    high_close = np.abs(data["high"] - data["close_price"].shift())
+    low_close = np.abs(data["low"] - data["close_price"].shift())
+    true_range = np.maximum.reduce([data["high"] - data["low"], high_close, low_close])
+    return pd.Series(true_range, index=data.index).rolling(window=window).mean()
+
+
+def pandas_cmf(data: pd.DataFrame, window: int) -> pd.Series:
+    money_flow_mult = ((data["close_price"] - data["low"]) - (data["high"] - data["close_price"])) / (data["high"] - data["low"] + 1e-9)
+    return (money_flow_mult * data["volume"]).rolling(window=window).sum() / data["volume"].rolling(window=window).sum()
+
+
+def pandas_tsi(close: pd.Series, long: int, short: int) -> pd.Series:
+    price_diff = close.diff()
+    smoothed_diff = price_diff.ewm(span=short, adjust=False).mean().ewm(span=long, adjust=False).mean()
+    smoothed_abs_diff = price_diff.abs().ewm(span=short, adjust=False).mean().ewm(span=long, adjust=False).mean()
+    return 100 * (smoothed_diff / (smoothed_abs_diff + 1e-9))
+
+
+def get_cases(data: pd.DataFrame) -> Dict[str, Tuple[Callable[[], object], Callable[[], np.ndarray]]]:
+    """
+    Returns:
+        Dict[str, Tuple[Callable, Callable]]: The reference and kernel implementation of each indicator, by name.
+    """
+    close, high, low, volume = data["close_price"], data["high"], data["low"], data["volume"]
+    close_array, high_array, low_array, volume_array = (column.to_numpy() for column in (close, high, low, volume))
+    return {
+        "sma(20)": (lambda: close.rolling(window=20).mean(), lambda: kernels.rolling_mean(close_array, 20)),
+        "rolling_std(20)": (lambda: close.rolling(window=20).std(), lambda: kernels.rolling_std(close_array, 20)),
+        "rolling_sum(20)": (lambda: volume.rolling(window=20).sum(), lambda: kernels.rolling_sum(volume_array, 20)),
+        "ema(12)": (lambda: close.ewm(span=12, adjust=False).mean(), lambda: kernels.ema(close_array, 12)),
+        "ema(200)": (lambda: close.ewm(span=200, adjust=False).mean(), lambda: kernels.ema(close_array, 200)),
+        "ewm_std(3)": (lambda: close.ewm(span=3).std(), lambda: kernels.ewm_std(close_array, 3)),
+        "rsi(14)": (lambda: pandas_rsi(close, 14, None, 1e-9), lambda: kernels.rsi(close_array, 14, epsilon=1e-9)),
+        "rsi(14, min_periods=1)": (lambda: pandas_rsi(close, 14, 1, 1e-10), lambda: kernels.rsi(close_array, 14, 1, 1e-10)),
+        "macd_signal(12, 26, 9)": (lambda: (close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()).ewm(span=9, adjust=False).mean(),
+                                   lambda: kernels.macd(close_array, 12, 26, 9)[1]),
+        "atr(14)": (lambda: pandas_atr(data, 14), lambda: kernels.atr(high_array, low_array, close_array, 14)),
+        "cmf(20)": (lambda: pandas_cmf(data, 20), lambda: kernels.cmf(high_array, low_array, close_array, volume_array, 20)),
+        "tsi(25, 13)": (lambda: pandas_tsi(close, 25, 13), lambda: kernels.tsi(close_array, 25, 13)),
+        "ta wilder_rsi(14)": (lambda: RSIIndicator(close=close).rsi(), lambda: kernels.wilder_rsi(close_array, 14)),
+        "ta macd_diff(12, 26, 9)": (lambda: MACD(close=close).macd_diff(), lambda: kernels.macd(close_array, 12, 26, 9, warm_up=True)[2]),
+        "ta bollinger_wband(20)": (lambda: BollingerBands(close=close).bollinger_wband(), lambda: kernels.bollinger_wband(close_array, 20)),
+        "ta adx(14)": (lambda: ADXIndicator(high=high, low=low, close=close).adx(), lambda: kernels.adx(high_array, low_array, close_array, 14)),
+    }
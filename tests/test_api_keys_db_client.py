@@ -0,0 +1,140 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("cryptography")
+
+import sqlalchemy as sa
+from sqlalchemy.orm import sessionmaker
+from cryptography.fernet import Fernet
+from database import api_keys_db_client
+from database.api_keys_db_client import APIEncryptedDatabase
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """
+    APIEncryptedDatabase on an empty database in tmp_path, with an empty cache, a fake clock and a DB load counter.
+    """
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'api_keys.db'}")
+    APIEncryptedDatabase.Base.metadata.create_all(engine)
+    monkeypatch.setattr(APIEncryptedDatabase, "engine", engine)
+    monkeypatch.setattr(APIEncryptedDatabase, "Session", sessionmaker(bind=engine))
+    monkeypatch.setattr(APIEncryptedDatabase, "KEY_FILE", str(tmp_path / "encryption.key"))
+    monkeypatch.setattr(APIEncryptedDatabase, "cipher", Fernet(Fernet.generate_key()))
+    monkeypatch.setattr(APIEncryptedDatabase, "cache_ttl", None)
+    monkeypatch.setattr(APIEncryptedDatabase, "_cache", {})
+    monkeypatch.setattr(APIEncryptedDatabase, "_cache_generation", 0)
+    clock = FakeClock()
+    monkeypatch.setattr(api_keys_db_client, "time", clock)
+
+    loads = []
+    load_api_key = APIEncryptedDatabase._load_api_key
+    monkeypatch.setattr(APIEncryptedDatabase, "_load_api_key", classmethod(lambda cls, name: (loads.append(name), load_api_key(name))[1]))
+    return clock, loads
+
+
+def test_lookups_are_cached_including_missing_keys(db):
+    _, loads = db
+    APIEncryptedDatabase.insert_api_key("binance", "key", "secret")
+
+    for _ in range(3):
+        credentials = APIEncryptedDatabase.get_api_key_by_name("binance")
+        assert (credentials.api_key, credentials.secret_key, credentials.api_metadata) == ("key", "secret", None)
+        assert APIEncryptedDatabase.get_api_key_by_name("kraken") is None
+
+    assert loads == ["binance", "kraken"]
+
+
+def test_cached_credentials_expire_after_the_ttl(db, monkeypatch):
+    clock, loads = db
+    monkeypatch.setattr(APIEncryptedDatabase, "cache_ttl", 60.0)
+    APIEncryptedDatabase.insert_api_key("binance", "key", "secret")
+    APIEncryptedDatabase.get_api_key_by_name("binance")
+    cached = APIEncryptedDatabase._cache["binance"][0]
+
+    clock.now += 59.9
+    APIEncryptedDatabase.get_api_key_by_name("binance")
+    assert loads == ["binance"]
+
+    clock.now += 0.1
+    assert APIEncryptedDatabase.get_api_key_by_name("binance").api_key == "key"
+    assert loads == ["binance", "binance"]
+    assert all(value == bytearray(len(value)) for value in cached.values if value is not None)  # the expired entry
+
+
+@pytest.mark.parametrize("change, expected_key", [
+    (lambda: APIEncryptedDatabase.update_api_key("binance", "new-key"), "new-key"),
+    (lambda: APIEncryptedDatabase.delete_api_key("binance"), None),
+    (lambda: APIEncryptedDatabase.insert_api_key("kraken", "other"), "key"),  # other names are not invalidated
+])
+def test_changes_invalidate_the_cached_key(db, change, expected_key):
+    _, loads = db
+    APIEncryptedDatabase.insert_api_key("binance", "key", "secret")
+    APIEncryptedDatabase.get_api_key_by_name("binance")
+    generation = APIEncryptedDatabase._cache_generation
+
+    change()
+
+    assert APIEncryptedDatabase._cache_generation > generation
+    credentials = APIEncryptedDatabase.get_api_key_by_name("binance")
+    assert (credentials.api_key if credentials is not None else None) == expected_key
+    assert loads == (["binance"] if expected_key == "key" else ["binance", "binance"])
+
+
+def test_inserting_a_missing_key_replaces_the_cached_absence(db):
+    assert APIEncryptedDatabase.get_api_key_by_name("binance") is None
+
+    APIEncryptedDatabase.insert_api_key("binance", "key")
+
+    assert APIEncryptedDatabase.get_api_key_by_name("binance").api_key == "key"
+
+
+def test_init_cipher_invalidates_every_cached_key(db):
+    for name in ("binance", "kraken"):
+        APIEncryptedDatabase.insert_api_key(name, "key")
+        APIEncryptedDatabase.get_api_key_by_name(name)
+    APIEncryptedDatabase.get_api_key_by_name("coinbase")
+    cached = [APIEncryptedDatabase._cache[name][0] for name in ("binance", "kraken")]
+    generation = APIEncryptedDatabase._cache_generation
+
+    APIEncryptedDatabase.init_cipher()
+
+    assert APIEncryptedDatabase._cache == {}
+    assert APIEncryptedDatabase._cache_generation > generation
+    assert all(entry.values[0] == bytearray(3) for entry in cached)
+
+
+def test_lookup_racing_with_an_invalidation_is_not_cached(db, monkeypatch):
+    APIEncryptedDatabase.insert_api_key("binance", "old-key")
+    load_api_key = APIEncryptedDatabase._load_api_key
+
+    def load_then_update(cls, name):
+        credentials = load_api_key(name)
+        APIEncryptedDatabase.update_api_key(name, "new-key")  # committed while the old key is being decrypted
+        return credentials
+
+    monkeypatch.setattr(APIEncryptedDatabase, "_load_api_key", classmethod(load_then_update))
+    assert APIEncryptedDatabase.get_api_key_by_name("binance").api_key == "old-key"
+    assert "binance" not in APIEncryptedDatabase._cache
+
+    monkeypatch.setattr(APIEncryptedDatabase, "_load_api_key", load_api_key)
+    assert APIEncryptedDatabase.get_api_key_by_name("binance").api_key == "new-key"
+
+
+def test_evicted_credentials_are_zeroed():
+    cached = APIEncryptedDatabase.CachedCredentials(APIEncryptedDatabase.APICredentials("binance", "key", "secret", None))
+    api_key, secret_key, _ = cached.values
+
+    assert cached.get_credentials().secret_key == "secret"
+    cached.zero()
+
+    assert api_key == bytearray(3) and secret_key == bytearray(6)
+    assert cached.values[2] is None
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from backend.src.broker.sibyl_trading_engine.backtester.backtester import Backtester
+from backend.src.broker.sibyl_trading_engine.strategies.strategy_factory import StrategyFactory
+
+
+@pytest.mark.parametrize("strategy_name", StrategyFactory.get_strategy_names())
+def test_vectorized_loop_matches_windowed_loop(make_dataset, strategy_name):
+    strategy = StrategyFactory.get_strategy(strategy_name, {})
+    if not strategy.is_causal:
+        pytest.skip(f"{strategy_name} is not causal, it is only backtested with the windowed loop")
+    backtester = Backtester(strategy, None, "BTCUSDT", "1m")
+
+    result = backtester.verify_vectorized(make_dataset(900, seed=7))
+
+    assert result["bars"] == 500
+    assert result["mismatches"] == []
+    assert result["match"]
+
+
+def test_deduplicate_orders_marks_repeated_actions():
+    signals = np.array(["SELL", "BUY", "HOLD", "BUY", "SELL", "HOLD", "SELL", "BUY"])
+
+    orders = Backtester.deduplicate_orders(signals)
+
+    assert orders.tolist() == ["INVALID_SELL", "BUY", "HOLD", "INVALID_BUY", "SELL", "HOLD", "INVALID_SELL", "BUY"]
@@ -0,0 +1,79 @@
+import time
+import pytest
+from backend.src.exchange_client.binance_stream import BinanceMarketStream
+from backend.src.exchange_client.mock_binance_stream_server import MockBinanceStreamServer
+
+
+STEP = 1000  # 1s klines, so that klines close during the tests
+
+
+class RestClient:
+    """
+    Stand-in of the REST API of the exchange, serving the closed 1s klines of the backfill.
+    """
+
+    def __init__(self, ws_base_url: str) -> None:
+        self.name = "binance"
+        self.ws_base_url = ws_base_url
+        self.requests = []
+
+    def get_klines(self, symbol, interval, limit, start_time=None, end_time=None):
+        self.requests.append(start_time)
+        now = int(time.time() * 1000)
+        return [{"open_time": open_time, "open_price": 1.0, "high": 1.0, "low": 1.0, "close_price": 1.0,
+                 "close_time": float(open_time + STEP - 1), "volume": 0.0, "trades_num": 0.0}
+                for open_time in range(start_time, now - now % STEP, STEP)][:limit]
+
+
+def wait_for(condition, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def server():
+    server = MockBinanceStreamServer(push_interval=0.05)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def stream(server):
+    stream = BinanceMarketStream(RestClient(server.url), "BTCUSDT", "1s")
+    stream.start()
+    yield stream
+    stream.stop()
+
+
+def test_stream_receives_klines_and_book_ticker(stream):
+    assert wait_for(stream.is_live, timeout=5)
+    assert wait_for(lambda: stream.book_ticker is not None, timeout=5)
+    assert stream.get_last_kline()["open_time"] % STEP == 0
+    assert stream.get_last_price() == pytest.approx(stream.get_last_kline()["close_price"], rel=1e-3)
+
+    assert wait_for(lambda: len(stream.get_closed_klines()) >= 2, timeout=5)
+    open_times = [kline["open_time"] for kline in stream.get_closed_klines()]
+    assert all(later - earlier == STEP for earlier, later in zip(open_times, open_times[1:]))
+
+
+def test_stream_reconnects_and_backfills_the_gap(server, stream):
+    assert wait_for(lambda: len(stream.get_closed_klines()) >= 1, timeout=5)
+    last_closed = stream.get_closed_klines()[-1]["open_time"]
+
+    server.drop_connections()
+    assert wait_for(lambda: not stream.is_live(), timeout=2)
+    assert wait_for(lambda: stream.reconnects_num >= 1 and stream.is_live(), timeout=5)
+
+    # The klines closed while disconnected are fetched from the REST API, from the one after the last closed kline
+    assert wait_for(lambda: stream.exchange_client.requests, timeout=2)
+    assert stream.exchange_client.requests[0] == last_closed + STEP
+
+    reconnected_at = int(time.time() * 1000)
+    assert wait_for(lambda: stream.get_closed_klines()[-1]["open_time"] > reconnected_at, timeout=5)
+    open_times = [kline["open_time"] for kline in stream.get_closed_klines()]
+    assert all(later - earlier == STEP for earlier, later in zip(open_times, open_times[1:]))
@@ -0,0 +1,102 @@
+import math
+import numpy as np
+import pytest
+from backend.src.broker.sibyl_trading_engine.evaluator.evaluator import Evaluator
+
+
+DAY_MS = 86400000  # daily bars, 365 periods per year
+
+
+def make_logs(prices, orders):
+    return [{"timestamp": i * DAY_MS, "price": price, "order": order} for i, (price, order) in enumerate(zip(prices, orders))]
+
+
+def sharpe(returns, periods_per_year):
+    mean = sum(returns) / len(returns)
+    std = math.sqrt(sum((r - mean) ** 2 for r in returns) / len(returns))
+    return mean / std * math.sqrt(periods_per_year)
+
+
+def test_equity_curve_holds_from_buy_to_sell_with_an_open_final_buy():
+    evaluator = Evaluator(make_logs([100, 110, 121, 110, 99, 100], ["BUY", "HOLD", "SELL", "HOLD", "BUY", "HOLD"]))
+
+    positions = evaluator.calculate_positions()
+    returns, equity = evaluator.calculate_equity_curve(positions)
+
+    assert positions.tolist() == [1, 1, 0, 0, 1, 1]
+    # The return of a bar is earned by the position held during it, from the close of the previous bar
+    np.testing.assert_allclose(returns, [0, 0.1, 0.1, 0, 0, 1 / 99])
+    np.testing.assert_allclose(equity, [1, 1.1, 1.21, 1.21, 1.21, 1.21 * 100 / 99])
+
+    metrics = evaluator.evaluate()
+    assert metrics["total_profit"] == pytest.approx((1.21 * 100 / 99 - 1) * 100)
+    assert metrics["number_of_trades"] == 1  # the final BUY is still open
+    assert metrics["win_rate"] == 100
+    assert metrics["average_win"] == pytest.approx(21)
+    assert metrics["average_loss"] == 0
+    assert metrics["profit_factor"] == pytest.approx(21)
+    assert metrics["max_drawdown"] == 0
+    assert metrics["max_drawdown_duration"] == 0
+    assert metrics["calmar_ratio"] == 0
+    assert metrics["exposure"] == pytest.approx(60)  # in a position during 3 of the 5 bars
+    assert metrics["turnover"] == pytest.approx((1 + 1.21 + 1.21) / np.mean(equity))
+    assert metrics["sharpe_ratio"] == pytest.approx(sharpe([0, 0.1, 0.1, 0, 0, 1 / 99], 365))
+
+
+def test_round_trips_pair_each_sell_with_the_preceding_buy():
+    evaluator = Evaluator(make_logs([10, 20, 30, 40, 50, 60], ["SELL", "BUY", "BUY", "SELL", "SELL", "BUY"]))
+
+    buy_prices, sell_prices = evaluator.calculate_round_trips()
+
+    assert buy_prices.tolist() == [30]
+    assert sell_prices.tolist() == [40]
+
+
+def test_drawdown_and_risk_ratios():
+    evaluator = Evaluator(make_logs([100, 120, 90, 108, 130], ["BUY", "HOLD", "HOLD", "HOLD", "SELL"]))
+    returns = [0, 0.2, -0.25, 0.2, 130 / 108 - 1]
+
+    metrics = evaluator.evaluate()
+
+    assert metrics["total_profit"] == pytest.approx(30)
+    assert metrics["max_drawdown"] == pytest.approx(25)  # from 1.2 down to 0.9
+    assert metrics["max_drawdown_duration"] == 2
+    assert metrics["sharpe_ratio"] == pytest.approx(sharpe(returns, 365))
+    downside_deviation = math.sqrt(0.25 ** 2 / 5)
+    assert metrics["sortino_ratio"] == pytest.approx(sum(returns) / 5 / downside_deviation * math.sqrt(365))
+    annual_return = (1.3 ** (365 / 5) - 1) * 100
+    assert metrics["calmar_ratio"] == pytest.approx(annual_return / 25)
+    assert metrics["exposure"] == 100
+
+
+def test_risk_free_rate_is_deducted_per_bar():
+    logs = make_logs([100, 120, 90, 108, 130], ["BUY", "HOLD", "HOLD", "HOLD", "SELL"])
+    returns = np.array([0, 0.2, -0.25, 0.2, 130 / 108 - 1]) - 0.0365 / 365
+
+    assert Evaluator(logs, risk_free_rate=0.0365).evaluate()["sharpe_ratio"] == pytest.approx(sharpe(list(returns), 365))
+
+
+def test_no_trades():
+    assert Evaluator(make_logs([100, 101, 102], ["HOLD", "HOLD", "INVALID_BUY"])).evaluate() == {}
+    assert Evaluator([]).evaluate() == {}
+
+
+def test_single_bar():
+    metrics = Evaluator(make_logs([100], ["BUY"])).evaluate()
+
+    assert metrics["total_profit"] == 0
+    assert metrics["number_of_trades"] == 0
+    assert metrics["sharpe_ratio"] == 0  # no time between the logs to annualize
+    assert metrics["sortino_ratio"] == 0
+    assert metrics["max_drawdown"] == 0
+    assert metrics["exposure"] == 0
+    assert metrics["turnover"] == 1
+
+
+def test_from_arrays_matches_logs():
+    logs = make_logs([100, 120, 90, 108, 130, 125], ["BUY", "HOLD", "SELL", "BUY", "HOLD", "SELL"])
+    evaluator = Evaluator.from_arrays(np.array([log["timestamp"] for log in logs]), np.array([log["price"] for log in logs]),
+                                      np.array([log["order"] for log in logs], dtype=object))
+
+    assert evaluator.trade_history == Evaluator.clean_trade_dataset(logs)
+    assert evaluator.evaluate() == Evaluator(logs).evaluate()
@@ -0,0 +1,94 @@
+import pytest
+from backend.src.exchange_client.exchange_client import HTTP_POOL_SIZE
+from backend.src.exchange_client.mock_exchance_client import MockExchangeClient
+
+
+class FakeSDKClient:
+    """
+    Stands in for binance.Client, which pings the exchange when it is built.
+    """
+
+    def __init__(self, api_key, api_secret, testnet=False) -> None:
+        self.api_key = api_key
+        self.testnet = testnet
+        self.is_closed = False
+
+    def close_connection(self) -> None:
+        self.is_closed = True
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    pytest.importorskip("binance")
+    pytest.importorskip("sqlalchemy")
+    pytest.importorskip("cryptography")
+    from backend.src.exchange_client import binance_client
+    from backend.src.exchange_client.exchange_client_factory import ExchangeClientFactory
+    from database.api_keys_db_client import APIEncryptedDatabase
+
+    credentials = {}  # the stored credentials, by exchange
+
+    def store_credentials(name: str, api_key: str) -> None:
+        credentials[name] = APIEncryptedDatabase.APICredentials(name, api_key, "secret")
+
+    monkeypatch.setattr(APIEncryptedDatabase, "get_api_key_by_name", classmethod(lambda cls, name: credentials.get(name)))
+    monkeypatch.setattr(binance_client, "Client", FakeSDKClient)
+    monkeypatch.setattr("backend.src.exchange_client.binance_testnet_client.Client", FakeSDKClient)
+    monkeypatch.setattr(ExchangeClientFactory, "_instances", {})
+    return ExchangeClientFactory, store_credentials
+
+
+def test_session_keeps_a_connection_pool_and_closes_it(monkeypatch):
+    client = MockExchangeClient()
+    adapter = client.session.get_adapter("https://api.example.com")
+    assert adapter._pool_maxsize == HTTP_POOL_SIZE
+    closed = []
+    monkeypatch.setattr(adapter, "close", lambda: closed.append(adapter))
+
+    client.close()
+
+    assert closed  # both schemes share the adapter, closed with the session
+
+
+def test_one_client_is_shared_per_exchange(registry):
+    factory, _ = registry
+    client = factory.get_client("mock_exchange")
+
+    assert factory.get_client("MOCK_EXCHANGE") is client
+    assert factory.get_client("binance") is not client
+    with pytest.raises(ValueError):
+        factory.get_client("unknown")
+
+
+def test_clients_connect_with_the_credentials_of_their_exchange(registry):
+    factory, store_credentials = registry
+    store_credentials("binance", "main-key")
+    store_credentials("binance_testnet", "testnet-key")
+
+    binance = factory.get_client("binance")
+    testnet = factory.get_client("binance_testnet")
+
+    assert (binance.client.api_key, binance.client.testnet) == ("main-key", False)
+    assert (testnet.client.api_key, testnet.client.testnet) == ("testnet-key", True)
+
+
+def test_client_is_replaced_after_an_api_key_update(registry, monkeypatch):
+    factory, store_credentials = registry
+    store_credentials("binance", "old-key")
+    client = factory.get_client("binance")
+    other = factory.get_client("mock_exchange")
+    closed_sessions = []
+    monkeypatch.setattr(client.session, "close", lambda: closed_sessions.append(client.session))
+
+    store_credentials("binance", "new-key")
+    assert factory.get_client("binance").client.api_key == "old-key"  # cached until invalidated
+    factory.invalidate_client("binance")
+
+    rebuilt = factory.get_client("binance")
+    assert rebuilt is not client and rebuilt.client.api_key == "new-key"
+    assert client.client.is_closed and closed_sessions == [client.session]
+    assert factory.get_client("mock_exchange") is other
+
+    factory.invalidate_client()
+    assert rebuilt.client.is_closed
+    assert factory.get_client("mock_exchange") is not other
@@ -0,0 +1,110 @@
+import time
+import pytest
+from backend.src.broker.sibyl_trading_engine.tactician.exchange_interface import TacticianExchangeInterface
+from backend.src.broker.sibyl_trading_engine.tactician.market_data_hub import MarketDataHub
+from backend.src.exchange_client.mock_exchance_client import MockExchangeClient
+from backend.src.exchange_client.synthetic_market import EPOCH_MS
+
+
+MINUTE = 60000
+BOUNDARY = EPOCH_MS + 40 * 86400000  # a 1m and 5s candle boundary
+NOW = BOUNDARY + 200  # a strategy tick, just after the boundary
+
+
+class FakeStream:
+    """
+    Stands in for BinanceMarketStream, with the klines it has received.
+    """
+
+    def __init__(self, closed_klines) -> None:
+        self.closed_klines = closed_klines
+
+    def is_live(self) -> bool:
+        return True
+
+    def get_last_closed_kline(self):
+        return dict(self.closed_klines[-1]) if self.closed_klines else None
+
+    def get_closed_klines(self, from_open_time=None):
+        return [dict(kline) for kline in self.closed_klines if from_open_time is None or kline["open_time"] >= from_open_time]
+
+
+@pytest.fixture
+def exchange_api(tmp_path, monkeypatch):
+    monkeypatch.setenv("KLINES_DB_PATH", str(tmp_path))
+    monkeypatch.setattr(time, "time", lambda: NOW / 1000)
+    return TacticianExchangeInterface(MockExchangeClient())
+
+
+def subscribe(exchange_api, interval, interval_seconds, stream):
+    hub = MarketDataHub()
+    exchange_api.open_market_stream = lambda symbol, interval: stream
+    key = hub.subscribe("strategy", exchange_api, "BTCUSDT", interval, interval_seconds, False)
+    return hub, key
+
+
+def test_get_last_kline_returns_the_closed_candle(exchange_api):
+    kline = exchange_api.get_last_kline("BTCUSDT", "1m").iloc[-1]
+    assert kline["timestamp"] == BOUNDARY - MINUTE
+    assert kline["close_time"] < NOW
+
+
+def test_get_last_kline_returns_the_previous_sub_minute_bucket(exchange_api):
+    kline = exchange_api.get_last_kline("BTCUSDT", "5s").iloc[-1]
+    one_second_klines = exchange_api.exchange_client.get_klines("BTCUSDT", "1s", 5, start_time=BOUNDARY - 5000)
+    assert kline["timestamp"] == BOUNDARY - 5000
+    assert kline["close_time"] == BOUNDARY - 1
+    assert kline["open_price"] == one_second_klines[0]["open_price"]
+    assert kline["close_price"] == one_second_klines[-1]["close_price"]
+
+
+@pytest.mark.parametrize("interval, step", [("1m", MINUTE), ("5s", 5000)])
+def test_get_kline_data_leaves_out_the_open_candle(exchange_api, interval, step):
+    klines = exchange_api.get_kline_data("BTCUSDT", interval, 50)
+    assert klines.shape[0] == 50
+    assert klines["timestamp"].iloc[-1] == BOUNDARY - step
+    assert (klines["close_time"] < NOW).all()
+    assert (klines["timestamp"].diff().dropna() == step).all()
+
+
+def test_hub_uses_the_closed_stream_kline(exchange_api):
+    closed_klines = exchange_api.exchange_client.get_klines("BTCUSDT", "1m", 3, end_time=BOUNDARY - MINUTE)
+    hub, key = subscribe(exchange_api, "1m", 60, FakeStream(closed_klines))
+    kline = hub.get_last_kline(key)
+    assert kline["timestamp"] == BOUNDARY - MINUTE
+    assert kline["close_price"] == closed_klines[-1]["close_price"]
+    assert hub.markets[key].requests_num == 0
+
+
+def test_hub_falls_back_to_rest_until_the_stream_kline_closes(exchange_api):
+    closed_klines = exchange_api.exchange_client.get_klines("BTCUSDT", "1m", 3, end_time=BOUNDARY - 2 * MINUTE)
+    hub, key = subscribe(exchange_api, "1m", 60, FakeStream(closed_klines))
+    assert hub.get_last_kline(key)["timestamp"] == BOUNDARY - MINUTE
+    assert hub.markets[key].requests_num == 1
+
+
+def test_hub_resamples_the_previous_complete_bucket(exchange_api):
+    closed_klines = exchange_api.exchange_client.get_klines("BTCUSDT", "1s", 12, end_time=BOUNDARY - 1000)
+    hub, key = subscribe(exchange_api, "5s", 5, FakeStream(closed_klines))
+    kline = hub.get_last_kline(key)
+    assert kline["timestamp"] == BOUNDARY - 5000
+    assert kline["close_price"] == closed_klines[-1]["close_price"]
+    assert hub.markets[key].requests_num == 0
+
+    # The last second of the bucket has not closed on the stream yet
+    hub, key = subscribe(exchange_api, "5s", 5, FakeStream(closed_klines[:-1]))
+    assert hub.get_last_kline(key)["timestamp"] == BOUNDARY - 5000
+    assert hub.markets[key].requests_num == 1
+
+
+def test_market_requests_scale_with_markets_not_strategies(exchange_api):
+    hub = MarketDataHub()
+    keys = [hub.subscribe(f"strategy-{i}", exchange_api, "BTCUSDT", "1m", 60, False) for i in range(3)]
+    assert len(set(keys)) == 1
+    for key in keys:
+        assert hub.get_last_kline(key)["timestamp"] == BOUNDARY - MINUTE
+
+    assert hub.get_market_metrics(keys[0]) == {"subscribers": 3, "exchange_requests": 1, "is_streaming": False}
+    for i in range(3):
+        hub.unsubscribe(f"strategy-{i}")
+    assert hub.get_market_metrics(keys[0]) is None
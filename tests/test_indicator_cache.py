@@ -0,0 +1,48 @@
+import numpy as np
+from backend.src.broker.sibyl_trading_engine.indicators.indicator_cache import IndicatorCache
+
+
+def test_hits_and_misses(make_dataset):
+    cache = IndicatorCache()
+    data = make_dataset(100)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return data["close_price"].rolling(14).mean()
+
+    first = cache.get(data, ("sma", "close_price", 14), compute)
+    second = cache.get(data.copy(), ("sma", "close_price", 14), compute)  # same klines in another DataFrame
+
+    assert first is second
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert not first.flags.writeable
+
+    cache.get(data, ("sma", "close_price", 20), lambda: data["close_price"].rolling(20).mean())
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_different_klines_invalidate_the_cache(make_dataset):
+    cache = IndicatorCache()
+    data = make_dataset(100)
+    cache.get(data, "close", lambda: data["close_price"])
+
+    # Same length and bounds, different prices
+    other = data.copy()
+    other.loc[50, "close_price"] += 1.0
+    values = cache.get(other, "close", lambda: other["close_price"])
+
+    assert values[50] == other["close_price"].iloc[50]
+    assert cache.misses == 2
+    assert list(cache.arrays) == ["close"]
+
+
+def test_added_columns_do_not_invalidate_the_cache(make_dataset):
+    cache = IndicatorCache()
+    data = make_dataset(100)
+    cache.get(data, "close", lambda: data["close_price"])
+    data["rsi"] = np.zeros(100)  # the strategies add their indicators to the dataset
+
+    cache.get(data.copy(), "close", lambda: data["close_price"])
+    assert cache.hits == 1
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from tests.indicator_cases import generate_klines, get_cases
+
+
+RTOL = 1e-9
+ATOL = 1e-9
+# pandas updates the rolling variance online (add / remove), which drifts by ~1e-7 over long series, while
+# `kernels.rolling_std` recomputes each window (two-pass), so the rolling standard deviations are compared looser.
+ROLLING_STD_RTOL = 1e-6
+ROLLING_STD_CASES = {"rolling_std(20)", "ta bollinger_wband(20)"}
+
+CASE_NAMES = list(get_cases(generate_klines(10)))
+
+
+@pytest.fixture(scope="module", params=[500, 100000], ids=lambda size: f"{size}_klines")
+def cases(request):
+    return get_cases(generate_klines(request.param))
+
+
+@pytest.mark.parametrize("name", CASE_NAMES)
+def test_kernel_matches_reference(cases, name):
+    reference, kernel = cases[name]
+
+    expected = np.asarray(reference(), dtype=float)
+    actual = kernel()
+
+    assert actual.shape == expected.shape
+    rtol = ROLLING_STD_RTOL if name in ROLLING_STD_CASES else RTOL
+    np.testing.assert_allclose(actual, expected, rtol=rtol, atol=ATOL, equal_nan=True)
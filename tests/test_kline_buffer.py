@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.src.broker.sibyl_trading_engine.tactician.kline_buffer import KlineRingBuffer, KLINE_COLUMNS
+
+
+def make_kline(i: int) -> dict:
+    return {"timestamp": 1000 * i, "open_price": i + 0.1, "high": i + 0.5, "low": i - 0.5, "close_price": i + 0.2,
+            "close_time": 1000 * i + 999.0, "volume": 10.0 * i, "trades_num": float(i)}
+
+
+def make_frame(first: int, size: int) -> pd.DataFrame:
+    return pd.DataFrame([make_kline(i) for i in range(first, first + size)])
+
+
+@pytest.mark.parametrize("appended", [0, 1, 4, 5, 6, 13])
+def test_buffer_keeps_latest_klines_in_time_order(appended):
+    capacity = 5
+    buffer = KlineRingBuffer.from_dataframe(make_frame(0, 3), capacity)
+    for i in range(3, 3 + appended):
+        buffer.append(make_kline(i))
+
+    expected = make_frame(0, 3 + appended).iloc[-capacity:].reset_index(drop=True)
+    assert len(buffer) == expected.shape[0]
+    for column in KLINE_COLUMNS:
+        np.testing.assert_array_equal(buffer.view(column), expected[column].to_numpy())
+    pd.testing.assert_frame_equal(buffer.to_dataframe(), expected, check_dtype=False)
+    assert buffer.last() == make_kline(2 + appended)
+
+
+def test_from_dataframe_keeps_latest_klines_when_over_capacity():
+    buffer = KlineRingBuffer.from_dataframe(make_frame(0, 8), capacity=3)
+
+    assert buffer.view("timestamp").tolist() == [5000, 6000, 7000]
+
+
+def test_view_is_read_only():
+    buffer = KlineRingBuffer.from_dataframe(make_frame(0, 3))
+
+    with pytest.raises(ValueError):
+        buffer.view("close_price")[0] = 0.0
+
+
+def test_append_fills_missing_columns_with_nan():
+    buffer = KlineRingBuffer(2)
+    buffer.append({"timestamp": 1000, "close_price": 1.5})
+
+    assert buffer.last()["close_price"] == 1.5
+    assert np.isnan(buffer.last()["volume"])
+
+
+def test_append_if_new_dedupes_by_open_time():
+    buffer = KlineRingBuffer.from_dataframe(make_frame(0, 3), 5)
+    assert not buffer.append_if_new(make_kline(2))
+    assert not buffer.append_if_new(make_kline(1))
+    assert len(buffer) == 3
+    assert buffer.append_if_new(make_kline(3))
+    assert buffer.last() == make_kline(3)
+
+    empty = KlineRingBuffer(5)
+    assert empty.append_if_new(make_kline(0))
+    assert len(empty) == 1
@@ -0,0 +1,86 @@
+import os
+import numpy as np
+import pytest
+from database.klines.kline_db_client import KlineDBClient, SEGMENT_KLINES
+from backend.src.exchange_client.mock_exchance_client import MockExchangeClient
+from backend.src.exchange_client.synthetic_market import EPOCH_MS
+
+
+STEP = 60000  # 1m
+START_TIME = EPOCH_MS + 30 * 86400000
+
+
+class CountingExchangeClient(MockExchangeClient):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.requested_ranges = []
+
+    def get_klines(self, symbol, interval, limit, start_time=None, end_time=None):
+        self.requested_ranges.append((start_time, end_time))
+        return super().get_klines(symbol, interval, limit, start_time=start_time, end_time=end_time)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("KLINES_DB_PATH", str(tmp_path))
+    return KlineDBClient()
+
+
+def test_get_klines_matches_exchange_and_downloads_once(store, make_dataset):
+    client = CountingExchangeClient()
+    end_time = START_TIME + 2500 * STEP - 1
+
+    klines = store.get_klines(client, "BTCUSDT", "1m", START_TIME, end_time)
+    expected = make_dataset(2500, start_time=START_TIME)
+    assert [kline["open_time"] for kline in klines] == expected["timestamp"].tolist()
+    assert np.allclose([kline["close_price"] for kline in klines], expected["close_price"])
+
+    client.requested_ranges.clear()
+    assert store.get_klines(client, "BTCUSDT", "1m", START_TIME + 100 * STEP, end_time) == klines[100:]
+    assert client.requested_ranges == []
+
+
+def test_write_only_rewrites_the_segments_of_new_klines(store):
+    client = CountingExchangeClient()
+    key_path = store._get_key_path(client.name, "BTCUSDT", "1m")
+    segment_span = SEGMENT_KLINES * STEP
+    first_segment = -(-START_TIME // segment_span) * segment_span  # start of a segment
+
+    store.get_klines(client, "BTCUSDT", "1m", first_segment, first_segment + segment_span - 1)
+    segment_path = store._get_segment_path(key_path, first_segment // segment_span)
+    written_at = os.stat(segment_path).st_mtime_ns
+
+    klines = store.get_klines(client, "BTCUSDT", "1m", first_segment, first_segment + segment_span + 10 * STEP - 1)
+    assert os.stat(segment_path).st_mtime_ns == written_at
+    assert len(klines) == SEGMENT_KLINES + 10
+    assert np.all(np.diff([kline["open_time"] for kline in klines]) == STEP)
+
+
+class EmptyPageExchangeClient(CountingExchangeClient):
+    """
+    Returns no kline for the first requests, like an exchange with a transient empty reply.
+    """
+
+    def __init__(self, empty_replies: int) -> None:
+        super().__init__()
+        self.empty_replies = empty_replies
+
+    def get_klines(self, symbol, interval, limit, start_time=None, end_time=None):
+        klines = super().get_klines(symbol, interval, limit, start_time=start_time, end_time=end_time)
+        if self.empty_replies > 0:
+            self.empty_replies -= 1
+            return []
+        return klines
+
+
+def test_empty_page_is_not_marked_as_downloaded(store):
+    client = EmptyPageExchangeClient(empty_replies=1)
+    end_time = START_TIME + 10 * STEP - 1
+
+    assert store.get_klines(client, "BTCUSDT", "1m", START_TIME, end_time) == []
+    assert store.find_missing_ranges(client.name, "BTCUSDT", "1m", START_TIME, end_time) == [(START_TIME, end_time)]
+
+    klines = store.get_klines(client, "BTCUSDT", "1m", START_TIME, end_time)
+    assert [kline["open_time"] for kline in klines] == [START_TIME + i * STEP for i in range(10)]
+    assert store.find_missing_ranges(client.name, "BTCUSDT", "1m", START_TIME, end_time) == []
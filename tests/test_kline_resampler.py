@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.src.broker.sibyl_trading_engine.tactician.kline_resampler import KlineResampler, SUB_MINUTE_INTERVALS
+from backend.src.exchange_client.synthetic_market import SyntheticMarket, EPOCH_MS
+
+
+def make_klines(start_time: int, size: int) -> pd.DataFrame:
+    return pd.DataFrame(SyntheticMarket(3).generate("BTCUSDT", "1s", start_time, size))
+
+
+def pandas_resample(klines: pd.DataFrame, step: int) -> pd.DataFrame:
+    grouped = klines.groupby(klines["open_time"] - klines["open_time"] % step)
+    resampled = pd.DataFrame({
+        "open_price": grouped["open_price"].first(), "high": grouped["high"].max(), "low": grouped["low"].min(),
+        "close_price": grouped["close_price"].last(), "volume": grouped["volume"].sum(), "trades_num": grouped["trades_num"].sum(),
+    })
+    return resampled.rename_axis("timestamp").reset_index()
+
+
+@pytest.mark.parametrize("interval", list(SUB_MINUTE_INTERVALS))
+def test_resample_matches_pandas_groupby(interval):
+    resampler = KlineResampler(interval)
+    klines = make_klines(EPOCH_MS + 3600000, 600)
+
+    resampled = resampler.resample(klines)
+    expected = pandas_resample(klines, resampler.step)
+
+    pd.testing.assert_frame_equal(resampled[expected.columns], expected, check_dtype=False)
+    np.testing.assert_array_equal(resampled["close_time"], resampled["timestamp"] + resampler.step - 1)
+
+
+def test_resample_drops_partial_first_bucket():
+    resampler = KlineResampler("15s")
+    klines = make_klines(EPOCH_MS + 3600000 + 4000, 60)  # starts 4s into a bucket
+
+    assert resampler.resample(klines)["timestamp"].iloc[0] == EPOCH_MS + 3600000 + 15000
+    assert resampler.resample(klines, drop_partial_first=False)["timestamp"].iloc[0] == EPOCH_MS + 3600000
+
+
+def test_bucket_start_is_aligned_to_the_epoch():
+    resampler = KlineResampler("15s")
+    assert resampler.bucket_start(EPOCH_MS + 3600000 + 14999) == EPOCH_MS + 3600000
+    assert resampler.bucket_start(EPOCH_MS + 3600000 + 15000) == EPOCH_MS + 3600000 + 15000
+
+
+def test_unsupported_interval():
+    with pytest.raises(ValueError):
+        KlineResampler("1m")
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from backend.src.broker.sibyl_trading_engine.backtester.monte_carlo import MonteCarloAnalyzer
+from backend.src.broker.sibyl_trading_engine.evaluator.evaluator import Evaluator
+
+
+DAY_MS = 86400000
+PRICES = [100, 120, 90, 108, 130, 117, 104, 125, 140, 133]
+ORDERS = ["BUY", "HOLD", "HOLD", "SELL", "BUY", "HOLD", "SELL", "HOLD", "BUY", "SELL"]
+
+
+def make_logs():
+    return [{"timestamp": i * DAY_MS, "price": price, "order": order} for i, (price, order) in enumerate(zip(PRICES, ORDERS))]
+
+
+@pytest.mark.parametrize("size, block_size", [(10, 1), (10, 3), (7, 7), (5, 8)])
+def test_resample_indices_draws_contiguous_blocks(size, block_size):
+    n_runs = 50
+    indices = MonteCarloAnalyzer.resample_indices(np.random.default_rng(7), size, n_runs, block_size)
+
+    assert indices.shape == (n_runs, size)  # the last block is cut to the number of returns
+    assert indices.min() >= 0 and indices.max() < size
+    block_size = min(block_size, size)
+    for start in range(0, size, block_size):
+        block = indices[:, start:start + block_size]
+        np.testing.assert_array_equal(np.diff(block, axis=1), 1)
+
+    # The same seed draws the same runs
+    np.testing.assert_array_equal(indices, MonteCarloAnalyzer.resample_indices(np.random.default_rng(7), size, n_runs, block_size))
+
+
+def test_bars_metrics_of_the_unshuffled_returns_match_the_evaluator():
+    analyzer = MonteCarloAnalyzer(make_logs(), n_runs=10, method="bars", seed=1, risk_free_rate=0.02)
+    evaluator = Evaluator(make_logs(), risk_free_rate=0.02)
+    expected = evaluator.evaluate()
+
+    metrics = analyzer.calculate_metrics(analyzer.returns[None, :])
+
+    assert metrics["total_profit"][0] == pytest.approx(expected["total_profit"])
+    assert metrics["max_drawdown"][0] == pytest.approx(expected["max_drawdown"])
+    # The returns resampled leave out the first bar, which has no return
+    assert metrics["sharpe_ratio"][0] == pytest.approx(evaluator.calculate_sharpe_ratio(analyzer.returns, 365))
+    assert analyzer.run()["actual"] == pytest.approx({name: value[0] for name, value in metrics.items()})
+
+
+def test_trades_returns_compound_to_the_evaluator_profit():
+    analyzer = MonteCarloAnalyzer(make_logs(), n_runs=10, method="trades", seed=1)
+
+    np.testing.assert_allclose(analyzer.returns, [108 / 100 - 1, 104 / 130 - 1, 133 / 140 - 1])
+    metrics = analyzer.calculate_metrics(analyzer.returns[None, :])
+    assert metrics["total_profit"][0] == pytest.approx(Evaluator(make_logs()).evaluate()["total_profit"])
@@ -0,0 +1,85 @@
+import json
+import pytest
+from database.strategy.strategy_db_client import StrategyDBClient, STRATEGY_FIELDS
+
+
+def make_tinydb(path, n_logs: int) -> list:
+    # TinyDB document ids are strings, and not in time order once documents have been removed
+    strategy = dict(zip(STRATEGY_FIELDS, ["s1", "USDT", "BTC", 100.0, "1m", 10, "rsi", 1000]))
+    logs = [{"strategy_id": "s1", "timestamp": 1000 * (n_logs - i), "price": 100.0 + i, "slippage": 0.0, "order": "HOLD"}
+            for i in range(n_logs)]
+    tables = {"strategies": {"3": strategy}, "logs": {str(10 + i): log for i, log in enumerate(logs)}}
+    path.write_text(json.dumps(tables))
+    return logs
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / "strategies.db"
+    monkeypatch.setenv("STRATEGY_DB_PATH", str(path))
+    return path
+
+
+def open_client(db_path) -> StrategyDBClient:
+    StrategyDBClient._initialized_paths.discard(str(db_path))  # opened as by a new process
+    return StrategyDBClient(str(db_path.parent / "missing.env"))
+
+
+def test_tinydb_is_migrated_once_in_insertion_order(db_path):
+    logs = make_tinydb(db_path, 5)
+
+    client = open_client(db_path)
+    page = client.get_logs_page("s1")
+    assert [{key: log[key] for key in logs[0]} for log in page["logs"]] == logs
+    assert client.get_all_strategies()[0]["strategy_name"] == "rsi"
+    assert (db_path.parent / "strategies.db.tinydb.json").exists()
+
+    # Reopening the migrated database does not migrate it again
+    client.add_log("s1", 9000, 1.0, 0.0, "BUY")
+    reopened = open_client(db_path)
+    assert len(reopened.get_logs_page("s1")["logs"]) == 6
+    assert len(reopened.get_all_strategies()) == 1
+
+
+def test_migration_rerun_rebuilds_the_same_database(tmp_path):
+    tinydb_path = tmp_path / "legacy.json"
+    make_tinydb(tinydb_path, 3)
+    target = tmp_path / "migrated.db"
+
+    assert StrategyDBClient.migrate_from_tinydb(str(tinydb_path), str(target)) == {"strategies": 1, "logs": 3}
+    first = target.read_bytes()
+    assert StrategyDBClient.migrate_from_tinydb(str(tinydb_path), str(target)) == {"strategies": 1, "logs": 3}
+
+    assert target.read_bytes() == first
+    assert tinydb_path.exists()  # a source other than the target is left untouched
+    assert not (tmp_path / "migrated.db.migrating").exists()
+
+
+def test_logs_page_cursor_reads_each_log_once(db_path):
+    client = open_client(db_path)
+    client.add_logs([("a" if i % 3 else "b", i, float(i), 0.0, "HOLD") for i in range(12)])
+
+    pages, cursor = [], 0
+    while True:
+        page = client.get_logs_page("a", cursor, limit=4)
+        pages.append(page)
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            break
+
+    # 8 logs of "a": two full pages, the last one without more logs after it
+    assert [len(page["logs"]) for page in pages] == [4, 4]
+    assert [page["has_more"] for page in pages] == [True, False]
+    assert [log["timestamp"] for page in pages for log in page["logs"]] == [i for i in range(12) if i % 3]
+
+    # Nothing new: the cursor stays, then the next log is read from it
+    assert client.get_logs_page("a", cursor, limit=4) == {"logs": [], "cursor": cursor, "has_more": False}
+    client.add_log("a", 13, 13.0, 0.0, "SELL")
+    page = client.get_logs_page("a", cursor, limit=4)
+    assert [log["timestamp"] for log in page["logs"]] == [13] and not page["has_more"]
+
+
+@pytest.mark.parametrize("cursor, limit", [(-1, 10), (True, 10), (0, 0), (0, 10001)])
+def test_logs_page_rejects_invalid_arguments(db_path, cursor, limit):
+    with pytest.raises(ValueError):
+        open_client(db_path).get_logs_page("a", cursor, limit)
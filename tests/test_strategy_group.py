@@ -0,0 +1,135 @@
+import pandas as pd
+from backend.src.broker.sibyl_trading_engine.strategies.strategy_base import BaseStrategy
+from backend.src.broker.sibyl_trading_engine.tactician.kline_buffer import KlineRingBuffer
+from backend.src.broker.sibyl_trading_engine.tactician.strategy_group import StrategyGroup
+from backend.src.broker.sibyl_trading_engine.tactician.tactician_base import Tactician
+from backend.src.broker.sibyl_trading_engine.tactician.tick_metrics import TickMetrics
+
+
+class RecordingStrategy(BaseStrategy):
+    """
+    Records the klines it has been evaluated on: `seen` is its streaming state when incremental.
+    """
+
+    def __init__(self, is_incremental: bool) -> None:
+        super().__init__()
+        self.is_incremental = is_incremental
+        self.seen = []
+        self.full_evaluations = 0
+
+    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+        self.full_evaluations += 1
+        data["signal"] = "HOLD"
+        return data
+
+    def reset_state(self) -> None:
+        self.seen = []
+
+    def on_kline(self, kline):
+        self.seen.append(kline["timestamp"])
+        return {**kline, "signal": "HOLD"}
+
+
+class FakeMember:
+    """
+    A Tactician without an exchange: the group runs the real `Tactician.strategy_step`.
+    """
+    strategy_step = Tactician.strategy_step
+
+    def __init__(self, strategy: RecordingStrategy, dataset: KlineRingBuffer) -> None:
+        self.strategy = strategy
+        self.dataset = dataset
+        self.metrics = TickMetrics()
+        self.is_running = True
+        self.signals = []
+        if strategy.is_incremental:
+            strategy.warm_up(dataset.to_dataframe())
+
+    def is_active(self) -> bool:
+        return self.is_running
+
+    def process_signal(self, latest_row) -> None:
+        self.signals.append(latest_row["signal"])
+
+
+class FakeHub:
+    def __init__(self) -> None:
+        self.kline = None
+
+    def get_last_kline(self, market_key):
+        return self.kline
+
+
+def make_kline(i: int) -> dict:
+    return {"timestamp": 1000 * i, "close_price": 100.0 + i}
+
+
+def make_buffer(first: int, size: int, capacity: int) -> KlineRingBuffer:
+    return KlineRingBuffer.from_dataframe(pd.DataFrame([make_kline(i) for i in range(first, first + size)]), capacity)
+
+
+def tick(group: StrategyGroup, hub: FakeHub, i: int) -> bool:
+    hub.kline = make_kline(i)
+    return group.strategy_step(group.update_dataset())
+
+
+def make_group():
+    hub = FakeHub()
+    return StrategyGroup(("binance", "BTCUSDT", "1s", True), hub, 1), hub
+
+
+def test_incremental_members_are_stepped_with_on_kline():
+    group, hub = make_group()
+    first, second, full = RecordingStrategy(True), RecordingStrategy(True), RecordingStrategy(False)
+    members = {"a": FakeMember(first, make_buffer(0, 5, 5)), "b": FakeMember(second, make_buffer(0, 5, 5)),
+               "c": FakeMember(full, make_buffer(0, 5, 5))}
+    for strategy_id, member in members.items():
+        group.add(strategy_id, member)
+
+    for i in range(5, 8):
+        assert tick(group, hub, i)
+    assert group.strategy_step(None)  # no new kline, the group is still active
+
+    expected = [1000 * i for i in range(8)]
+    assert first.seen == expected and second.seen == expected
+    assert first.full_evaluations == second.full_evaluations == 0
+    assert full.full_evaluations == 3
+    assert all(member.signals == ["HOLD"] * 3 for member in members.values())
+
+
+def test_streaming_state_stays_current_when_members_leave():
+    group, hub = make_group()
+    lone, full = RecordingStrategy(True), RecordingStrategy(False)
+    group.add("lone", FakeMember(lone, make_buffer(0, 5, 5)))
+    group.add("full", FakeMember(full, make_buffer(0, 5, 5)))
+    tick(group, hub, 5)
+
+    group.remove("full")
+    tick(group, hub, 6)
+    group.members["lone"].is_running = False
+    assert not tick(group, hub, 7)
+
+    assert lone.seen == [1000 * i for i in range(7)]
+    assert full.full_evaluations == 1
+
+
+def test_added_member_is_aligned_with_the_shared_dataset():
+    group, hub = make_group()
+    current = RecordingStrategy(True)
+    group.add("current", FakeMember(current, make_buffer(0, 5, 5)))
+
+    # A larger dataset fetched after the last tick: the current member is fed the kline it has not seen
+    larger = RecordingStrategy(True)
+    group.add("larger", FakeMember(larger, make_buffer(0, 6, 10)))
+    assert group.dataset.capacity == 10
+    assert current.seen == [1000 * i for i in range(6)]
+
+    # A smaller dataset behind the shared one: the new member is warmed up on the shared dataset
+    stale = RecordingStrategy(True)
+    group.add("stale", FakeMember(stale, make_buffer(0, 4, 4)))
+    assert stale.seen == [1000 * i for i in range(6)]
+
+    tick(group, hub, 6)
+    expected = [1000 * i for i in range(7)]
+    assert current.seen == larger.seen == stale.seen == expected
+    assert all(member.dataset is group.dataset for member in group.members.values())
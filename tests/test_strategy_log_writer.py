@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import sqlite3
+from database.strategy.strategy_log_writer import StrategyLogWriter
+
+
+class FlakyDBClient:
+    """
+    Stands in for StrategyDBClient, failing the first batch commits and the logs of some strategies.
+    """
+
+    def __init__(self, failed_commits: int, failing_strategy: str = None) -> None:
+        self.failed_commits = failed_commits
+        self.failing_strategy = failing_strategy
+        self.commits = 0
+        self.logs = []
+
+    def add_logs(self, logs) -> None:
+        self.commits += 1
+        if self.commits <= self.failed_commits:
+            raise sqlite3.OperationalError("database is locked")
+        self.logs.extend(logs)
+
+    def add_log(self, strategy_id, timestamp, price, slippage, order) -> None:
+        if strategy_id == self.failing_strategy:
+            raise sqlite3.IntegrityError("constraint failed")
+        self.logs.append((strategy_id, timestamp, price, slippage, order))
+
+
+def make_writer(db_client: FlakyDBClient) -> StrategyLogWriter:
+    # Long flush interval, so that the logs added before a flush are written in one batch
+    return StrategyLogWriter(db_client, batch_size=10, flush_interval=1.0, write_retries=2, retry_delay=0.001)
+
+
+def test_failed_commit_is_retried():
+    db_client = FlakyDBClient(failed_commits=2)
+    writer = make_writer(db_client)
+    for i in range(5):
+        writer.add_log("a", i, 1.0, 0.0, "HOLD")
+    assert writer.flush(timeout=5)
+    assert [log[1] for log in db_client.logs] == list(range(5))
+    assert writer.failed_logs == 0
+    writer.close()
+
+
+def test_falls_back_to_single_logs_and_reports_the_failure():
+    db_client = FlakyDBClient(failed_commits=100, failing_strategy="b")
+    writer = make_writer(db_client)
+    for i in range(4):
+        writer.add_log("a" if i % 2 else "b", i, 1.0, 0.0, "HOLD")
+    assert not writer.flush(timeout=5)
+    assert db_client.commits == 3  # the first commit and two retries
+    assert [log[1] for log in db_client.logs] == [1, 3]
+    assert writer.failed_logs == 2
+
+    # The failure is reported once
+    writer.add_log("a", 4, 1.0, 0.0, "HOLD")
+    db_client.failed_commits = 0
+    assert writer.flush(timeout=5)
+    writer.close()
+
+
+class PagedDBClient(FlakyDBClient):
+
+    def __init__(self) -> None:
+        super().__init__(failed_commits=0)
+
+    def get_logs_page(self, strategy_id, cursor=0, limit=100):
+        logs = [log for log in self.logs if log[0] == strategy_id][cursor:cursor + limit]
+        return {"logs": logs, "cursor": cursor + len(logs), "has_more": False}
+
+
+def test_follow_async_is_woken_up_by_the_writes():
+    db_client = PagedDBClient()
+    writer = StrategyLogWriter(db_client, flush_interval=0.01)
+
+    async def follow():
+        pages = writer.follow_async("a", timeout=10)
+        assert (await anext(pages))["logs"] == []
+        threads_num = threading.active_count()
+        next_page = asyncio.ensure_future(anext(pages))
+        await asyncio.sleep(0.05)
+        assert not next_page.done()
+        assert threading.active_count() <= threads_num  # the waiting follower does not hold a thread
+        writer.add_log("a", 1, 1.0, 0.0, "HOLD")
+        page = await asyncio.wait_for(next_page, 5)
+        await pages.aclose()
+        return page
+
+    page = asyncio.run(follow())
+    assert [log[1] for log in page["logs"]] == [1]
+    assert page["cursor"] == 1
+    writer.close()
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from backend.src.broker.sibyl_trading_engine.strategies.strategy_factory import StrategyFactory
+
+
+WARM_UP_SIZE = 300
+STREAMED_SIZE = 60
+
+
+@pytest.mark.parametrize("strategy_name", StrategyFactory.get_strategy_names())
+def test_on_kline_matches_generate_signals(make_dataset, strategy_name):
+    streaming_strategy = StrategyFactory.get_strategy(strategy_name, {})
+    if not streaming_strategy.is_incremental:
+        pytest.skip(f"{strategy_name} does not implement on_kline")
+    batch_strategy = StrategyFactory.get_strategy(strategy_name, {})
+    dataset = make_dataset(WARM_UP_SIZE + STREAMED_SIZE, "ETHUSDT", "5m", seed=11)
+
+    streaming_strategy.warm_up(dataset.iloc[:WARM_UP_SIZE])
+    for i in range(WARM_UP_SIZE, dataset.shape[0]):
+        row = streaming_strategy.on_kline(dataset.iloc[i].to_dict())
+        expected = batch_strategy.generate_signals(dataset.iloc[:i + 1].copy()).iloc[-1]
+
+        assert row["signal"] == expected["signal"], f"signal differs at kline {i}"
+        for column, value in expected.items():
+            if column != "signal":
+                assert np.isclose(row[column], value, rtol=1e-7, equal_nan=True), f"{column} differs at kline {i}"
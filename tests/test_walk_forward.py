@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from backend.src.broker.sibyl_trading_engine.backtester.backtester import Backtester
+from backend.src.broker.sibyl_trading_engine.backtester.walk_forward import WalkForwardOptimizer
+
+
+def make_optimizer(**kwargs) -> WalkForwardOptimizer:
+    return WalkForwardOptimizer(Backtester(None, None, "BTCUSDT", "1m"), "rsi", [{}], **kwargs)
+
+
+def as_ranges(folds):
+    return [((in_sample.start, in_sample.stop), (out_of_sample.start, out_of_sample.stop)) for in_sample, out_of_sample in folds]
+
+
+def test_rolling_folds():
+    folds = make_optimizer(in_sample_size=100, out_of_sample_size=50).split_folds(10, 320)
+    assert as_ranges(folds) == [((10, 110), (110, 160)), ((60, 160), (160, 210)), ((110, 210), (210, 260)), ((160, 260), (260, 310))]
+
+
+def test_anchored_folds_with_step():
+    folds = make_optimizer(in_sample_size=100, out_of_sample_size=50, step=80, anchored=True).split_folds(0, 330)
+    assert as_ranges(folds) == [((0, 100), (100, 150)), ((0, 180), (180, 230)), ((0, 260), (260, 310))]
+
+
+def test_too_short_history_has_no_fold():
+    assert make_optimizer(in_sample_size=100, out_of_sample_size=50).split_folds(0, 149) == []
+
+
+def test_step_shorter_than_out_of_sample_window_is_rejected():
+    with pytest.raises(ValueError):
+        make_optimizer(in_sample_size=100, out_of_sample_size=50, step=40)
+
+
+@pytest.mark.parametrize("signals, expected", [
+    (["HOLD", "BUY", "HOLD", "HOLD"], ["HOLD", "BUY", "HOLD", "SELL"]),  # open position closed on the last bar
+    (["HOLD", "HOLD", "HOLD", "BUY"], ["HOLD", "HOLD", "HOLD", "INVALID_BUY"]),  # no bar left to close it
+    (["SELL", "BUY", "SELL", "HOLD"], ["INVALID_SELL", "BUY", "SELL", "HOLD"]),  # starts flat
+])
+def test_get_orders_starts_flat_and_closes_at_window_end(signals, expected):
+    assert WalkForwardOptimizer.get_orders(np.array(signals)).tolist() == expected
+
+
+def test_run_shares_the_indicators_between_parameter_sets(make_dataset, monkeypatch):
+    backtester = Backtester(None, None, "BTCUSDT", "1m")
+    dataset = make_dataset(1000)
+    monkeypatch.setattr(backtester, "get_klines_data", lambda: dataset)
+    backtester.analyst = type("Analyst", (), {"get_market_condition_score": lambda self: 0.5})()
+    params_list = [{"buy_threshold": buy, "sell_threshold": 70} for buy in (20, 25, 30)]
+    optimizer = WalkForwardOptimizer(backtester, "rsi", params_list, in_sample_size=200, out_of_sample_size=100)
+
+    results, score = optimizer.run()
+
+    assert len(results["folds"]) == 4  # (999 - 399 - 300) // 100 + 1
+    assert sum(selection["folds"] for selection in results["parameter_stability"]) == 4
+    assert results["indicator_cache"] == {"hits": 2, "misses": 1}  # the three parameter sets use the same RSI
+    assert score == 0.5